@@ -0,0 +1,79 @@
+# benchmarks/bench_lookup_builder.py
+"""
+Scaling benchmark for LookupTableBuilder.build.
+
+Builds synthetic PLC reason-code exports (one row per tag and reason code, as in
+the CSV workflow) and times the vectorized build at each size. The original
+groupby + iterrows loop is timed too, up to --legacy-max-rows (it needs minutes
+beyond a few hundred thousand rows), and both outputs are checked to be equal.
+
+Usage:
+    python benchmarks/bench_lookup_builder.py
+    python benchmarks/bench_lookup_builder.py --rows 10000 1000000 --legacy-max-rows 1000000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from itv_asset_tree.utils.lookup_builder import LookupTableBuilder  # noqa: E402
+
+REASON_TEXTS = ["Running", "Idle", "Starved", "Blocked", "Fault", "Changeover", "Maintenance", "No Operator"]
+
+
+def make_export(rows: int, codes_per_tag: int = 40, seed: int = 0) -> pd.DataFrame:
+    """`rows` reason-code rows over rows / codes_per_tag PLC tags, in export (tag-major) order."""
+    rng = np.random.default_rng(seed)
+    tags = (np.arange(rows) // codes_per_tag).astype(str)
+    return pd.DataFrame({
+        "PLC_Tag": np.char.add("Line_", tags),
+        "Equipment_Desc": np.char.add("Machine ", (np.arange(rows) // (codes_per_tag * 10)).astype(str)),
+        "PLC_Tag_Value": np.arange(rows) % codes_per_tag,
+        "Reason_Code_Desc": np.array(REASON_TEXTS, dtype=object)[rng.integers(0, len(REASON_TEXTS), rows)],
+    })
+
+
+def legacy_build(builder: LookupTableBuilder, data: pd.DataFrame) -> dict:
+    """The original implementation, kept here as the reference."""
+    lookup_tables = {}
+    for group_name, group in data.groupby(builder.group_column, observed=True):
+        table = [[str(row[builder.key_column]), str(row[builder.value_column])] for _, row in group.iterrows()]
+        lookup_tables[group_name] = table
+    return lookup_tables
+
+
+def timed(fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 1_000_000, 10_000_000])
+    parser.add_argument("--codes-per-tag", type=int, default=40, help="Rows (reason codes) per lookup table")
+    parser.add_argument("--legacy-max-rows", type=int, default=100_000, help="Largest size the original loop is timed at")
+    args = parser.parse_args()
+
+    builder = LookupTableBuilder("PLC_Tag", "PLC_Tag_Value", "Reason_Code_Desc")
+    print(f"{'rows':>12} {'tables':>9} {'vectorized s':>13} {'rows/s':>12} {'loop s':>9} {'speedup':>8}")
+    for rows in args.rows:
+        data = make_export(rows, args.codes_per_tag)
+        tables, seconds = timed(builder.build, data)
+        line = f"{rows:>12,} {len(tables):>9,} {seconds:>13.3f} {rows / seconds:>12,.0f}"
+        if rows <= args.legacy_max_rows:
+            reference, legacy_seconds = timed(legacy_build, builder, data)
+            assert reference == tables, "Vectorized output differs from the original loop"
+            line += f" {legacy_seconds:>9.2f} {legacy_seconds / seconds:>7.1f}x"
+        else:
+            line += f" {'-':>9} {'-':>8}"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,11 +2,9 @@
 # api.py within the api directory:
 
 import os
-import io
 import pathlib
 import uvicorn
 import pandas as pd
-from contextlib import redirect_stdout
 from dotenv import load_dotenv
 from seeq import spy
 from seeq.spy.assets import Tree
@@ -14,17 +12,37 @@ from seeq.spy.assets import Tree
 from fastapi import FastAPI, UploadFile, HTTPException, Query, Body, Request, File, Form
 from fastapi import APIRouter
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel, Field
-from typing import Optional, Dict
+from typing import Optional, Dict, List, Literal
 
 # from itv_asset_tree.router import router
 from itv_asset_tree.api.csv_lookup_generator import router as csv_lookup_router
 from itv_asset_tree.api.templates import router as templates_router
+from itv_asset_tree.api.jobs import job_accepted, wait_for_job, router as jobs_router
+from itv_asset_tree.api.responses import NegotiatedResponse, NegotiatedRoute, negotiate
 from itv_asset_tree.web.frontend_router import router as frontend_router
 from itv_asset_tree.core.tree_builder import TreeBuilder
 from itv_asset_tree.core.tree_modifier import TreeModifier
+from itv_asset_tree.core.push_manager import PushManager
+from itv_asset_tree.core.tree_cache import tree_cache
+from itv_asset_tree.core.tree_diff import snapshot_tree
+from itv_asset_tree.core.tree_locks import tree_locks
+from itv_asset_tree.core.render_cache import render_cache
+from itv_asset_tree.core.tree_export import MEDIA_TYPES, export_tree
+from itv_asset_tree.core.bulk_insert import insert_items, item_definitions
+from itv_asset_tree.core.tree_serializer import children_page, render_text
+from itv_asset_tree.core.push_planner import plan_push
+from itv_asset_tree.core.push_jobs import BULK, INTERACTIVE, push_jobs
+from itv_asset_tree.config import settings
+from itv_asset_tree.utils.parsed_csv_cache import parsed_csv_cache
+from itv_asset_tree.utils.upload_store import upload_store
+from itv_asset_tree.utils.upload_stream import (
+    UploadTooLargeError,
+    sniff_csv_header,
+    stream_upload_to_disk,
+)
 
 # Load environment variables
 load_dotenv()
@@ -33,7 +51,7 @@ PASSWORD = os.getenv("SERVER_PASSWORD")
 HOST = os.getenv("SERVER_HOST")
 
 # Initialize FastAPI app
-router = APIRouter(tags=["Asset Tree"])
+router = APIRouter(tags=["Asset Tree"], route_class=NegotiatedRoute, default_response_class=NegotiatedResponse)
 app = FastAPI()
 
 # Define frontend paths FIRST
@@ -50,6 +68,7 @@ app.mount("/static", StaticFiles(directory=static_dir), name="static")
 # app.include_router(templates_router, prefix="/api/templates")
 app.include_router(csv_lookup_router, prefix="/api/csv_lookup", tags=["CSV Lookup"])
 router.include_router(templates_router, prefix="/api/v1/template", tags=["Templates"])
+router.include_router(jobs_router, prefix="/api/v1/jobs", tags=["Jobs"])
 app.include_router(frontend_router, prefix="/frontend", tags=["Frontend"])
 
 # Setup CORS
@@ -119,59 +138,87 @@ async def startup_event():
 # Upload CSV File
 @router.post("/api/v1/asset_tree/upload_csv/", tags=["Asset Tree"])
 async def upload_csv(file: UploadFile):
-    file_location = os.path.join(UPLOAD_DIR, file.filename)
+    """Store the CSV by content hash and return its upload ID for `process_csv`."""
     try:
-        with open(file_location, "wb") as f:
-            f.write(await file.read())
-        data = pd.read_csv(file_location)
-        return {"filename": file.filename, "columns": list(data.columns)}
+        record = await upload_store.save(file)  # Header only; the body is parsed once in process_csv
+        return {
+            "upload_id": record["upload_id"],
+            "filename": record["filename"],
+            "columns": record["columns"],
+            "size": record["size"],
+            "deduplicated": record["deduplicated"],
+        }
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to upload file: {str(e)}")
 
 # Process CSV and Build Tree
 @router.post("/api/v1/asset_tree/process_csv/", tags=["Asset Tree"])
-async def process_csv(workbook_name: str = Body(...), tree_name: str = Body(...)):
+async def process_csv(
+    upload_id: str = Body(...),
+    workbook_name: str = Body(...),
+    tree_name: str = Body(...),
+    dry_run: bool = Body(False),
+    background: bool = Body(False),
+):
+    """
+    Build a tree from an uploaded CSV and push it. The push runs as a bulk-lane job;
+    with `background` the job ID is returned at once (poll `/api/v1/jobs/{job_id}`).
+    """
+    job = push_jobs.submit(
+        _build_tree_from_upload, upload_id, workbook_name, tree_name, dry_run,
+        name=f"process_csv: {tree_name}", lane=BULK,
+    )
+    if background:
+        return job_accepted(job)
+    try:
+        return await wait_for_job(job)
+    except HTTPException:
+        raise
+    except Exception as e:
+        return {"message": f"❌ Failed to process and push CSV: {e}"}
+
+def _build_tree_from_upload(upload_id: str, workbook_name: str, tree_name: str, dry_run: bool) -> dict:
     global current_tree, current_workbook_name, current_tree_name
-    
+
     # Ensure Seeq login happens here if not already logged in
     if not spy.user:
         print("🔌 Attempting Seeq login at request time...")
         spy.login(url=HOST, username=USERNAME, password=PASSWORD)
 
-    try:
-        uploaded_files = os.listdir(UPLOAD_DIR)
-        if not uploaded_files:
-            raise FileNotFoundError("❌ No CSV file found in the uploaded_files directory.")
+    upload = upload_store.get(upload_id)
+    file_path = upload["path"]
 
-        latest_file = max(uploaded_files, key=lambda f: os.path.getctime(os.path.join(UPLOAD_DIR, f)))
-        file_path = os.path.join(UPLOAD_DIR, latest_file)
+    if "Level 1" not in upload["columns"]:
+        raise ValueError("⚠️ CSV file must contain a 'Level 1' column.")
+    data = parsed_csv_cache.get(file_path, content_hash=upload_id)
 
-        data = pd.read_csv(file_path)
-        if "Level 1" not in data.columns:
-            raise ValueError("⚠️ CSV file must contain a 'Level 1' column.")
+    current_tree_name = tree_name or data["Level 1"].dropna().unique()[0]
+    current_workbook_name = workbook_name or "Default Workbook"
 
-        current_tree_name = tree_name or data["Level 1"].dropna().unique()[0]
-        current_workbook_name = workbook_name or "Default Workbook"
-
-        builder = TreeBuilder(workbook=current_workbook_name, csv_file=file_path)
-        builder.parse_csv()
-        builder.build_tree_from_csv(friendly_name=current_tree_name, description="🌳 Tree built from CSV")
-
-        current_tree = builder.tree
-        builder.tree.push()
-
-        visualize_output = io.StringIO()
-        with redirect_stdout(visualize_output):
-            builder.tree.visualize()
-        visualization = visualize_output.getvalue()
+    builder = TreeBuilder(workbook=current_workbook_name, csv_file=file_path, metadata=data)
+    builder.build_tree_from_csv(friendly_name=current_tree_name, description="🌳 Tree built from CSV")
 
+    if dry_run:
+        plan = plan_push(builder.tree, changes_only=False)
         return {
-            "message": f"✅ CSV processed and tree '{current_tree_name}' pushed successfully.",
+            "message": f"📋 Dry run: tree '{current_tree_name}' was built but not pushed.",
             "columns": list(builder.metadata.columns),
-            "tree_structure": visualization.strip(),
+            "plan": plan.to_dict(),
         }
-    except Exception as e:
-        return {"message": f"❌ Failed to process and push CSV: {e}"}
+
+    current_tree = builder.tree
+    with tree_locks.lock(current_workbook_name, current_tree_name):
+        tree_cache.invalidate(current_workbook_name, current_tree_name)
+        PushManager(builder.tree).push_full()  # Chunked and resumable for large trees
+        tree_cache.put(current_workbook_name, current_tree_name, builder.tree)
+
+    return {
+        "message": f"✅ CSV processed and tree '{current_tree_name}' pushed successfully.",
+        "columns": list(builder.metadata.columns),
+        "tree_structure": render_text(builder.tree.df),
+    }
 
 # Create Empty Tree
 @router.post("/api/v1/asset_tree/create_empty_tree/", tags=["Asset Tree"])
@@ -189,7 +236,11 @@ async def create_empty_tree(request: Request):
         tree_builder = TreeBuilder(workbook=workbook_name)
         current_tree = tree_builder.build_empty_tree(friendly_name=tree_name, description="Empty tree created")
 
+        tree_cache.invalidate(workbook_name, tree_name)
         current_tree.push()
+        snapshot_tree(current_tree)
+        render_cache.bump(workbook_name, tree_name, current_tree)
+        tree_cache.put(workbook_name, tree_name, current_tree)
         
         print("📊 [DEBUG] Tree push succeeded.")
         
@@ -200,89 +251,240 @@ async def create_empty_tree(request: Request):
     
 # Search and Visualize Tree
 @router.get("/api/v1/asset_tree/search_tree/", tags=["Asset Tree"])
-async def search_tree(tree_name: str = Query(...), workbook_name: str = Query(...)):
+def search_tree(request: Request, tree_name: str = Query(...), workbook_name: str = Query(...)):
+    variant = _variant(request, "search")
+    etag = _current_etag(workbook_name, tree_name, *variant)
+    if etag and _etag_matches(request, etag):
+        return _not_modified(etag)
     try:
         # Initialize TreeModifier and load the tree
         tree_modifier = TreeModifier(workbook=workbook_name, tree_name=tree_name)
 
-        # Capture the visualization output from CLI
-        visualize_output = io.StringIO()
-        with redirect_stdout(visualize_output):
-            tree_modifier.visualize_tree()
-        visualization = visualize_output.getvalue()
+        version, visualization = render_cache.render(workbook_name, tree_name, tree_modifier.tree, kind="text")
 
-        return {
+        return _versioned_json({
             "message": f"✅ Tree '{tree_name}' found and visualized successfully.",
             "tree_structure": visualization.strip()
-        }
+        }, render_cache.etag(workbook_name, tree_name, version, *variant))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"❌ Failed to search and visualize tree: {e}")
 
 # Push Tree
 @router.post("/api/v1/asset_tree/push_tree/", tags=["Asset Tree"])
-async def push_tree(tree_name: str, workbook_name: str):
+async def push_tree(tree_name: str, workbook_name: str, changes_only: bool = True, background: bool = False):
+    """
+    Push a tree's pending changes as an interactive-lane job (see `process_csv` for `background`).
+    An unedited tree has nothing pending; force a full re-push with ``changes_only=false``.
+    """
+    job = push_jobs.submit(_push_tree, tree_name, workbook_name, changes_only,
+                           name=f"push_tree: {tree_name}", lane=INTERACTIVE)
+    if background:
+        return job_accepted(job)
+    try:
+        return await wait_for_job(job)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"❌ Failed to push tree: {e}")
+
+def _push_tree(tree_name: str, workbook_name: str, changes_only: bool = True) -> dict:
     global current_tree, current_tree_name
 
-    try:
-        tree_modifier = TreeModifier(workbook=workbook_name, tree_name=tree_name)
-        tree_modifier.push_tree()
+    tree_modifier = TreeModifier(workbook=workbook_name, tree_name=tree_name)
+    result = tree_modifier.push_tree(changes_only=changes_only)
+
+    current_tree = tree_modifier
+    current_tree_name = tree_name
 
-        current_tree = tree_modifier
-        current_tree_name = tree_name
+    if isinstance(result, dict) and result.get("pushed") == 0 and result.get("archived") == 0:
+        return {"message": f"ℹ️ Nothing pending for tree '{tree_name}'; nothing was pushed (use changes_only=false to re-push it)."}
+    return {"message": f"✅ Tree '{tree_name}' successfully pushed!"}
 
-        return {"message": f"✅ Tree '{tree_name}' successfully pushed!"}
+@router.get("/api/v1/asset_tree/locks/", tags=["Asset Tree"])
+def tree_lock_metrics():
+    """Per-tree lock wait and hold times, current holders and waiters."""
+    return {"locks": tree_locks.metrics()}
+
+@router.get("/api/v1/asset_tree/push_plan/", tags=["Asset Tree"])
+def push_plan(tree_name: str, workbook_name: str, changes_only: bool = True):
+    """
+    Dry run: what pushing the tree would create, update and archive, and how long it would take.
+    A tree with no local edits has nothing pending (``plan.nothing_pending``); plan a full
+    re-push with ``changes_only=false``.
+    """
+    try:
+        tree_modifier = TreeModifier(workbook=workbook_name, tree_name=tree_name)
+        plan = tree_modifier.plan(changes_only=changes_only)
+        return {"message": plan.describe(), "plan": plan.to_dict()}
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"❌ Failed to push tree: {e}")
+        raise HTTPException(status_code=500, detail=f"❌ Failed to plan push: {e}")
 
 # Assuming `current_tree` holds the updated tree in memory
 current_tree = None  # Ensure it's defined at the top level
 
 @router.get("/api/v1/asset_tree/visualize_tree/", tags=["Asset Tree"])
-async def visualize_tree(tree_name: str, workbook_name: str):
-    """Fetch the latest in-memory tree instead of an old cached version."""
-    global current_tree
+def visualize_tree(
+    request: Request,
+    tree_name: str,
+    workbook_name: str,
+    format: Literal["text", "nested", "adjacency"] = "text",
+    max_depth: Optional[int] = Query(None, ge=1),
+):
+    """
+    Fetch the latest in-memory tree instead of an old cached version.
 
+    ``format=text`` returns the ``visualize()`` layout in ``tree_structure``;
+    ``nested`` and ``adjacency`` return structured JSON in ``tree``. ``max_depth``
+    limits how many levels are included (the root is level 1).
+
+    Renderings are cached per tree version and sent with an ``ETag``; a request
+    whose ``If-None-Match`` still matches gets ``304 Not Modified``.
+    """
     print(f"🔍 [DEBUG] Received visualization request for Tree: {tree_name}, Workbook: {workbook_name}")
 
-    # Check if current_tree is already available
-    if current_tree and current_tree.name == tree_name:
-        print("✅ [DEBUG] Returning in-memory tree visualization.")
-        visualization_output = io.StringIO()
-        with redirect_stdout(visualization_output):
-            current_tree.visualize()
-        visualization = visualization_output.getvalue()
-        return {"tree_structure": visualization.strip()}
+    variant = _variant(request, "visualize", format, max_depth)
+    etag = _current_etag(workbook_name, tree_name, *variant)
+    if etag and _etag_matches(request, etag):
+        return _not_modified(etag)
 
-    # Fallback: Fetch from Seeq if not in memory
     try:
-        print(f"🔄 [DEBUG] Fetching tree from Seeq: {tree_name}")
-
-        tree_modifier = TreeModifier(workbook=workbook_name, tree_name=tree_name)
-        fetched_tree = tree_modifier.tree  # Load tree properly
-
-        if not fetched_tree:
+        tree = _latest_tree(tree_name, workbook_name)
+        if not tree:
             print(f"❌ [DEBUG] Tree '{tree_name}' not found!")
             return {"error": "Tree not found!"}
 
-        print(f"✅ [DEBUG] Successfully fetched tree: {tree_name}")
-
-        # Update global reference
-        current_tree = fetched_tree  
-
-        # Capture visualization output from stdout
-        visualization_output = io.StringIO()
-        with redirect_stdout(visualization_output):
-            fetched_tree.visualize()
-        visualization = visualization_output.getvalue()
-
-        print(f"📊 [DEBUG] Tree Visualization Output:\n{visualization}")
-
-        return {"tree_structure": visualization.strip()}
+        version, rendering = render_cache.render(workbook_name, tree_name, tree, kind=format, max_depth=max_depth)
+        body = {"tree_structure": rendering} if format == "text" else {"tree": rendering}
+        return _versioned_json(body, render_cache.etag(workbook_name, tree_name, version, *variant))
 
     except Exception as e:
         print(f"❌ [ERROR] Failed to visualize tree: {e}")
         return {"error": f"❌ Failed to visualize tree: {e}"}
     
+@router.get("/api/v1/asset_tree/children/", tags=["Asset Tree"])
+def tree_children(
+    request: Request,
+    tree_name: str,
+    workbook_name: str,
+    path: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(settings.TREE_PAGE_SIZE, ge=1, le=settings.TREE_PAGE_MAX),
+):
+    """
+    One page of the direct children of ``path`` (the root when omitted), each with
+    its ``child_count``, so a tree view can expand nodes on demand. Pass the
+    returned ``next_cursor`` as ``cursor`` to fetch the next page. Pages carry an
+    ``ETag`` of the tree version, as in `visualize_tree`.
+    """
+    variant = _variant(request, "children", path, cursor, limit)
+    etag = _current_etag(workbook_name, tree_name, *variant)
+    if etag and _etag_matches(request, etag):
+        return _not_modified(etag)
+
+    try:
+        tree = _latest_tree(tree_name, workbook_name)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"❌ Failed to load tree: {e}")
+    if not tree:
+        raise HTTPException(status_code=404, detail=f"❌ Tree '{tree_name}' not found.")
+    try:
+        version, nodes = render_cache.index(workbook_name, tree_name, tree)
+        page = children_page(nodes, path=path, cursor=cursor, limit=limit)
+        return _versioned_json(page, render_cache.etag(workbook_name, tree_name, version, *variant))
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e.args[0]))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/api/v1/asset_tree/export/", tags=["Asset Tree"])
+def export_tree_rows(
+    tree_name: str,
+    workbook_name: str,
+    format: Literal["ndjson", "csv", "parquet"] = "ndjson",
+    include_ids: bool = False,
+):
+    """
+    Stream every item of a tree (path, name, type, description, formula and
+    formula parameters, plus IDs with ``include_ids``) as NDJSON, CSV or Parquet,
+    in the column layout `process_csv` builds trees from. Rows are encoded in
+    batches of ``settings.EXPORT_BATCH_ROWS``, so large trees never become one document.
+    """
+    try:
+        tree = _latest_tree(tree_name, workbook_name)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"❌ Failed to load tree: {e}")
+    if not tree:
+        raise HTTPException(status_code=404, detail=f"❌ Tree '{tree_name}' not found.")
+    try:
+        chunks = export_tree(tree, format=format, include_ids=include_ids)
+        first = next(chunks, b"")  # Surface format errors (e.g. no pyarrow) before the response starts
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    def stream():
+        yield first
+        yield from chunks
+
+    filename = tree_name.replace('"', "")
+    return StreamingResponse(stream(), media_type=MEDIA_TYPES[format],
+                             headers={"Content-Disposition": f'attachment; filename="{filename}.{format}"'})
+
+def _current_etag(workbook_name: str, tree_name: str, *variant) -> Optional[str]:
+    """
+    ETag of a rendering at the tree's current version; None until the tree has a version,
+    or once its tree cache entry has expired (the request then reloads the tree).
+    """
+    version = render_cache.version(workbook_name, tree_name)
+    if not version:
+        return None
+    if tree_cache.get(workbook_name, tree_name) is None:
+        # Past the cache TTL Seeq may hold a newer tree, so earlier ETags no longer vouch for it
+        render_cache.bump(workbook_name, tree_name)
+        return None
+    return render_cache.etag(workbook_name, tree_name, version, *variant)
+
+def _variant(request: Request, *variant) -> tuple:
+    """A rendering's variant, including the encoding the client negotiated (JSON, msgpack, Arrow)."""
+    return (*variant, negotiate(request.headers.get("accept")))
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    """Whether the client's ``If-None-Match`` names `etag` (weak comparison, as for GET)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = [candidate.strip().removeprefix("W/") for candidate in header.split(",")]
+    return "*" in candidates or etag in candidates
+
+def _not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept"})
+
+def _versioned_json(body, etag: str) -> NegotiatedResponse:
+    # no-cache: clients may keep the body but must revalidate it (cheaply, by ETag) on every use
+    return NegotiatedResponse(body, headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+def _latest_tree(tree_name: str, workbook_name: str) -> Optional[Tree]:
+    """
+    The in-memory tree of this workbook and tree name while its tree cache entry has
+    not expired, otherwise the tree loaded from Seeq. Trees are looked up by workbook
+    and name, so a same-named tree of another workbook is never served.
+    """
+    global current_tree
+
+    # Every build, edit and push keeps the tree cache entry current
+    cached = tree_cache.get(workbook_name, tree_name)
+    if cached is not None:
+        print("✅ [DEBUG] Using in-memory tree.")
+        current_tree = cached
+        return cached
+
+    # Fallback: Fetch from Seeq if not in memory
+    print(f"🔄 [DEBUG] Fetching tree from Seeq: {tree_name}")
+    tree = TreeModifier(workbook=workbook_name, tree_name=tree_name).tree
+    if tree:
+        # Update global reference
+        current_tree = tree
+    return tree
+
 @router.post("/api/v1/asset_tree/modify_tree/", tags=["Asset Tree"])
 async def modify_tree(
     file: UploadFile,
@@ -290,41 +492,42 @@ async def modify_tree(
     workbook_name: str = Form(...),
 ):
     """
-    Modify an existing tree using a CSV file.
+    Modify an existing tree using a CSV file. The insert and push run as an
+    interactive-lane job, so waiting for the tree's lock never blocks the server.
     """
     try:
         file_path = f"./uploaded_files/{file.filename}"
-        os.makedirs("./uploaded_files", exist_ok=True)
-        with open(file_path, "wb") as buffer:
-            buffer.write(await file.read())
+        await stream_upload_to_disk(file, file_path)
 
-        data = pd.read_csv(file_path)
+        columns = sniff_csv_header(file_path)
 
-        if "Parent Path" in data.columns and "Name" in data.columns:
+        if "Parent Path" in columns and "Name" in columns:
             print("✅ Detected item insertion CSV.")
-            tree = Tree.load(workbook=workbook_name, tree=tree_name)
-
-            for _, row in data.iterrows():
-                parent_path = row["Parent Path"]
-                name = row["Name"]
-                formula = row.get("Formula", "")
-                formula_params = row.get("Formula Parameters", "{}")
-
-                item_definition = {
-                    "Name": name,
-                    "Formula": formula,
-                    "Formula Parameters": eval(formula_params),
-                }
-
-                tree.insert(children=[item_definition], parent=parent_path)
-
-            tree.push()
+            job = push_jobs.submit(_insert_items_from_csv, file_path, tree_name, workbook_name,
+                                   name=f"modify_tree: {tree_name}", lane=INTERACTIVE)
+            await wait_for_job(job)
             return {"message": f"Items from '{file.filename}' inserted successfully."}
         else:
             raise ValueError("⚠️ Unsupported CSV format. Ensure required columns exist.")
+    except HTTPException:
+        raise
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def _insert_items_from_csv(file_path: str, tree_name: str, workbook_name: str):
+    data = pd.read_csv(file_path)
+    with tree_locks.lock(workbook_name, tree_name):
+        # Parameters are parsed once per distinct value (JSON or Python literals, no eval)
+        items = item_definitions(data)
+        tree = Tree(tree_name, workbook=workbook_name)  # Loads the tree from Seeq
+        insert_items(tree, items)
+
+        tree_cache.invalidate(workbook_name, tree_name)
+        tree.push()
+        render_cache.bump(workbook_name, tree_name, tree)
+
 class ItemDefinition(BaseModel):
     Name: str
     Type: str
@@ -356,8 +559,19 @@ class RemoveRequest(BaseModel):
     workbook_name: str
     item_path: str  # Ensure full path is provided
 
+class BatchOperation(BaseModel):
+    action: Literal["insert", "move", "remove"]
+    parent_path: Optional[str] = None  # insert
+    item_definition: Optional[ItemDefinition] = None  # insert
+    source_path: Optional[str] = None  # move
+    destination_path: Optional[str] = None  # move
+    item_path: Optional[str] = None  # remove
+
+class BatchRequest(ModifyRequest):
+    operations: List[BatchOperation]
+
 @app.post("/api/v1/asset_tree/insert_item/", tags=["Asset Tree"])
-async def insert_item(request: InsertItemRequest):
+def insert_item(request: InsertItemRequest):
     try:
         modifier = TreeModifier(request.workbook_name, request.tree_name)
         parent = request.parent_name
@@ -391,7 +605,7 @@ def move_item(request: MoveRequest):
         raise HTTPException(status_code=400, detail=str(e))
 
 @app.post("/api/v1/asset_tree/remove_item/", tags=["Asset Tree"])
-async def remove_item(request: RemoveRequest):
+def remove_item(request: RemoveRequest):
     try:
         modifier = TreeModifier(request.workbook_name, request.tree_name)
         modifier.remove_item(request.item_path)
@@ -404,6 +618,42 @@ async def remove_item(request: RemoveRequest):
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
   
+@router.post("/api/v1/asset_tree/batch/", tags=["Asset Tree"])
+def batch_modify(request: BatchRequest):
+    """Apply a list of insert/move/remove operations to a tree and push it once."""
+    try:
+        modifier = TreeModifier(request.workbook_name, request.tree_name)
+        modifier.begin_batch()
+
+        for operation in request.operations:
+            if operation.action == "insert":
+                if operation.parent_path is None or operation.item_definition is None:
+                    raise ValueError("⚠️ 'insert' requires 'parent_path' and 'item_definition'.")
+                item = operation.item_definition
+                item_data = {"Name": item.Name, "Type": item.Type}
+                if item.Formula:
+                    item_data["Formula"] = item.Formula
+                    item_data["Formula Parameters"] = item.FormulaParams or {}
+                modifier.insert_item(operation.parent_path, item_data)
+            elif operation.action == "move":
+                if not operation.source_path or not operation.destination_path:
+                    raise ValueError("⚠️ 'move' requires 'source_path' and 'destination_path'.")
+                modifier.move_item(operation.source_path, operation.destination_path)
+            else:
+                if not operation.item_path:
+                    raise ValueError("⚠️ 'remove' requires 'item_path'.")
+                modifier.remove_item(operation.item_path)
+
+        result = modifier.commit_batch()
+
+        # Force update of current_tree
+        global current_tree
+        current_tree = modifier.tree
+
+        return {"message": f"✅ Applied {result['operations']} operation(s) with a single push.", **result}
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+  
 # Correctly include the router in FastAPI  
 app.include_router(router)
 
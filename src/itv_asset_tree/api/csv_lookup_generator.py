@@ -8,8 +8,6 @@ from typing import List, Dict
 import json
 import os
 import sys
-import io
-from contextlib import redirect_stdout
 
 # Get absolute path of `src`
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -17,7 +15,7 @@ project_root = os.path.abspath(os.path.join(current_dir, "..", ".."))  # Adjust
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
     
-from itv_asset_tree.utils.duplicate_resolution import (
+from ..utils.duplicate_resolution import (
     DuplicateResolver,
     KeepFirstStrategy,
     KeepLastStrategy,
@@ -25,13 +23,37 @@ from itv_asset_tree.utils.duplicate_resolution import (
     UserSpecificStrategy,
 )
 
-from itv_asset_tree.utils.csv_parser import CSVHandler
-from itv_asset_tree.utils.lookup_builder import LookupTableBuilder
-from itv_asset_tree.core.tree_modifier import TreeModifier
+from ..utils.csv_ingest import read_csv_fast
+from ..utils.csv_parser import CSVHandler
+from ..utils.upload_stream import (
+    UploadTooLargeError,
+    require_columns,
+    sniff_csv_header,
+    stream_upload_to_disk,
+)
+from ..utils.lookup_builder import (
+    SHARED_LOOKUP_PARAMETER,
+    LookupTableBuilder,
+    SharedLookups,
+    lookup_string_name,
+)
+from ..utils.lookup_fingerprints import LookupFingerprints, fingerprint_file
+from ..utils.lookup_stream import stream_lookup_to_csv
+from ..config import settings
+from ..core.tree_modifier import TreeModifier
+from ..core.tree_cache import tree_cache
+from ..core.tree_locks import tree_locks
+from ..core.chunked_push import full_paths_of, push_state_path
+from ..core.bulk_insert import insert_items, item_definitions, parse_formula_parameters
+from ..core.push_jobs import INTERACTIVE, push_jobs
+from ..core.tree_serializer import render_text
+from .jobs import job_accepted, wait_for_job
+from .responses import NegotiatedResponse, NegotiatedRoute
 
 UPLOAD_DIR = "./output" # Directory to store uploaded files
+PARENT_PATH_PLACEHOLDER = "Set this path (i.e. Reactor Plant >> Reactor 1)"  # Filled in by set_parent_paths
 
-router = APIRouter()
+router = APIRouter(route_class=NegotiatedRoute, default_response_class=NegotiatedResponse)
 
 @router.post("/upload_raw_csv/", tags=["CSV Workflow"])
 async def upload_raw_csv(file: UploadFile = File(...)):
@@ -39,17 +61,15 @@ async def upload_raw_csv(file: UploadFile = File(...)):
     Endpoint to upload and validate a raw CSV file.
     """
     try:
-        # Ensure the output directory exists
-        os.makedirs(UPLOAD_DIR, exist_ok=True)
-
-        # Save the file
+        # Stream the file to disk (the output directory is created if needed)
         file_path = os.path.join(UPLOAD_DIR, file.filename)
-        with open(file_path, "wb") as buffer:
-            buffer.write(await file.read())
+        await stream_upload_to_disk(file, file_path)
 
-        # Validate the file (ensure it's a readable CSV)
-        pd.read_csv(file_path)  # This will raise an error if not a valid CSV
-        return {"message": f"✅ File '{file.filename}' uploaded successfully."}
+        # Validate the file from its header row (raises if there is none)
+        columns = sniff_csv_header(file_path)
+        return {"message": f"✅ File '{file.filename}' uploaded successfully.", "columns": columns}
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
     except Exception as e:
         print(f"❌ Error uploading raw CSV: {str(e)}")
         raise HTTPException(status_code=500, detail=f"❌ Failed to upload raw CSV: {str(e)}")
@@ -64,18 +84,17 @@ async def get_duplicates(
 ):
     try:
         file_path = f"./uploaded_files/{file.filename}"
-        with open(file_path, "wb") as f:
-            f.write(await file.read())
+        await stream_upload_to_disk(file, file_path)
 
+        require_columns(file_path, [group_column, key_column, value_column])
         data = pd.read_csv(file_path)
-        for column in [group_column, key_column, value_column]:
-            if column not in data.columns:
-                raise ValueError(f"❌ Column '{column}' not found in the uploaded CSV.")
 
         duplicates = data[data.duplicated(subset=[group_column, key_column], keep=False)]
-        duplicates_json = duplicates.to_dict(orient="records")
 
-        return {"message": "Duplicates found!", "duplicates": duplicates_json}
+        # Encoded straight from the DataFrame (JSON records, msgpack or Arrow; see api.responses)
+        return {"message": "Duplicates found!", "duplicates": duplicates}
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -92,17 +111,12 @@ async def resolve_duplicates_endpoint(
     try:
         # Save the uploaded file temporarily
         file_path = f"./uploaded_files/{file.filename}"
-        with open(file_path, "wb") as f:
-            f.write(await file.read())
+        await stream_upload_to_disk(file, file_path)
 
-        # Load the CSV data
+        # Validate required columns from the header before loading the data
+        require_columns(file_path, [group_column, key_column, value_column])
         data = pd.read_csv(file_path)
 
-        # Validate required columns
-        for column in [group_column, key_column, value_column]:
-            if column not in data.columns:
-                raise ValueError(f"❌ Column '{column}' not found in the uploaded CSV.")
-
         # Parse rows_to_remove if provided
         rows_to_remove = json.loads(rows_to_remove) if rows_to_remove else []
 
@@ -120,6 +134,8 @@ async def resolve_duplicates_endpoint(
             "message": "✅ Duplicates resolved successfully. Resolved data saved.",
             "resolved_file": resolved_file_path,
         }
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
     
@@ -150,12 +166,38 @@ async def generate_lookup(
     group_column: str = Form(...),
     key_column: str = Form(...),
     value_column: str = Form(...),
-    output_file: str = Form(...)
+    output_file: str = Form(...),
+    streaming: bool = Form(False),
+    dedupe: bool = Form(False)
 ):
+    """
+    Build lookup strings from resolved_data.csv. Every row's Parent Path is a placeholder
+    to be filled in with `set_parent_paths`. With `streaming` (always for files of at least
+    ``settings.LOOKUP_STREAM_MIN_BYTES``) the file is grouped through on-disk spill partitions
+    and the lookup CSV is written as each group is built, instead of loading everything in memory.
+
+    The output file always holds every lookup string. Their fingerprints are stored next to it,
+    in this stage's own fingerprint file (see `fingerprint_file`), and the response reports which
+    changed since the last generation; only `push_lookup` skips unchanged ones. With `dedupe`,
+    groups whose table repeats an earlier group's table reference that group's lookup string
+    instead of carrying their own copy.
+    """
     resolved_path = os.path.join(UPLOAD_DIR, "resolved_data.csv")
     if not os.path.exists(resolved_path):
         return {"message": "❌ Resolved data file not found. Ensure duplicates are resolved first."}
 
+    output_path = os.path.join(UPLOAD_DIR, output_file)
+    fingerprints = LookupFingerprints.load(fingerprint_file(output_path, "generate_lookup"), skip_unchanged=False)
+    if streaming or os.path.getsize(resolved_path) >= settings.LOOKUP_STREAM_MIN_BYTES:
+        require_columns(resolved_path, [group_column, key_column, value_column])
+        # Groups are only known as they stream by, so every row gets the placeholder path
+        written = stream_lookup_to_csv(resolved_path, output_path, group_column, key_column, value_column,
+                                       fingerprints=fingerprints, dedupe=dedupe,
+                                       default_parent_path=PARENT_PATH_PLACEHOLDER)
+        fingerprints.save(fingerprint_file(output_path, "generate_lookup"))
+        return {"message": f"✅ Lookup file '{output_file}' created successfully ({written} lookup strings, streamed).",
+                "output_file": output_file, "lookup_strings": fingerprints.report()}
+
     # Load resolved data
     csv_handler = CSVHandler(resolved_path)
     resolved_data = csv_handler.load_csv()
@@ -165,22 +207,25 @@ async def generate_lookup(
     lookup_data = lookup_builder.build(resolved_data)
 
     # Save initial lookup output
-    parent_paths = {f"{group.replace(' ', '_')}_LookupString": "Set this path (i.e. Reactor Plant >> Reactor 1)" for group in lookup_data.keys()}  # Ensure _LookupString is appended
-    output_path = os.path.join(UPLOAD_DIR, output_file)
-    lookup_builder.save_lookup_to_csv(lookup_data, parent_paths, output_path)
+    parent_paths = {lookup_string_name(group): PARENT_PATH_PLACEHOLDER for group in lookup_data.keys()}  # Ensure _LookupString is appended
+    lookup_builder.save_lookup_to_csv(lookup_data, parent_paths, output_path, fingerprints, dedupe)
+    fingerprints.save(fingerprint_file(output_path, "generate_lookup"))
 
-    return {"message": f"✅ Lookup file '{output_file}' created successfully.", "output_file": output_file}
+    return {"message": f"✅ Lookup file '{output_file}' created successfully.", "output_file": output_file,
+            "lookup_strings": fingerprints.report()}
 
 class ParentPathsRequest(BaseModel):
     parent_paths: Dict[str, str]  # Example: {"GroupName_LookupString": "ParentPath"}
     group_column: str  # Column to group data by
     key_column: str  # Column for the key values
     value_column: str  # Column for the value descriptions
+    dedupe: bool = False  # Groups with an identical table reference one shared lookup string
 
 @router.post("/set_parent_paths/", tags=["CSV Workflow"])
 async def set_parent_paths(request: ParentPathsRequest):
     """
-    Assign Parent Paths to lookup strings and save the final lookup_output.csv.
+    Assign Parent Paths to lookup strings and save the final lookup_output.csv, with every
+    lookup string; the response reports which changed since the last run of this stage.
     """
     try:
         resolved_path = os.path.join(UPLOAD_DIR, "resolved_data.csv")
@@ -214,100 +259,169 @@ async def set_parent_paths(request: ParentPathsRequest):
         lookup_builder = LookupTableBuilder(group_column, key_column, value_column)
         lookup_tables = lookup_builder.build(data)
 
+        output_file = os.path.join(UPLOAD_DIR, "lookup_output.csv")
+        fingerprints = LookupFingerprints.load(fingerprint_file(output_file, "set_parent_paths"), skip_unchanged=False)
+        shared = SharedLookups() if request.dedupe else None
+
         lookup_data = []
         for name, formula in lookup_tables.items():
             # Normalize name for matching
-            normalized_name = f"{name.replace(' ', '_')}_LookupString"
+            normalized_name = lookup_string_name(name)
             parent_path = parent_paths.get(normalized_name, "Root Asset")
-            lookup_data.append({
+            row = {
                 "Name": normalized_name,
                 "Formula": str(formula).replace('"', "'"),
                 "Formula Parameters": "{}",
                 "Parent Path": parent_path,
-            })
+            }
+            if shared is not None:
+                row = shared.row(row, formula)
+            fingerprints.keep(row)  # Reported only; push_lookup skips what this tree already has
+            lookup_data.append(row)
 
         # Save the final lookup_output.csv
-        output_file = os.path.join(UPLOAD_DIR, "lookup_output.csv")
-        lookup_df = pd.DataFrame(lookup_data)
+        lookup_df = pd.DataFrame(lookup_data, columns=["Name", "Formula", "Formula Parameters", "Parent Path"])
         lookup_df.to_csv(output_file, index=False)
+        fingerprints.save(fingerprint_file(output_file, "set_parent_paths"))
 
-        return {"message": f"✅ Lookup file created successfully and saved to {output_file}."}
+        return {"message": f"✅ Lookup file created successfully and saved to {output_file}.",
+                "lookup_strings": fingerprints.report(),
+                "distinct_tables": shared.distinct if shared is not None else len(lookup_tables)}
     except Exception as e:
         print("❌ Error during processing:", str(e))
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.post("/push_lookup/", tags=["CSV Workflow"])
-async def push_lookup(tree_name: str = Form(...), workbook_name: str = Form(...)):
+async def push_lookup(tree_name: str = Form(...), workbook_name: str = Form(...), background: bool = Form(False),
+                      incremental: bool = Form(False)):
     """
     Pushes lookup_output.csv to the specified tree in Seeq and returns the visualization.
+    The push runs as an interactive-lane job; with `background` only the job ID is returned.
+    With `incremental`, lookup strings already pushed to this tree unchanged are skipped; the
+    record of what a tree has is only updated after a successful push.
     """
+    print(f"📌 Received request to push lookup. Tree: {tree_name}, Workbook: {workbook_name}")
+
+    lookup_file = os.path.join(UPLOAD_DIR, "lookup_output.csv")
+    if not os.path.exists(lookup_file):
+        print("❌ lookup_output.csv NOT FOUND!")
+        raise HTTPException(status_code=404, detail="❌ lookup_output.csv not found. Ensure it has been generated.")
+
+    print(f"✅ Found lookup_output.csv at: {lookup_file}")
+
+    job = push_jobs.submit(
+        _push_lookup_file, lookup_file, tree_name, workbook_name, incremental,
+        name=f"push_lookup: {tree_name}", lane=INTERACTIVE,
+    )
+    if background:
+        return job_accepted(job)
     try:
-        print(f"📌 Received request to push lookup. Tree: {tree_name}, Workbook: {workbook_name}")
+        return await wait_for_job(job)
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        print(f"❌ ERROR pushing lookup table: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"❌ Error pushing lookup table: {str(e)}")
 
-        lookup_file = os.path.join(UPLOAD_DIR, "lookup_output.csv")
-        if not os.path.exists(lookup_file):
-            print("❌ lookup_output.csv NOT FOUND!")
-            raise HTTPException(status_code=404, detail="❌ lookup_output.csv not found. Ensure it has been generated.")
 
-        print(f"✅ Found lookup_output.csv at: {lookup_file}")
+def _push_lookup_file(lookup_file: str, tree_name: str, workbook_name: str, incremental: bool = False) -> dict:
+    # Load the lookup CSV (every column is text)
+    lookup_rows = data = read_csv_fast(lookup_file, text_columns_only=True)
+    print(f"📊 Loaded CSV with {len(data)} rows")
 
-        # Load the lookup CSV
-        data = pd.read_csv(lookup_file)
-        print(f"📊 Loaded CSV with {len(data)} rows")
+    # Fingerprints of the lookup strings last pushed to this tree
+    pushed_file = push_state_path(workbook_name, tree_name, "lookup_fingerprints.json")
+    fingerprints = LookupFingerprints.load(pushed_file, skip_unchanged=incremental)
+    data = data[[fingerprints.keep(row) for row in data.fillna("").to_dict(orient="records")]]
+    if data.empty:
+        print(f"⏭️ All {len(fingerprints.skipped)} lookup strings unchanged; nothing to push.")
+        return {"message": "No lookup strings changed; nothing pushed.", "skipped": fingerprints.skipped}
+
+    # Item definitions for every lookup string, with all parameters parsed in one pass
+    references = data["Formula"].astype(str).str.strip() == SHARED_LOOKUP_PARAMETER
+    try:
+        items = _lookup_items(data[~references])
+    except ValueError as e:
+        print(f"❌ {e}")
+        raise  # A malformed lookup file; push_lookup answers 400
 
+    # Insert and push under the tree's lock, so no other edit of the cached tree interleaves
+    with tree_locks.lock(workbook_name, tree_name):
         # Load the tree
         tree_modifier = TreeModifier(workbook=workbook_name, tree_name=tree_name)
         print("🌳 TreeModifier initialized.")
 
-        # Insert lookup items
-        for _, row in data.iterrows():
-            parent_path = row["Parent Path"].strip()
-            name = row["Name"].strip()
-            
-            formatted_formula = f'"{row["Formula"]}"'  
-            formula_parameters = row.get("Formula Parameters", "{}")
-
-            try:
-                formula_parameters = json.loads(formula_parameters) if formula_parameters.strip() else {}
-            except json.JSONDecodeError:
-                print(f"❌ Invalid JSON in Formula Parameters: {formula_parameters}")
-                raise HTTPException(status_code=400, detail="❌ Invalid JSON in Formula Parameters")
-
-            item_definition = {
-                "Name": name,
-                "Formula": formatted_formula,
-                "Formula Parameters": formula_parameters,
-            }
-
-            print(f"➕ Inserting '{name}' under '{parent_path}' with formula: {formatted_formula}")
-
-            tree_modifier.tree.insert(children=[item_definition], parent=parent_path)
-    
-        # Push the tree to Seeq
+        # Insert lookup items in bulk (one call, unless some parents are created by the same file)
+        print(f"➕ Inserting {len(items)} lookup strings under {items['Parent'].nunique()} parent path(s)")
+        snapshot = tree_modifier.tree._dataframe.copy()
+        try:
+            insert_items(tree_modifier.tree, items)
+            if references.any():
+                # Shared tables are referenced where their lookup string actually landed
+                resolved = _resolve_shared_lookups(tree_modifier.tree.df, data[references], lookup_rows)
+                insert_items(tree_modifier.tree, _lookup_items(resolved))
+        except Exception:
+            # Leave no half-inserted rows in the shared cached tree
+            tree_modifier.tree._dataframe = snapshot
+            tree_cache.invalidate(workbook_name, tree_name)
+            raise
+
+        # Push the tree to Seeq (refreshes the cached copy, so no reload is needed; a failed push drops it)
         print("🚀 Pushing tree to Seeq...")
-        tree_modifier.tree.push()
+        tree_modifier.push_tree()
         print("✅ Lookup table successfully pushed!")
+    fingerprints.save(pushed_file, keep_previous=True)
 
-        # 🔥 Reload `current_tree` after push
-        global current_tree, current_tree_name
-        tree_modifier = TreeModifier(workbook=workbook_name, tree_name=tree_name)  # Reload tree from Seeq
-        current_tree = tree_modifier.tree  # Assign updated tree
-        current_tree_name = tree_name  # Track tree name
-        
-        print("✅ Tree successfully reloaded into memory after push.")
+    global current_tree, current_tree_name
+    current_tree = tree_modifier.tree  # Pushed tree already carries the new IDs
+    current_tree_name = tree_name  # Track tree name
 
-        # ✅ Capture tree visualization output (same as `process_csv()`)
-        visualize_output = io.StringIO()
-        with redirect_stdout(visualize_output):
-            current_tree.visualize()
-        visualization = visualize_output.getvalue()
+    return {
+        "message": "Lookup table successfully pushed to Seeq.",
+        "pushed": data["Name"].tolist(),
+        "skipped": fingerprints.skipped,
+        "tree_structure": render_text(current_tree.df),  # ✅ Return visualization to the UI (same as `process_csv()`)
+    }
 
-        return {
-            "message": "Lookup table successfully pushed to Seeq.",
-            "tree_structure": visualization.strip(),  # ✅ Return visualization to the UI
-        }
 
-    except Exception as e:
-        print(f"❌ ERROR pushing lookup table: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"❌ Error pushing lookup table: {str(e)}")
\ No newline at end of file
+def _lookup_items(data: pd.DataFrame) -> pd.DataFrame:
+    """Item definitions of lookup rows: tables become string literals, references to a shared table stay formulas."""
+    parameters = data.get("Formula Parameters", pd.Series("", index=data.index)).fillna("").astype(str).str.strip()
+    literal = parameters.isin(["", "{}"])
+    formulas = data["Formula"].astype(str).where(~literal, '"' + data["Formula"].astype(str) + '"')
+    return item_definitions(data.assign(Formula=formulas))
+
+
+def _resolve_shared_lookups(tree_df: pd.DataFrame, references: pd.DataFrame, lookup_rows: pd.DataFrame) -> pd.DataFrame:
+    """
+    Point lookup strings that reuse a shared table at the full path the shared string has in the tree.
+
+    References are generated as ``<Parent Path> >> <Name>``, but a parent path may be
+    partial or a wildcard, which ``Tree.insert`` accepts. The reference is therefore matched
+    against the tree's full paths, exactly or as their end. A reference that matches no
+    single item gets its own copy of the table instead.
+    """
+    full_paths = full_paths_of(tree_df)
+    keys = full_paths.str.casefold()
+    tables = lookup_rows[lookup_rows["Formula"].astype(str).str.strip() != SHARED_LOOKUP_PARAMETER]
+    literals = dict(zip(tables["Parent Path"].astype(str) + " >> " + tables["Name"].astype(str), tables["Formula"]))
+
+    resolved = []
+    for _, row in references.iterrows():
+        shared_path = parse_formula_parameters(pd.Series([row["Formula Parameters"]]))[0][SHARED_LOOKUP_PARAMETER]
+        target = shared_path.strip().casefold()
+        matches = full_paths[(keys == target) | keys.str.endswith(f" >> {target}")]
+        if len(matches) == 1:
+            row = row.copy()
+            row["Formula Parameters"] = json.dumps({SHARED_LOOKUP_PARAMETER: matches.iloc[0]}, ensure_ascii=False)
+        elif shared_path in literals:
+            print(f"⚠️ Shared lookup '{shared_path}' is not one item of the tree; '{row['Name']}' gets its own table.")
+            row = row.copy()
+            row["Formula"], row["Formula Parameters"] = literals[shared_path], "{}"
+        else:
+            raise ValueError(f"❌ '{row['Name']}' references '{shared_path}', which is not in the lookup file.")
+        resolved.append(row)
+    return pd.DataFrame(resolved, columns=references.columns)
@@ -0,0 +1,65 @@
+# src/itv_asset_tree/api/jobs.py
+
+from typing import Any, Optional
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import JSONResponse
+
+from ..core.push_jobs import LANES, JobCancelledError, JobNotCancellableError, PushJob, push_jobs
+
+# Jobs are tracked in the memory of the worker process that accepted them (see `PushJobQueue`):
+# run the API with a single worker, or another worker answers 404 for the job.
+router = APIRouter()
+
+
+def job_accepted(job: PushJob, message: Optional[str] = None) -> JSONResponse:
+    """202 response for an endpoint that handed its push to the job queue."""
+    return JSONResponse(status_code=202, content={
+        "message": message or f"📥 Job '{job.name}' queued.",
+        "job_id": job.id,
+        "status_url": f"/api/v1/jobs/{job.id}",
+        "job": job.to_dict(),
+    })
+
+
+async def wait_for_job(job: PushJob) -> Any:
+    """Await a job for an endpoint that answers inline; a cancelled job is a 409."""
+    try:
+        return await push_jobs.wait(job)
+    except JobCancelledError:
+        raise HTTPException(status_code=409, detail=f"❌ Job '{job.name}' was cancelled.")
+
+
+@router.get("/", tags=["Jobs"])
+def list_jobs(lane: Optional[str] = None, status: Optional[str] = None):
+    """Recent push jobs, oldest first, with per-lane counts."""
+    if lane is not None and lane not in LANES:
+        raise HTTPException(status_code=400, detail=f"❌ Unknown lane '{lane}'. Choose one of {list(LANES)}.")
+    return {
+        "jobs": [job.to_dict() for job in push_jobs.list(lane=lane, status=status)],
+        "stats": push_jobs.stats(),
+    }
+
+
+@router.get("/{job_id}", tags=["Jobs"])
+def get_job(job_id: str):
+    """Status of one job; its result once it has succeeded. Only the worker that accepted the job knows it."""
+    try:
+        return push_jobs.get(job_id).to_dict()
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"❌ Job '{job_id}' not found.")
+
+
+@router.post("/{job_id}/cancel", tags=["Jobs"])
+def cancel_job(job_id: str):
+    """
+    Cancel a queued job; a running chunked or parallel push stops at its next checkpoint.
+    Any other running job cannot be cancelled and gets a 409 (it runs to completion).
+    """
+    try:
+        job = push_jobs.cancel(job_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"❌ Job '{job_id}' not found.")
+    except JobNotCancellableError as e:
+        raise HTTPException(status_code=409, detail=f"❌ {e}")
+    return job.to_dict()
@@ -0,0 +1,219 @@
+# src/itv_asset_tree/api/responses.py
+
+import datetime
+import functools
+import inspect
+import json
+import pathlib
+from contextvars import ContextVar
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
+from starlette.background import BackgroundTask
+from starlette.responses import Response
+
+try:
+    import orjson
+    _ORJSON_AVAILABLE = True
+except ImportError:
+    _ORJSON_AVAILABLE = False
+
+try:
+    import msgpack
+    _MSGPACK_AVAILABLE = True
+except ImportError:
+    _MSGPACK_AVAILABLE = False
+
+try:
+    import pyarrow as pa
+    _PYARROW_AVAILABLE = True
+except ImportError:
+    _PYARROW_AVAILABLE = False
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+ARROW = "application/vnd.apache.arrow.stream"
+# Other names clients use for the same encodings
+_ALIASES = {"application/x-msgpack": MSGPACK, "application/vnd.msgpack": MSGPACK,
+            "application/vnd.apache.arrow.file": ARROW}
+
+# Accept header of the request being handled (set by NegotiatedRoute)
+_accept: ContextVar[Optional[str]] = ContextVar("accept", default=None)
+
+
+def available_media_types() -> List[str]:
+    """Encodings this server can produce; msgpack and Arrow need their optional packages."""
+    return [JSON] + ([MSGPACK] if _MSGPACK_AVAILABLE else []) + ([ARROW] if _PYARROW_AVAILABLE else [])
+
+
+def negotiate(accept: Optional[str]) -> str:
+    """
+    Pick the response media type for an ``Accept`` header: the highest-q type we
+    can produce, JSON when the header is missing, a wildcard or nothing matches.
+    """
+    if not accept:
+        return JSON
+    available = available_media_types()
+    ranked = []
+    for position, part in enumerate(accept.split(",")):
+        media_type, *params = [piece.strip() for piece in part.split(";")]
+        quality = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    quality = float(param[2:])
+                except ValueError:
+                    quality = 0.0
+        ranked.append((-quality, position, _ALIASES.get(media_type.lower(), media_type.lower())))
+    for negative_quality, _, media_type in sorted(ranked):
+        if negative_quality == 0:
+            break
+        if media_type in available:
+            return media_type
+        if media_type in ("*/*", "application/*"):
+            return JSON
+    return JSON
+
+
+class NegotiatedResponse(Response):
+    """
+    Response encoded as JSON (through orjson when installed), msgpack or Arrow IPC,
+    whichever the request's ``Accept`` header prefers (see `negotiate`).
+
+    DataFrames anywhere in the content are encoded directly as lists of records.
+    Arrow responses carry one table: the content itself when it is a DataFrame,
+    otherwise its first DataFrame or list-of-records value, with the remaining
+    scalar values as schema metadata. Content without a table is sent as JSON.
+    """
+
+    media_type = JSON
+
+    def __init__(self, content=None, status_code: int = 200, headers: Optional[dict] = None,
+                 media_type: Optional[str] = None, background: Optional[BackgroundTask] = None):
+        media_type = media_type or negotiate(_accept.get())
+        self.media_type = media_type
+        headers = {"Vary": "Accept", **(headers or {})}
+        super().__init__(content, status_code, headers, media_type, background)
+
+    def render(self, content) -> bytes:
+        if self.media_type == ARROW:
+            table = _arrow_table(content)
+            if table is not None:
+                sink = pa.BufferOutputStream()
+                with pa.ipc.new_stream(sink, table.schema) as writer:
+                    writer.write_table(table)
+                return sink.getvalue().to_pybytes()
+            self.media_type = JSON
+        if self.media_type == MSGPACK:
+            return msgpack.packb(content, default=_encode_default, use_bin_type=True)
+        return dumps_json(content)
+
+
+def dumps_json(content) -> bytes:
+    """Compact JSON bytes; NaN becomes null."""
+    if _ORJSON_AVAILABLE:
+        return orjson.dumps(content, default=_encode_default,
+                            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(_finite(content), default=lambda value: _finite(_encode_default(value)), ensure_ascii=False,
+                      allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+class NegotiatedRoute(APIRoute):
+    """
+    Route whose plain return values (dicts, lists, DataFrames) become a
+    `NegotiatedResponse` inside the endpoint, so they skip FastAPI's
+    ``jsonable_encoder`` pass. Responses returned explicitly are left alone.
+    """
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        super().__init__(path, _negotiated(endpoint), **kwargs)
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def negotiated_handler(request):
+            token = _accept.set(request.headers.get("accept"))
+            try:
+                return await handler(request)
+            finally:
+                _accept.reset(token)
+
+        return negotiated_handler
+
+
+def _negotiated(endpoint):
+    if getattr(endpoint, "_negotiated", False):
+        return endpoint  # Already wrapped (routes are re-created when routers are included)
+
+    def wrap(result):
+        return result if isinstance(result, Response) else NegotiatedResponse(result)
+
+    if inspect.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def negotiated_endpoint(*args, **kwargs):
+            return wrap(await endpoint(*args, **kwargs))
+    else:
+        @functools.wraps(endpoint)
+        def negotiated_endpoint(*args, **kwargs):
+            return wrap(endpoint(*args, **kwargs))
+    negotiated_endpoint._negotiated = True
+    return negotiated_endpoint
+
+
+def _records(frame: pd.DataFrame) -> list:
+    return frame.astype(object).where(frame.notna(), None).to_dict(orient="records")
+
+
+def _encode_default(value):
+    """Encode what orjson/json/msgpack do not handle natively."""
+    if isinstance(value, pd.DataFrame):
+        return _records(value)
+    if isinstance(value, pd.Series):
+        return value.astype(object).where(value.notna(), None).tolist()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    if isinstance(value, pathlib.PurePath):
+        return str(value)
+    if value is pd.NA or value is pd.NaT:
+        return None
+    raise TypeError(f"Object of type {type(value).__name__} is not serializable")
+
+
+def _finite(value):
+    """NaN and infinite floats (at any depth of dicts and lists) as None, as orjson writes them."""
+    if isinstance(value, float):
+        return value if np.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: _finite(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_finite(item) for item in value]
+    return value
+
+
+def _arrow_table(content) -> Optional["pa.Table"]:
+    if isinstance(content, pd.DataFrame):
+        return pa.Table.from_pandas(content, preserve_index=False)
+    if not isinstance(content, dict):
+        return None
+    for key, value in content.items():
+        if isinstance(value, pd.DataFrame):
+            table = pa.Table.from_pandas(value, preserve_index=False)
+        elif isinstance(value, list) and value and all(isinstance(row, dict) for row in value):
+            table = pa.Table.from_pylist(value)
+        else:
+            continue
+        metadata = {name: dumps_json(other) for name, other in content.items()
+                    if name != key and not isinstance(other, (pd.DataFrame, list, dict))}
+        return table.replace_schema_metadata({**(table.schema.metadata or {}), **metadata})
+    return None
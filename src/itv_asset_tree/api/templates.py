@@ -10,6 +10,10 @@ import traceback
 import json
 import importlib
 
+from itv_asset_tree.core.push_jobs import BULK, push_jobs
+from itv_asset_tree.api.jobs import job_accepted, wait_for_job
+from itv_asset_tree.api.responses import NegotiatedResponse, NegotiatedRoute
+
 # ✅ Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -41,7 +45,7 @@ TEMPLATE_CLASSES = {
 
 logger.info(f"📌 TEMPLATE_CLASSES initialized at startup: {list(TEMPLATE_CLASSES.keys())}")
 
-router = APIRouter()
+router = APIRouter(route_class=NegotiatedRoute, default_response_class=NegotiatedResponse)
 
 class BuildRequest(BaseModel):
     template_name: str = Field(..., description="The name of the template to apply")
@@ -61,6 +65,9 @@ class BuildRequest(BaseModel):
     # ✅ New Field for Metrics
     metrics_template: Optional[str] = Field(None, description="Template applied to add metrics")
 
+    # ✅ Run the push as a bulk-lane job and return its ID instead of waiting
+    background: bool = Field(False, description="Queue the build and return a job ID (poll /api/v1/jobs/{job_id})")
+
 @router.get("/templates/", tags=["Templates"])
 async def get_templates():
     """
@@ -111,7 +118,14 @@ async def get_template_parameters(template_name: str):
 BASE_TEMPLATE_MAP = {template + "_With_Calcs": template for template in TEMPLATE_CLASSES if not template.endswith("_With_Calcs")}
 
 @router.post("/build", tags=["Templates"])
-def build_template(request: BuildRequest):
+async def build_template(request: BuildRequest):
+    """Build and push a template on the bulk lane; with `background` the job ID is returned at once."""
+    job = push_jobs.submit(_build_and_push_template, request, name=f"template: {request.template_name}", lane=BULK)
+    if request.background:
+        return job_accepted(job)
+    return await wait_for_job(job)
+
+def _build_and_push_template(request: BuildRequest):
     try:
         logger.info(f"🔍 Received request: {request.dict()}")
 
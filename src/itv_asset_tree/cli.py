@@ -330,6 +330,8 @@ from seeq.spy.assets import Tree
 from itv_asset_tree.core.tree_builder import TreeBuilder
 from itv_asset_tree.core.tree_modifier import TreeModifier
 from itv_asset_tree.core.push_manager import PushManager
+from itv_asset_tree.core.batch_builder import BatchTreeBuilder
+from itv_asset_tree.core.tree_export import EXPORT_FORMATS, export_tree as export_tree_chunks
 from itv_asset_tree.utils.logger import log_info, log_error
 
 # ✅ Load environment variables
@@ -376,7 +378,7 @@ def build_tree(workbook_name, csv_file_path):
         # ✅ Extract the root node name dynamically from the CSV
         root_candidates = tree_builder.metadata["Level 1"].dropna().unique()
         if len(root_candidates) > 1:
-            raise ValueError(f"❌ Multiple root nodes detected: {root_candidates}")
+            raise ValueError(f"❌ Multiple root nodes detected: {root_candidates}. Use 'build-trees' instead.")
         elif len(root_candidates) == 0:
             raise ValueError("❌ No valid root node found in CSV.")
         
@@ -394,12 +396,41 @@ def build_tree(workbook_name, csv_file_path):
         # ✅ Ask before pushing
         should_push = input("🚀 Do you want to push this tree to Seeq? (y/N): ").strip().lower()
         if should_push == "y":
-            tree_builder.tree.push()
+            PushManager(tree_builder.tree).push_full()  # Chunked and resumable for large trees
             log_info(f"✅ Tree '{tree_name}' pushed successfully to workbook '{workbook_name}'.")
 
     except Exception as e:
         log_error(f"❌ Error building tree: {e}")
         
+@click.command()
+@click.argument("workbook_name")
+@click.argument("source")
+@click.option("--workers", "-w", type=int, default=None, help="Processes compiling tree paths (default: one per CPU)")
+@click.option("--max-pushes", "-p", type=int, default=None, help="Trees built and pushed concurrently")
+@click.option("--no-push", is_flag=True, default=False, help="Build the trees without pushing them")
+def build_trees(workbook_name, source, workers, max_pushes, no_push):
+    """CLI command to build one tree per root from a multi-root CSV or a directory of CSVs."""
+    ensure_seeq_login()  # ✅ Ensure we're logged into Seeq
+
+    log_info(f"CLI: Batch building trees in workbook '{workbook_name}' from '{source}'")
+
+    batch_builder = BatchTreeBuilder(
+        workbook_name,
+        max_workers=workers,
+        max_concurrent_pushes=max_pushes,
+        push=not no_push,
+    )
+
+    try:
+        results = batch_builder.build(source)
+        for result in results:
+            if result["status"] == "failed":
+                log_error(f"❌ Tree '{result['tree']}' failed: {result['error']}")
+            else:
+                log_info(f"✅ Tree '{result['tree']}' {result['status']} ({result['rows']} rows).")
+    except Exception as e:
+        log_error(f"❌ Error building trees: {e}")
+
 @click.command()
 @click.argument("workbook_name")
 @click.option("--csv-file", "-c", type=str, default=None, help="Optional CSV file to determine the root node name")
@@ -476,7 +507,37 @@ def visualize_tree(workbook_name, tree_name):
 @click.command()
 @click.argument("workbook_name")
 @click.argument("tree_name")
-def push_tree(workbook_name, tree_name):
+@click.argument("output_path")
+@click.option("--format", "-f", "export_format", type=click.Choice(EXPORT_FORMATS), default=None,
+              help="Output format (default: from the file extension, else ndjson)")
+@click.option("--ids", "include_ids", is_flag=True, default=False, help="Include the Seeq ID of every item")
+@click.option("--batch-rows", type=int, default=None, help="Rows encoded and written at a time")
+def export_tree(workbook_name, tree_name, output_path, export_format, include_ids, batch_rows):
+    """CLI command to export a tree's items as NDJSON, CSV or Parquet (the layout build-tree reads)."""
+    ensure_seeq_login()
+    extension = os.path.splitext(output_path)[1].lstrip(".").lower()
+    export_format = export_format or (extension if extension in EXPORT_FORMATS else "ndjson")
+    log_info(f"CLI: Exporting tree '{tree_name}' in workbook '{workbook_name}' to '{output_path}' ({export_format})")
+
+    try:
+        tree = TreeModifier(workbook_name, tree_name).tree
+        written = 0
+        with open(output_path, "wb") as output:
+            for chunk in export_tree_chunks(tree, format=export_format, batch_rows=batch_rows, include_ids=include_ids):
+                output.write(chunk)
+                written += len(chunk)
+        log_info(f"✅ Exported {len(tree)} items ({written:,} bytes) to '{output_path}'.")
+    except Exception as e:
+        log_error(f"❌ Error exporting tree: {e}")
+
+@click.command()
+@click.argument("workbook_name")
+@click.argument("tree_name")
+@click.option("--plan", "plan_only", is_flag=True, default=False, help="Only report what the push would do and how long it would take")
+@click.option("--full", is_flag=True, default=False, help="Push the whole tree instead of only the changes (a freshly loaded, unedited tree has none)")
+@click.option("--parallel-depth", type=int, default=None, help="Push the whole tree, with the branches at this depth (root = 1) pushed concurrently")
+@click.option("--workers", type=int, default=None, help="Branches pushed at once with --parallel-depth")
+def push_tree(workbook_name, tree_name, plan_only, full, parallel_depth, workers):
     ensure_seeq_login() 
     """CLI command to push changes to an existing tree."""
     log_info(f"CLI: Pushing tree '{tree_name}' in workbook '{workbook_name}'")
@@ -484,7 +545,17 @@ def push_tree(workbook_name, tree_name):
     tree_modifier = TreeModifier(workbook_name, tree_name)
 
     try:
-        tree_modifier.push_tree()
+        if plan_only:
+            log_info(tree_modifier.plan(changes_only=not full).describe())
+            return
+        if parallel_depth:
+            result = tree_modifier.push_subtrees(depth=parallel_depth, max_workers=workers)
+            log_info(f"✅ Tree '{tree_name}' pushed: {result['branches']} branches in {result['seconds']}s.")
+            return
+        result = tree_modifier.push_tree(changes_only=not full)
+        if isinstance(result, dict) and result.get("pushed") == 0 and result.get("archived") == 0:
+            log_info(f"ℹ️ Nothing pending for tree '{tree_name}'; nothing was pushed (use --full to re-push it).")
+            return
         log_info(f"✅ Tree '{tree_name}' pushed successfully.")
     except Exception as e:
         log_error(f"❌ Error pushing tree: {e}")
@@ -556,8 +627,8 @@ def modify_tree(workbook_name, tree_name):
                 # ✅ Use PushManager instead of directly pushing
                 push_manager = PushManager(tree_modifier.tree)
 
-                # ✅ Allow pushing with metadata_state_file for larger trees
-                push_manager.push(metadata_state_file="tree_metadata_state.pickle.zip")
+                # ✅ Large trees push in resumable chunks, with the tree's own metadata state file
+                push_manager.push()
 
                 print("✅ Tree pushed successfully.")
         
@@ -575,9 +646,11 @@ def cli():
     pass
 
 cli.add_command(build_tree)
+cli.add_command(build_trees)
 cli.add_command(create_empty_tree)
 cli.add_command(visualize_tree)  
 cli.add_command(push_tree)       
+cli.add_command(export_tree)
 cli.add_command(modify_tree)
 
 if __name__ == "__main__":
@@ -588,6 +661,9 @@ if __name__ == "__main__":
 # build-tree:
 # python src/itv_asset_tree/cli.py build-tree "TestWorkbook" "/path/to/csv.csv"
 
+# build-trees (multi-root CSV or a directory of CSVs):
+# python src/itv_asset_tree/cli.py build-trees "TestWorkbook" "/path/to/site_csvs/" --max-pushes 4
+
 # create-empty-tree:
 # python src/itv_asset_tree/cli.py create-empty-tree "Workbook1"
 
@@ -596,6 +672,8 @@ if __name__ == "__main__":
 
 # push-tree:
 # python src/itv_asset_tree/cli.py push-tree "Workbook1" "Test Tree"
+# python src/itv_asset_tree/cli.py push-tree "Workbook1" "Test Tree" --plan  # Dry run with a time estimate
+# python src/itv_asset_tree/cli.py push-tree "Workbook1" "Test Tree" --parallel-depth 2 --workers 8  # Branches in parallel
 
 # modify-tree:
 # python src/itv_asset_tree/cli.py modify-tree "Workbook1" "Test Tree"  # Interactive mode
@@ -1,4 +1,5 @@
 import os
+from typing import Optional
 from dotenv import load_dotenv
 from pydantic_settings import BaseSettings  
 
@@ -6,9 +7,67 @@ class Settings(BaseSettings):
     app_name: str = "ITV Asset Tree API"
     debug: bool = False
 
-    SERVER_USERNAME: str = os.getenv("SERVER_USERNAME")
-    SERVER_PASSWORD: str = os.getenv("SERVER_PASSWORD")
-    SERVER_HOST: str = os.getenv("SERVER_HOST")
+    SERVER_USERNAME: Optional[str] = os.getenv("SERVER_USERNAME")
+    SERVER_PASSWORD: Optional[str] = os.getenv("SERVER_PASSWORD")
+    SERVER_HOST: Optional[str] = os.getenv("SERVER_HOST")
+
+    # Uploads are streamed to disk in chunks of this size and rejected past the limit
+    UPLOAD_CHUNK_SIZE: int = 1024 * 1024
+    MAX_UPLOAD_BYTES: int = 5 * 1024 * 1024 * 1024
+
+    # CSV parser used by read_csv_fast: "auto", "c" or "pyarrow"
+    CSV_ENGINE: str = "auto"
+
+    # Batch builds: processes compiling paths (None = one per CPU) and trees pushed at once
+    BATCH_BUILD_WORKERS: Optional[int] = None
+    MAX_CONCURRENT_PUSHES: int = 4
+
+    # Loaded trees kept in memory: LRU by count and total rows, expiring after the TTL
+    TREE_CACHE_MAX_ENTRIES: int = 32
+    TREE_CACHE_MAX_ROWS: int = 2_000_000
+    TREE_CACHE_TTL_SECONDS: float = 900
+
+    # Observed push throughput, used to estimate dry-run push durations
+    PUSH_THROUGHPUT_LOG: str = "./push_stats/push_throughput.json"
+
+    # Background push jobs: workers per lane (interactive edits vs bulk rebuilds) and jobs remembered
+    PUSH_JOB_INTERACTIVE_WORKERS: int = 2
+    PUSH_JOB_BULK_WORKERS: int = 1
+    PUSH_JOB_HISTORY: int = 200
+
+    # Per-tree SPy metadata state files and push checkpoints
+    PUSH_STATE_DIR: str = "./push_state"
+
+    # Pushes of at least this many items go in checkpointed chunks, each sized to take about the target time
+    PUSH_CHUNK_THRESHOLD: int = 20_000
+    PUSH_CHUNK_SIZE: int = 5_000
+    PUSH_CHUNK_MIN: int = 250
+    PUSH_CHUNK_MAX: int = 50_000
+    PUSH_CHUNK_TARGET_SECONDS: float = 20
+    PUSH_CHUNK_RETRIES: int = 2
+
+    # Parallel subtree pushes: split depth (root = 1) and branches pushed at once
+    PARALLEL_PUSH_DEPTH: int = 2
+    PARALLEL_PUSH_WORKERS: int = 4
+
+    # Tree view: children returned per page when expanding a node, and the largest page a client may ask for
+    TREE_PAGE_SIZE: int = 200
+    TREE_PAGE_MAX: int = 1_000
+
+    # Rendered trees (text, JSON, index) kept per tree version, and whether pushes warm them up in the background
+    RENDER_CACHE_MAX_ENTRIES: int = 64
+    RENDER_PRECOMPUTE: bool = True
+
+    # Tree exports (NDJSON, CSV, Parquet) are encoded and streamed this many rows at a time
+    EXPORT_BATCH_ROWS: int = 10_000
+
+    # Streaming lookup generation: rows read per chunk, on-disk spill partitions (split again past the byte limit),
+    # where spill files go (None = system temp) and the reference-file size from which generation always streams
+    LOOKUP_CHUNK_ROWS: int = 200_000
+    LOOKUP_SPILL_PARTITIONS: int = 64
+    LOOKUP_SPILL_MAX_BYTES: int = 256 * 1024 * 1024
+    LOOKUP_SPILL_DIR: Optional[str] = None
+    LOOKUP_STREAM_MIN_BYTES: int = 512 * 1024 * 1024
 
 # Load environment variables
 load_dotenv()
@@ -0,0 +1,135 @@
+# src/itv_asset_tree/core/batch_builder.py
+
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from .path_compiler import compile_tree_frame, get_level_columns
+from .push_manager import PushManager
+from .tree_builder import TreeBuilder
+from ..config import settings
+from ..utils.csv_ingest import read_csv_fast
+
+ROOT_COLUMN = "Level 1"
+
+
+def collect_csv_files(source: str) -> List[str]:
+    """Return the CSV files to build: the file itself, or every ``*.csv`` in a directory."""
+    if os.path.isdir(source):
+        files = sorted(glob.glob(os.path.join(source, "*.csv")))
+        if not files:
+            raise ValueError(f"❌ No CSV files found in directory '{source}'.")
+        return files
+    if not os.path.isfile(source):
+        raise FileNotFoundError(f"❌ CSV source '{source}' does not exist.")
+    return [source]
+
+
+def partition_by_root(data: pd.DataFrame, root_column: str = ROOT_COLUMN) -> Dict[str, pd.DataFrame]:
+    """Split tree CSV rows into one frame per root (``Level 1`` value), in file order."""
+    if root_column not in data.columns:
+        raise ValueError(f"❌ Column '{root_column}' not found; cannot partition by root.")
+    roots = data[root_column].ffill()
+    if roots.isna().all():
+        raise ValueError("❌ No valid root node found in CSV.")
+    data = data.assign(**{root_column: roots})
+    return {
+        str(root): partition.reset_index(drop=True)
+        for root, partition in data.groupby(root_column, sort=False, observed=True)
+    }
+
+
+def _compile_partition(root: str, partition: pd.DataFrame) -> Tuple[str, pd.DataFrame]:
+    """Process-pool worker: compile one root's Level columns into a ready-to-push frame."""
+    return root, compile_tree_frame(partition, get_level_columns(partition))
+
+
+class BatchTreeBuilder:
+    """
+    Builds one tree per root from a multi-root CSV or a directory of CSVs.
+
+    Path compilation is CPU-bound and runs in a process pool, one job per root.
+    Building the ``Tree`` (name search) and pushing it wait on Seeq, so they run in
+    a thread pool capped at ``max_concurrent_pushes`` trees at a time.
+    """
+
+    def __init__(self, workbook: str, max_workers: Optional[int] = None,
+                 max_concurrent_pushes: Optional[int] = None, push: bool = True,
+                 description: str = "Generated from CSV"):
+        self.workbook = workbook
+        self.max_workers = max_workers or settings.BATCH_BUILD_WORKERS or os.cpu_count() or 1
+        self.max_concurrent_pushes = max_concurrent_pushes or settings.MAX_CONCURRENT_PUSHES
+        self.push = push
+        self.description = description
+
+    def load_partitions(self, source: str) -> Dict[str, pd.DataFrame]:
+        """Read every CSV in `source` and return its rows partitioned by root."""
+        partitions = {}
+        for csv_file in collect_csv_files(source):
+            data = read_csv_fast(csv_file, text_columns_only=True)
+            for root, partition in partition_by_root(data).items():
+                if root in partitions:
+                    # The same plant split across files is still one tree
+                    partition = pd.concat([partitions[root], partition], ignore_index=True)
+                partitions[root] = partition
+            print(f"📄 Loaded '{csv_file}' ({len(data)} rows).")
+        print(f"🌲 Found {len(partitions)} root(s): {list(partitions)}")
+        return partitions
+
+    def compile_partitions(self, partitions: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+        """Compile every partition's paths in parallel processes."""
+        workers = min(self.max_workers, len(partitions))
+        if workers <= 1:
+            return dict(_compile_partition(root, partition) for root, partition in partitions.items())
+
+        compiled = {}
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_compile_partition, root, partition) for root, partition in partitions.items()]
+            for future in as_completed(futures):
+                root, frame = future.result()
+                compiled[root] = frame
+        return {root: compiled[root] for root in partitions}  # Keep file order
+
+    def build_and_push(self, root: str, frame: pd.DataFrame) -> dict:
+        """Build (and optionally push) the tree for one root; never raises."""
+        result = {"tree": root, "rows": len(frame), "status": "built"}
+        try:
+            builder = TreeBuilder(self.workbook, metadata=frame)
+            builder.build_tree_from_csv(friendly_name=root, description=self.description)
+            if self.push:
+                push_result = PushManager(builder.tree).push()
+                if "error" in push_result:
+                    raise RuntimeError(push_result["error"])
+                result["status"] = "pushed"
+            print(f"✅ Tree '{root}' {result['status']}.")
+        except Exception as e:
+            print(f"❌ Tree '{root}' failed: {e}")
+            result.update(status="failed", error=str(e))
+        return result
+
+    def build(self, source: str) -> List[dict]:
+        """
+        Build every tree found in `source`.
+
+        Parameters:
+        ----------
+        source : str
+            A tree CSV (one or more ``Level 1`` roots) or a directory of tree CSVs.
+
+        Returns:
+        -------
+        list of dict
+            One result per tree with its name, row count, status and any error.
+        """
+        compiled = self.compile_partitions(self.load_partitions(source))
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrent_pushes) as pool:
+            futures = {root: pool.submit(self.build_and_push, root, frame) for root, frame in compiled.items()}
+            results = [futures[root].result() for root in compiled]
+
+        failed = [result["tree"] for result in results if result["status"] == "failed"]
+        print(f"📊 Batch build finished: {len(results) - len(failed)} succeeded, {len(failed)} failed.")
+        return results
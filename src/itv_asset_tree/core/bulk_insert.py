@@ -0,0 +1,118 @@
+# src/itv_asset_tree/core/bulk_insert.py
+
+import ast
+import json
+from typing import Optional
+
+import pandas as pd
+from seeq import spy
+
+from .path_compiler import PATH_SEPARATOR
+
+
+def parse_formula_parameters(values: pd.Series) -> pd.Series:
+    """
+    Parse a column of formula-parameter text into dictionaries, one pass per distinct value.
+
+    Each text is read as JSON, or else as a Python literal (``{'$a': 'Temp'}``)
+    through ``ast.literal_eval``, never ``eval``. Blank cells become ``{}``, and
+    values that are already parsed are kept as they are.
+    """
+    parsed = {}
+    for text in {value for value in values if isinstance(value, str)}:
+        stripped = text.strip()
+        if not stripped:
+            parsed[text] = {}
+            continue
+        try:
+            parsed[text] = json.loads(stripped)
+        except json.JSONDecodeError:
+            try:
+                parsed[text] = ast.literal_eval(stripped)
+            except (ValueError, SyntaxError):
+                raise ValueError(f"❌ Invalid Formula Parameters: {text}")
+
+    def lookup(value):
+        if isinstance(value, str):
+            return parsed[value]
+        return {} if value is None or (isinstance(value, float) and value != value) else value
+
+    return values.map(lookup)
+
+
+def item_definitions(data: pd.DataFrame, parent_column: str = "Parent Path") -> pd.DataFrame:
+    """
+    Item definitions for `insert_items` from an insertion CSV: ``Name``, ``Parent``
+    (from `parent_column`) and, when present, ``Formula`` with its parsed
+    ``Formula Parameters``. Names and parent paths are stripped of whitespace.
+    Raises ``ValueError`` for rows without a name or parent path.
+    """
+    missing = data[parent_column].isna() | data["Name"].isna()
+    if missing.any():
+        rows = missing[missing].index.tolist()
+        raise ValueError(f"❌ Rows {rows} have no Name or '{parent_column}'.")
+
+    items = pd.DataFrame({
+        "Name": data["Name"].astype(str).str.strip(),
+        "Parent": data[parent_column].astype(str).str.strip(),
+    }, index=data.index)
+    if "Formula" in data.columns:
+        items["Formula"] = data["Formula"]
+        parameters = data["Formula Parameters"] if "Formula Parameters" in data.columns else \
+            pd.Series(None, index=data.index, dtype=object)
+        # Rows without a formula (assets) must not carry parameters
+        items["Formula Parameters"] = parse_formula_parameters(parameters).where(data["Formula"].notna(), None)
+    return items.reset_index(drop=True)
+
+
+def insert_items(tree, items: pd.DataFrame, status: Optional[spy.Status] = None) -> int:
+    """
+    Insert item definitions that carry a ``Parent`` column in as few ``Tree.insert`` calls as possible.
+
+    Seeq matches each row's parent against the tree as it was before the call,
+    so rows whose parent is another row of the same batch (``Parent >> Name``)
+    go in a later call, one call per level. Usually that is one call for
+    everything. Returns the number of ``Tree.insert`` calls made.
+    """
+    if items.empty:
+        return 0
+    levels = _insert_levels(items)
+    for level in range(int(levels.max()) + 1):
+        tree.insert(children=items[levels == level].reset_index(drop=True), status=status)
+    return int(levels.max()) + 1
+
+
+def _insert_levels(items: pd.DataFrame) -> pd.Series:
+    """
+    0 for rows whose parent is outside the batch, else one more than the row that creates
+    the parent, wherever that row is in the batch (children may come before their parents).
+    """
+    parents = items["Parent"].str.casefold()
+    full_paths = (items["Parent"] + PATH_SEPARATOR + items["Name"]).str.casefold()
+    levels = pd.Series(0, index=items.index)
+    if not parents.isin(full_paths).any():
+        return levels
+
+    created_by = {}
+    for position, full_path in enumerate(full_paths.tolist()):
+        created_by.setdefault(full_path, position)
+    creators = parents.map(created_by)
+    has_creator = creators.notna().to_numpy()
+    creator_positions = creators[has_creator].astype(int).to_numpy()
+    # A parent's path is shorter than its child's, so this settles within the batch's depth
+    values = levels.to_numpy()
+    for _ in range(len(items)):
+        updated = values.copy()
+        updated[has_creator] = values[creator_positions] + 1
+        if (updated == values).all():
+            break
+        values = updated
+    return pd.Series(values, index=items.index)
+
+    created_by = {}
+    for position, (parent, full_path) in enumerate(zip(parents.tolist(), full_paths.tolist())):
+        creator = created_by.get(parent)
+        if creator is not None:
+            levels.iat[position] = levels.iat[creator] + 1
+        created_by.setdefault(full_path, position)
+    return levels
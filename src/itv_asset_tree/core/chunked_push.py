@@ -0,0 +1,405 @@
+# src/itv_asset_tree/core/chunked_push.py
+
+import hashlib
+import json
+import os
+import re
+import time
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+from seeq import spy
+from seeq.spy.assets._trees import _properties as spy_properties
+
+from .path_compiler import PATH_SEPARATOR
+from .push_jobs import check_cancelled
+from .push_planner import observed_throughput, record_push
+from .tree_diff import COMPARED_COLUMNS, _comparable
+from ..config import settings
+
+
+def push_state_files(workbook, tree_name: str) -> Tuple[str, str]:
+    """
+    Per-tree paths of the SPy metadata state file and the push checkpoint.
+
+    Every push of a tree reuses the same files (under ``settings.PUSH_STATE_DIR``),
+    so SPy can skip unchanged items and an interrupted push can be resumed. Only
+    whole-tree pushes write the state file; partial ones discard it.
+    """
+    return push_state_path(workbook, tree_name, "metadata_state.pickle.zip"), push_state_path(workbook, tree_name, "checkpoint")
+
+
+def push_state_path(workbook, tree_name: str, suffix: str) -> str:
+    """Path of one per-tree state file under ``settings.PUSH_STATE_DIR`` (see `push_state_files`)."""
+    key = f"{workbook}__{tree_name}"
+    slug = re.sub(r"[^A-Za-z0-9._-]+", "_", key).strip("_")[:80]
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:10]
+    os.makedirs(settings.PUSH_STATE_DIR, exist_ok=True)
+    return os.path.join(settings.PUSH_STATE_DIR, f"{slug}-{digest}.{suffix}")
+
+
+def discard_metadata_state(metadata_state_file: Optional[str]):
+    """
+    Delete a tree's SPy metadata state file before a partial push (a chunk, a changed
+    subset or a branch). Such pushes go without a state file: SPy would overwrite it
+    with just that part, and its incremental skipping would then trust a record of
+    the tree that no longer matches Seeq. The next whole-tree push writes it again.
+    """
+    if metadata_state_file and os.path.exists(metadata_state_file):
+        os.remove(metadata_state_file)
+
+
+def push_workbook(tree):
+    """Create the tree's workbook in Seeq if it does not exist yet, as ``Tree.push`` does first."""
+    if tree._workbook is not None:
+        tree._push_workbook()
+
+
+def stale_item_ids(tree) -> List[str]:
+    """
+    IDs of items Seeq holds under the tree's root, in the tree's workbook, that the
+    local tree no longer contains (matched by full path, or kept by ID). These are the
+    items ``Tree.push`` archives. Call `push_workbook` first so the workbook ID is known.
+    """
+    root = tree._dataframe.loc[tree._dataframe["Path"].fillna("") == "", "Name"]
+    if root.empty:
+        return []
+    existing = spy.search({"Path": root.iloc[0]}, workbook=tree._workbook_id, recursive=True,
+                          quiet=True, session=tree.session)
+    if existing.empty:
+        return []
+    local_paths = set(full_paths_of(tree._dataframe).str.casefold())
+    local_ids = set(tree._dataframe["ID"].dropna())
+    existing_paths = full_paths_of(existing).str.casefold()
+    stale = ~existing_paths.isin(local_paths) & ~existing["ID"].isin(local_ids)
+    return existing.loc[stale, "ID"].tolist()
+
+
+def tree_fingerprint(df: pd.DataFrame) -> str:
+    """Hash of a tree's content, ignoring Seeq IDs (which a push writes back)."""
+    digest = hashlib.sha256()
+    for column in COMPARED_COLUMNS:
+        if column in df.columns:
+            digest.update(column.encode("utf-8"))
+            digest.update("\x1f".join(df[column].map(_comparable)).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class PartialPushError(RuntimeError):
+    """Some rows of a push failed; ``succeeded`` holds the labels of those that made it."""
+
+    def __init__(self, message: str, succeeded: List):
+        super().__init__(message)
+        self.succeeded = succeeded
+
+
+def push_frame(tree, frame: pd.DataFrame, metadata_state_file: Optional[str] = None) -> pd.DataFrame:
+    """Push rows of a tree's (reference-formatted) DataFrame without archiving; return SPy's push results."""
+    return spy.push(metadata=frame, workbook=tree._workbook, datasource=tree._datasource,
+                    archive=False, metadata_state_file=metadata_state_file, quiet=True,
+                    session=tree.session)
+
+
+def archive_items(tree, ids: List[str]) -> int:
+    """
+    Archive Seeq items by ID, as SPy does: push them with ``Archived`` set (SPy has
+    no separate archive call). Returns how many were archived; raises if any failed.
+    """
+    if not ids:
+        return 0
+    results = spy.push(metadata=pd.DataFrame({"ID": list(ids), "Archived": True}), workbook=tree._workbook,
+                       datasource=tree._datasource, archive=False, quiet=True, session=tree.session)
+    failed = ~results["Push Result"].str.startswith("Success")
+    if failed.any():
+        raise RuntimeError(f"❌ {int(failed.sum())} of {len(ids)} items failed to archive.")
+    return len(ids)
+
+
+def merge_push_results(tree, push_results: pd.DataFrame) -> int:
+    """
+    Write the IDs (and types) of successfully pushed rows back onto the tree.
+    Returns how many rows were pushed; raises PartialPushError if any failed.
+    """
+    succeeded = push_results["Push Result"].str.startswith("Success")
+    succeeded_rows = push_results.index[succeeded]
+    tree._dataframe.loc[succeeded_rows, "ID"] = push_results.loc[succeeded_rows, "ID"]
+    tree._dataframe.loc[succeeded_rows, "Type"] = push_results.loc[succeeded_rows, "Type"]
+    pushed = int(succeeded.sum())
+    if pushed < len(push_results):
+        raise PartialPushError(f"❌ {len(push_results) - pushed} of {len(push_results)} items failed to push.",
+                               list(succeeded_rows))
+    return pushed
+
+
+def push_rows(tree, frame: pd.DataFrame, metadata_state_file: Optional[str] = None) -> int:
+    """`push_frame` followed by `merge_push_results`."""
+    return merge_push_results(tree, push_frame(tree, frame, metadata_state_file=metadata_state_file))
+
+
+def with_known_ids(frame: pd.DataFrame, full_paths: pd.Series, known_ids: Dict[str, str]) -> pd.DataFrame:
+    """
+    Replace formula references to items outside `frame` by their Seeq IDs, where
+    known. References within the frame are left for SPy to resolve by path.
+    """
+    if "Formula Parameters" not in frame.columns:
+        return frame
+    in_frame = set(full_paths[frame.index])
+    frame = frame.copy()
+    frame["Formula Parameters"] = frame["Formula Parameters"].map(
+        lambda params: {name: known_ids.get(ref, ref) if isinstance(ref, str) and ref not in in_frame else ref
+                        for name, ref in params.items()} if isinstance(params, dict) else params
+    )
+    return frame
+
+
+def dependency_order(frame: pd.DataFrame) -> List:
+    """
+    Row labels of a tree DataFrame with formatted (full-path) references, ordered
+    so that every chunk only references items pushed before it or within it:
+    non-formula rows by depth (parents first), then calculations in dependency
+    layers. Reference cycles, which Seeq rejects anyway, go last.
+    """
+    full_paths = full_paths_of(frame)
+    depth = frame["Path"].fillna("").map(lambda path: 0 if not path else path.count(PATH_SEPARATOR) + 1)
+    has_formula = frame["Formula"].notna() if "Formula" in frame.columns else pd.Series(False, index=frame.index)
+
+    ordered = list(depth[~has_formula].sort_values(kind="stable").index)
+    formula_paths = dict(zip(full_paths[has_formula], frame.index[has_formula]))
+    parameters = frame["Formula Parameters"] if "Formula Parameters" in frame.columns else pd.Series(None, index=frame.index)
+    waiting = {
+        label: {formula_paths[ref] for ref in (parameters[label].values() if isinstance(parameters[label], dict) else [])
+                if isinstance(ref, str) and ref in formula_paths and formula_paths[ref] != label}
+        for label in depth[has_formula].sort_values(kind="stable").index
+    }
+    placed = set()
+    while waiting:
+        layer = [label for label, needs in waiting.items() if needs <= placed]
+        if not layer:
+            layer = list(waiting)  # Cycle: push as-is and let Seeq report it
+        ordered.extend(layer)
+        placed.update(layer)
+        for label in layer:
+            del waiting[label]
+    return ordered
+
+
+class AdaptiveChunkSizer:
+    """
+    Chunk size that follows observed push latency: after each chunk the size moves
+    towards what would take ``target_seconds``, at most halving or doubling per step.
+    Without a configured initial size, it starts from the recorded push throughput.
+    """
+
+    def __init__(self, initial: Optional[int] = None, minimum: Optional[int] = None,
+                 maximum: Optional[int] = None, target_seconds: Optional[float] = None):
+        self.minimum = minimum or settings.PUSH_CHUNK_MIN
+        self.maximum = maximum or settings.PUSH_CHUNK_MAX
+        self.target_seconds = target_seconds or settings.PUSH_CHUNK_TARGET_SECONDS
+        if initial is None:
+            items_per_second, source = observed_throughput()
+            initial = items_per_second * self.target_seconds if source == "observed" else settings.PUSH_CHUNK_SIZE
+        self.size = self._clamp(int(initial))
+
+    def observe(self, items: int, seconds: float):
+        """Adjust the size after a chunk of `items` took `seconds`."""
+        if items <= 0 or seconds <= 0:
+            return
+        ideal = int(items / seconds * self.target_seconds)
+        self.size = self._clamp(min(max(ideal, self.size // 2), self.size * 2))
+
+    def shrink(self):
+        """Halve the size after a failed chunk."""
+        self.size = self._clamp(self.size // 2)
+
+    def _clamp(self, size: int) -> int:
+        return max(self.minimum, min(self.maximum, size))
+
+
+class PushCheckpoint:
+    """
+    Durable progress of a chunked push.
+
+    ``<path>.json`` holds the plan (rows to push, IDs to archive and the tree
+    fingerprint) and is written once; ``<path>.log`` gets one fsynced line per
+    pushed chunk with the IDs Seeq assigned, so recording progress stays cheap
+    however large the plan is. A torn last line (crash mid-write) is ignored.
+    """
+
+    def __init__(self, path: str):
+        self.plan_file = f"{path}.json"
+        self.log_file = f"{path}.log"
+        self.fingerprint: Optional[str] = None
+        self.rows: List[str] = []
+        self.ids_to_archive: List[str] = []
+        self.pushed: Dict[str, Tuple[str, str]] = {}  # row label -> (ID, Type)
+        self.archived = False
+
+    @property
+    def pending(self) -> List[str]:
+        return [row for row in self.rows if row not in self.pushed]
+
+    def exists(self) -> bool:
+        return os.path.exists(self.plan_file)
+
+    def load(self) -> bool:
+        """Read the checkpoint from disk; False if there is none (or it is unreadable)."""
+        try:
+            with open(self.plan_file, encoding="utf-8") as f:
+                plan = json.load(f)
+        except (OSError, ValueError):
+            return False
+        self.fingerprint, self.rows, self.ids_to_archive = plan["fingerprint"], plan["rows"], plan["ids_to_archive"]
+        self.pushed, self.archived = {}, False
+        if os.path.exists(self.log_file):
+            with open(self.log_file, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        break
+                    self.pushed.update({row: tuple(item) for row, item in entry.get("pushed", {}).items()})
+                    self.archived = self.archived or entry.get("archived", False)
+        return True
+
+    def start(self, fingerprint: str, rows: List[str], ids_to_archive: List[str]):
+        """Begin a new push plan, discarding any previous progress."""
+        self.clear()
+        self.fingerprint, self.rows, self.ids_to_archive = fingerprint, rows, ids_to_archive
+        tmp_path = f"{self.plan_file}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"fingerprint": fingerprint, "rows": rows, "ids_to_archive": ids_to_archive,
+                       "started_at": time.time()}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.plan_file)
+
+    def record_chunk(self, pushed: Dict[str, Tuple[str, str]]):
+        self.pushed.update(pushed)
+        self._append({"pushed": pushed})
+
+    def mark_archived(self):
+        self.archived = True
+        self._append({"archived": True})
+
+    def clear(self):
+        for path in (self.plan_file, self.log_file):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _append(self, entry: dict):
+        with open(self.log_file, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+
+class ChunkedPush:
+    """
+    Pushes a tree in chunks with a checkpoint after each one.
+
+    Rows go out in dependency order; references to items pushed in earlier chunks
+    are sent as their Seeq IDs. A failed chunk is retried with a smaller size; if
+    it still fails, the checkpoint stays on disk and the next push of the same
+    (unchanged) tree resumes after the last completed chunk instead of starting over.
+    Chunks are partial pushes, so the tree's metadata state file is discarded
+    rather than passed to them (see `discard_metadata_state`).
+    """
+
+    def __init__(self, tree, metadata_state_file: str, checkpoint_file: str,
+                 sizer: Optional[AdaptiveChunkSizer] = None, retries: Optional[int] = None):
+        self.tree = tree
+        self.metadata_state_file = metadata_state_file
+        self.checkpoint = PushCheckpoint(checkpoint_file)
+        self.sizer = sizer or AdaptiveChunkSizer()
+        self.retries = settings.PUSH_CHUNK_RETRIES if retries is None else retries
+        self._pushed_paths: Dict[str, str] = {}  # Full path -> ID, for references across chunks
+
+    def resumable(self) -> bool:
+        """True if an unfinished push of this exact tree content is on disk."""
+        return self.checkpoint.load() and self.checkpoint.fingerprint == tree_fingerprint(self.tree._dataframe)
+
+    def run(self, rows: Optional[List] = None, ids_to_archive: Optional[List[str]] = None) -> dict:
+        """
+        Push `rows` (labels of ``tree._dataframe``) and archive `ids_to_archive`,
+        or resume the checkpointed push when `resumable()`; the arguments are then ignored.
+        """
+        df = self.tree._dataframe
+        labels = {str(label): label for label in df.index}
+        formatted = spy_properties.format_references(df)
+        resumed = self.resumable()
+        if resumed:
+            known = {labels[row]: item for row, item in self.checkpoint.pushed.items() if row in labels}
+            if known:
+                df.loc[list(known), "ID"] = [item[0] for item in known.values()]
+                df.loc[list(known), "Type"] = [item[1] for item in known.values()]
+            print(f"⏯️ Resuming push of '{self.tree.name}': "
+                  f"{len(self.checkpoint.pushed)} of {len(self.checkpoint.rows)} items already pushed.")
+        else:
+            planned = dependency_order(formatted.loc[rows if rows is not None else df.index])
+            self.checkpoint.start(tree_fingerprint(df), [str(label) for label in planned], list(ids_to_archive or []))
+
+        discard_metadata_state(self.metadata_state_file)
+        full_paths = full_paths_of(df)
+        has_id = df["ID"].notna()
+        self._pushed_paths = dict(zip(full_paths[has_id], df.loc[has_id, "ID"]))
+        pending = self.checkpoint.pending
+        total = len(self.checkpoint.rows)
+        chunks = 0
+        while pending:
+            check_cancelled()
+            window = self.sizer.size
+            chunk = self._push_chunk(formatted, full_paths, [labels[row] for row in pending[:window]])
+            pending = [row for row in pending[:window] if row not in self.checkpoint.pushed] + pending[window:]
+            chunks += 1
+            print(f"📦 Pushed chunk {chunks} of '{self.tree.name}' ({len(chunk)} items): "
+                  f"{total - len(pending)}/{total} done, next chunk {self.sizer.size}.")
+
+        archived = 0
+        if self.checkpoint.ids_to_archive and not self.checkpoint.archived:
+            check_cancelled()
+            archived = archive_items(self.tree, self.checkpoint.ids_to_archive)
+            self.checkpoint.mark_archived()
+
+        self.checkpoint.clear()
+        self.tree.is_dirty = False
+        return {"pushed": total, "archived": archived, "chunks": chunks, "resumed": resumed}
+
+    def _push_chunk(self, formatted: pd.DataFrame, full_paths: pd.Series, chunk: List) -> List:
+        """Push one chunk (retrying smaller on failure), checkpoint it and return the rows pushed."""
+        for attempt in range(self.retries + 1):
+            frame = with_known_ids(formatted.loc[chunk], full_paths, self._pushed_paths)
+            started = time.monotonic()
+            try:
+                push_rows(self.tree, frame)
+            except Exception as e:
+                if isinstance(e, PartialPushError):
+                    self._record(e.succeeded, full_paths)  # Keep the part of the chunk that made it
+                if attempt == self.retries:
+                    raise RuntimeError(f"❌ Push of '{self.tree.name}' stopped; it will resume from the last "
+                                       f"checkpoint on the next push. Cause: {e}") from e
+                self.sizer.shrink()
+                chunk = [row for row in chunk if str(row) not in self.checkpoint.pushed][:self.sizer.size]
+                print(f"⚠️ Chunk failed ({e}); retrying {len(chunk)} items in {2 ** attempt}s.")
+                time.sleep(2 ** attempt)
+                continue
+            elapsed = time.monotonic() - started
+            self.sizer.observe(len(chunk), elapsed)
+            record_push(len(chunk), elapsed)
+            self._record(chunk, full_paths)
+            return chunk
+
+    def _record(self, rows: List, full_paths: pd.Series):
+        """Checkpoint rows that were pushed, with the IDs and types Seeq returned."""
+        if not rows:
+            return
+        done = self.tree._dataframe.loc[rows, ["ID", "Type"]]
+        self._pushed_paths.update(zip(full_paths[done.index], done["ID"]))
+        self.checkpoint.record_chunk({str(label): (item_id, item_type) for label, item_id, item_type
+                                      in zip(done.index, done["ID"].tolist(), done["Type"].tolist())})
+
+
+def full_paths_of(df: pd.DataFrame) -> pd.Series:
+    """Full path (``Path >> Name``) of every row of a tree DataFrame."""
+    paths = df["Path"].fillna("").astype(str)
+    names = df["Name"].astype(str)
+    return paths.where(paths == "", paths + PATH_SEPARATOR) + names
@@ -1,4 +1,5 @@
 import pandas as pd
+from ..utils.csv_ingest import read_csv_fast
 
 class CSVParser:
     """Handles CSV file parsing and validation."""
@@ -6,7 +7,7 @@ class CSVParser:
     @staticmethod
     def parse_csv(file_path: str) -> pd.DataFrame:
         """Loads a CSV file and validates required columns."""
-        data = pd.read_csv(file_path)
+        data = read_csv_fast(file_path)
         if "Level 1" not in data.columns:
             raise ValueError("⚠️ CSV file must contain a 'Level 1' column.")
         return data
\ No newline at end of file
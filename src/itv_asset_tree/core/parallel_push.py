@@ -0,0 +1,174 @@
+# src/itv_asset_tree/core/parallel_push.py
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+from seeq.spy.assets._trees import _properties as spy_properties
+
+from .chunked_push import (
+    archive_items,
+    dependency_order,
+    discard_metadata_state,
+    full_paths_of,
+    merge_push_results,
+    push_frame,
+    with_known_ids,
+)
+from .path_compiler import PATH_SEPARATOR
+from .push_jobs import check_cancelled
+from .push_planner import record_push
+from ..config import settings
+
+
+def split_branches(frame: pd.DataFrame, depth: int) -> Tuple[List, List[List]]:
+    """
+    Split a tree DataFrame (with formatted, full-path references) at `depth`.
+
+    Returns the labels of the rows above the split (the root part) and one label
+    list per branch: the subtree under each node at `depth` (the root has depth 1).
+    Branches whose formulas reference each other are merged, so every branch can
+    be pushed independently once the root part exists. Formulas of the root part
+    that reference a branch (directly or through another such formula) join that
+    branch, so they are pushed after the items they read.
+    """
+    if depth < 2:
+        raise ValueError("❌ Split depth must be at least 2 (the root's children).")
+    full_paths = full_paths_of(frame)
+    segments = full_paths.str.split(PATH_SEPARATOR, regex=False)
+    in_branch = segments.str.len() >= depth
+    branch_of = segments[in_branch].map(lambda parts: PATH_SEPARATOR.join(parts[:depth]))
+
+    # Union branches joined by a cross-branch formula reference
+    parent = {branch: branch for branch in branch_of.unique()}
+
+    def find(branch):
+        while parent[branch] != branch:
+            parent[branch] = parent[parent[branch]]
+            branch = parent[branch]
+        return branch
+
+    def references(params) -> List[str]:
+        if not isinstance(params, dict):
+            return []
+        return [reference for reference in params.values() if isinstance(reference, str)]
+
+    def branch_referenced(reference: str) -> Optional[str]:
+        referenced = reference.split(PATH_SEPARATOR)
+        target = PATH_SEPARATOR.join(referenced[:depth])
+        return target if len(referenced) >= depth and target in parent else None
+
+    # Root-part formulas that read a branch are pushed with it (repeat for formulas reading those)
+    parameters = frame["Formula Parameters"] if "Formula Parameters" in frame.columns else \
+        pd.Series(None, index=frame.index, dtype=object)
+    root_labels = list(frame.index[~in_branch])
+    root_by_path = {full_paths[label]: label for label in root_labels}
+    moved: Dict = {}
+    changed = True
+    while changed:
+        changed = False
+        for label in root_labels:
+            if label in moved:
+                continue
+            targets = []
+            for reference in references(parameters[label]):
+                target = branch_referenced(reference)
+                if target is None and root_by_path.get(reference) in moved:
+                    target = moved[root_by_path[reference]]
+                if target is not None:
+                    targets.append(target)
+            if targets:
+                moved[label] = targets[0]
+                for target in targets[1:]:
+                    parent[find(target)] = find(targets[0])
+                changed = True
+
+    for label, params in parameters[in_branch].items():
+        for reference in references(params):
+            target = branch_referenced(reference)
+            if target is None and root_by_path.get(reference) in moved:
+                target = moved[root_by_path[reference]]
+            if target is not None:
+                parent[find(target)] = find(branch_of[label])
+
+    groups: Dict[str, List] = {}
+    for label, branch in branch_of.items():
+        groups.setdefault(find(branch), []).append(label)
+    for label, branch in moved.items():
+        groups[find(branch)].append(label)
+    return [label for label in root_labels if label not in moved], list(groups.values())
+
+
+class ParallelSubtreePush:
+    """
+    Pushes a tree's root part first, then its independent branches concurrently.
+
+    Each worker pushes one branch (in dependency order, in slices of at most
+    ``settings.PUSH_CHUNK_MAX`` rows) with references to the root part sent as IDs.
+    Workers only call Seeq; the returned IDs are merged into the tree afterwards on
+    the calling thread. No part is pushed with the tree's metadata state file: SPy
+    state files are not safe for concurrent writers, and each part would overwrite
+    it with only its own items. The file is discarded instead (see `discard_metadata_state`).
+    """
+
+    def __init__(self, tree, depth: Optional[int] = None, max_workers: Optional[int] = None,
+                 metadata_state_file: Optional[str] = None):
+        self.tree = tree
+        self.depth = depth or settings.PARALLEL_PUSH_DEPTH
+        self.max_workers = max_workers or settings.PARALLEL_PUSH_WORKERS
+        self.metadata_state_file = metadata_state_file
+
+    def run(self, ids_to_archive: Optional[List[str]] = None) -> dict:
+        df = self.tree._dataframe
+        formatted = spy_properties.format_references(df)
+        full_paths = full_paths_of(df)
+        root_rows, branches = split_branches(formatted, self.depth)
+        started = time.monotonic()
+
+        # The root part first: every branch hangs off (and may reference) it
+        discard_metadata_state(self.metadata_state_file)
+        root_frame = formatted.loc[dependency_order(formatted.loc[root_rows])]
+        pushed = merge_push_results(self.tree, push_frame(self.tree, root_frame)) if len(root_frame) else 0
+        has_id = df["ID"].notna()
+        known_ids = dict(zip(full_paths[has_id], df.loc[has_id, "ID"]))
+        print(f"🌱 Pushed root part of '{self.tree.name}' ({pushed} items); "
+              f"pushing {len(branches)} branches with {self.max_workers} workers...")
+
+        check_cancelled()
+        frames = [formatted.loc[dependency_order(formatted.loc[rows])] for rows in branches]
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="subtree-push") as pool:
+            futures = [pool.submit(self._push_branch, frame, full_paths, known_ids) for frame in frames]
+            results = [future.exception() or future.result() for future in futures]
+
+        # Merge every branch that made it, then report the ones that did not
+        failures = []
+        for frame, result in zip(frames, results):
+            if isinstance(result, BaseException):
+                failures.append(f"{frame['Name'].iloc[0]}: {result}")
+                continue
+            try:
+                pushed += merge_push_results(self.tree, result)
+            except Exception as e:
+                failures.append(f"{frame['Name'].iloc[0]}: {e}")
+        if failures:
+            raise RuntimeError(f"❌ {len(failures)} of {len(frames)} branches failed to push: " + "; ".join(failures))
+
+        archived = archive_items(self.tree, ids_to_archive or [])
+        elapsed = time.monotonic() - started
+        record_push(pushed + archived, elapsed)
+        self.tree.is_dirty = False
+        return {"pushed": pushed, "archived": archived, "branches": len(frames),
+                "seconds": round(elapsed, 2)}
+
+    def _push_branch(self, frame: pd.DataFrame, full_paths: pd.Series, known_ids: Dict[str, str]) -> pd.DataFrame:
+        """Push one branch in slices; return the push results of all its rows."""
+        known_ids = dict(known_ids)
+        results = []
+        for start in range(0, len(frame), settings.PUSH_CHUNK_MAX):
+            part = with_known_ids(frame.iloc[start:start + settings.PUSH_CHUNK_MAX], full_paths, known_ids)
+            result = push_frame(self.tree, part)
+            results.append(result)
+            succeeded = result.index[result["Push Result"].str.startswith("Success")]
+            known_ids.update(zip(full_paths[succeeded], result.loc[succeeded, "ID"]))
+        return pd.concat(results)
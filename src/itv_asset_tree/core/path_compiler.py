@@ -0,0 +1,101 @@
+# src/itv_asset_tree/core/path_compiler.py
+
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+PATH_SEPARATOR = " >> "
+
+
+def get_level_columns(data: pd.DataFrame) -> List[str]:
+    """Return the Level columns of a tree CSV, in column order (same rule as Seeq)."""
+    return [column for column in data.columns if "Level" in column]
+
+
+def compile_tree_frame(data: pd.DataFrame, level_columns: Optional[List[str]] = None,
+                       include_parent_assets: bool = True) -> pd.DataFrame:
+    """
+    Turn sparse Level columns into a ready-to-push tree DataFrame in bulk.
+
+    Blank Level cells mean "same as the row above" and are forward-filled. Paths are
+    built once per distinct Level combination (not once per row) and mapped back to
+    every row, and the Level columns are dropped. With ``include_parent_assets`` an
+    ``Asset`` row is added for every parent that only appears inside a path, so
+    ``spy.assets.Tree`` has nothing left to derive.
+
+    Parameters:
+    ----------
+    data : pd.DataFrame
+        Tree CSV contents with Level columns (categorical or text) and a Name column.
+    level_columns : list of str, optional
+        Level columns in hierarchy order. Defaults to every column containing "Level".
+    include_parent_assets : bool, default True
+        Add explicit Asset rows for the parents referenced by the paths.
+
+    Returns:
+    -------
+    pd.DataFrame
+        A new frame with a ``Path`` column and without the Level columns.
+    """
+    levels = level_columns if level_columns is not None else get_level_columns(data)
+    if not levels:
+        if "Path" in data.columns:
+            return data.copy()
+        raise ValueError("❌ Levels columns or a Path column must be provided.")
+
+    filled = data[levels].ffill()
+    # Number each distinct Level combination; first-appearance order matches drop_duplicates
+    codes = filled.groupby(levels, dropna=False, sort=False, observed=True).ngroup().to_numpy()
+    combinations = filled.drop_duplicates().reset_index(drop=True)
+    level_values = [_level_values(combinations[column]) for column in levels]
+    cumulative_paths = _cumulative_paths(level_values)
+
+    result = data.drop(columns=levels)
+    result["Path"] = cumulative_paths[-1][codes]
+
+    if include_parent_assets:
+        parents = _parent_asset_rows(level_values, cumulative_paths)
+        if "Name" in result.columns:
+            existing = set(zip(result["Path"].str.casefold(), result["Name"].astype(str).str.casefold()))
+            keys = zip(parents["Path"].str.casefold(), parents["Name"].str.casefold())
+            parents = parents[[key not in existing for key in keys]]
+        result = pd.concat([parents, result], ignore_index=True)
+
+    print(f"🧭 Compiled {len(combinations)} distinct paths for {len(data)} rows.")
+    return result
+
+
+def _level_values(values: pd.Series) -> np.ndarray:
+    """Level values as strings, with blanks (NaN or the text 'nan') as None."""
+    text = values.astype(object).astype(str).where(values.notna())
+    missing = text.isna() | text.str.lower().eq("nan")
+    return text.where(~missing, None).to_numpy(dtype=object)
+
+
+def _cumulative_paths(level_values: List[np.ndarray]) -> List[np.ndarray]:
+    """Path through each level for every distinct Level combination (blank levels skipped)."""
+    path = np.full(len(level_values[0]), "", dtype=object)
+    paths = []
+    for values in level_values:
+        present = pd.notna(values)
+        joined = np.where(path == "", values, path + PATH_SEPARATOR + np.where(present, values, ""))
+        path = np.where(present, joined, path)
+        paths.append(path)
+    return paths
+
+
+def _parent_asset_rows(level_values: List[np.ndarray], cumulative_paths: List[np.ndarray]) -> pd.DataFrame:
+    """One Asset row per distinct (parent path, level value) pair."""
+    frames = []
+    for depth, values in enumerate(level_values):
+        present = pd.notna(values)
+        parent_path = cumulative_paths[depth - 1] if depth else np.full(len(values), "", dtype=object)
+        frames.append(pd.DataFrame({"Path": parent_path[present], "Name": values[present]}))
+
+    assets = pd.concat(frames, ignore_index=True)
+    assets = assets.loc[~assets.assign(
+        path_nocase=assets["Path"].str.casefold(), name_nocase=assets["Name"].str.casefold()
+    ).duplicated(subset=["path_nocase", "name_nocase"])]
+    assets["Type"] = "Asset"
+    return assets.reset_index(drop=True)
@@ -0,0 +1,217 @@
+# src/itv_asset_tree/core/push_jobs.py
+
+import asyncio
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from ..config import settings
+
+INTERACTIVE = "interactive"  # Small UI edits: inserts, lookups, incremental pushes
+BULK = "bulk"  # Full rebuilds: CSV builds, template builds
+LANES = (INTERACTIVE, BULK)
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED_STATES = (SUCCEEDED, FAILED, CANCELLED)
+
+_current = threading.local()
+
+
+class JobCancelledError(RuntimeError):
+    """Raised inside a job that noticed its cancellation request."""
+
+
+class JobNotCancellableError(RuntimeError):
+    """Raised when cancelling a running job that never checks for cancellation."""
+
+
+@dataclass
+class PushJob:
+    """A unit of push work and its lifecycle."""
+    id: str
+    name: str
+    lane: str
+    status: str = QUEUED
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Any = None
+    error: Optional[str] = None
+    future: Optional[Future] = field(default=None, repr=False)
+    cancel_requested: threading.Event = field(default_factory=threading.Event, repr=False)
+    checks_cancellation: bool = False  # Set once the job's code calls check_cancelled()
+
+    @property
+    def cancellable(self) -> bool:
+        """Queued jobs can always be cancelled; running ones only once they check for it."""
+        return self.status == QUEUED or (self.status == RUNNING and self.checks_cancellation)
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.id,
+            "name": self.name,
+            "lane": self.lane,
+            "status": self.status,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "result": self.result if self.status == SUCCEEDED else None,
+            "error": self.error,
+            "cancel_requested": self.cancel_requested.is_set(),
+            "cancellable": self.cancellable,
+        }
+
+
+def check_cancelled():
+    """
+    Call between steps of long-running job code (e.g. between push chunks): raises
+    JobCancelledError if the job running on this thread was asked to stop.
+    The first call marks the job as cancellable while it runs (only chunked
+    and parallel pushes call it today). Outside a job this does nothing.
+    """
+    job = getattr(_current, "job", None)
+    if job is None:
+        return
+    job.checks_cancellation = True
+    if job.cancel_requested.is_set():
+        raise JobCancelledError(f"Job '{job.name}' was cancelled.")
+
+
+class PushJobQueue:
+    """
+    Runs pushes in the background and tracks them by job ID.
+
+    Each lane has its own bounded worker pool, so a queue of bulk rebuilds never
+    delays interactive edits. Queued jobs can be cancelled outright; running jobs
+    are asked to stop and do so at their next `check_cancelled()` call. A running
+    job that has not called it (anything but a chunked or parallel push) cannot
+    be cancelled and runs to completion.
+
+    Jobs live in the memory of this process only: with several server workers,
+    a job is only known to (and can only be cancelled by) the worker that
+    accepted it, and is lost when that worker restarts.
+    """
+
+    def __init__(self, interactive_workers: Optional[int] = None, bulk_workers: Optional[int] = None,
+                 max_history: Optional[int] = None):
+        self._pools = {
+            INTERACTIVE: ThreadPoolExecutor(
+                max_workers=interactive_workers or settings.PUSH_JOB_INTERACTIVE_WORKERS,
+                thread_name_prefix="push-interactive"),
+            BULK: ThreadPoolExecutor(
+                max_workers=bulk_workers or settings.PUSH_JOB_BULK_WORKERS,
+                thread_name_prefix="push-bulk"),
+        }
+        self.max_history = max_history or settings.PUSH_JOB_HISTORY
+        self._jobs: "OrderedDict[str, PushJob]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, fn: Callable, *args, name: str, lane: str = INTERACTIVE, **kwargs) -> PushJob:
+        """Queue `fn(*args, **kwargs)` on a lane and return its job."""
+        if lane not in LANES:
+            raise ValueError(f"❌ Unknown job lane '{lane}'. Choose one of {LANES}.")
+        job = PushJob(id=uuid.uuid4().hex, name=name, lane=lane)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._trim_history()
+        job.future = self._pools[lane].submit(self._run, job, fn, args, kwargs)
+        print(f"📥 Queued {lane} job '{name}' ({job.id[:8]}).")
+        return job
+
+    def get(self, job_id: str) -> PushJob:
+        """Return a job by ID (KeyError if unknown or already forgotten)."""
+        with self._lock:
+            return self._jobs[job_id]
+
+    def list(self, lane: Optional[str] = None, status: Optional[str] = None) -> List[PushJob]:
+        """Jobs, oldest first, optionally filtered by lane and status."""
+        with self._lock:
+            jobs = list(self._jobs.values())
+        return [job for job in jobs if lane in (None, job.lane) and status in (None, job.status)]
+
+    def cancel(self, job_id: str) -> PushJob:
+        """
+        Cancel a queued job, or ask a running one to stop at its next checkpoint.
+        Raises JobNotCancellableError for a running job that never checks for cancellation.
+        """
+        job = self.get(job_id)
+        with self._lock:  # A job starts under the same lock, so its status cannot change in between
+            if job.status in FINISHED_STATES:
+                return job
+            if not job.cancellable:
+                raise JobNotCancellableError(f"Job '{job.name}' is running and cannot be cancelled; "
+                                             "only chunked and parallel pushes stop between steps.")
+            job.cancel_requested.set()
+        if job.future is not None and job.future.cancel():
+            self._finish(job, CANCELLED, error="Cancelled before it started.")
+        return job
+
+    async def wait(self, job: PushJob) -> Any:
+        """
+        Await a job from async code without blocking the event loop; re-raise its error.
+        A job cancelled before it started raises JobCancelledError, like one cancelled
+        while running, rather than the asyncio.CancelledError meant for the waiter itself.
+        """
+        try:
+            return await asyncio.wrap_future(job.future)
+        except asyncio.CancelledError:
+            if not job.cancel_requested.is_set():
+                raise  # The waiting task was cancelled, not the job
+            raise JobCancelledError(f"Job '{job.name}' was cancelled.")
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Job counts per lane and status."""
+        counts = {lane: {} for lane in LANES}
+        for job in self.list():
+            counts[job.lane][job.status] = counts[job.lane].get(job.status, 0) + 1
+        return counts
+
+    def shutdown(self, wait: bool = True):
+        for pool in self._pools.values():
+            pool.shutdown(wait=wait, cancel_futures=True)
+
+    def _run(self, job: PushJob, fn: Callable, args: tuple, kwargs: dict):
+        with self._lock:
+            if not job.cancel_requested.is_set():
+                job.status, job.started_at = RUNNING, time.time()
+        if job.status != RUNNING:
+            self._finish(job, CANCELLED, error="Cancelled before it started.")
+            raise JobCancelledError(f"Job '{job.name}' was cancelled.")
+        _current.job = job
+        try:
+            result = fn(*args, **kwargs)
+        except JobCancelledError as e:
+            self._finish(job, CANCELLED, error=str(e))
+            raise
+        except Exception as e:
+            self._finish(job, FAILED, error=str(e))
+            print(f"❌ Job '{job.name}' ({job.id[:8]}) failed: {e}")
+            raise
+        finally:
+            _current.job = None
+        job.result = result
+        self._finish(job, SUCCEEDED)
+        print(f"✅ Job '{job.name}' ({job.id[:8]}) finished in {job.finished_at - job.started_at:.1f}s.")
+        return result
+
+    @staticmethod
+    def _finish(job: PushJob, status: str, error: Optional[str] = None):
+        job.status, job.error, job.finished_at = status, error, time.time()
+
+    def _trim_history(self):
+        """Forget the oldest finished jobs beyond `max_history` (running/queued jobs are kept)."""
+        excess = len(self._jobs) - self.max_history
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.status in FINISHED_STATES][:max(excess, 0)]:
+            del self._jobs[job_id]
+
+
+# ✅ Shared instance used by the API
+push_jobs = PushJobQueue()
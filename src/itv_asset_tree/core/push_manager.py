@@ -1,5 +1,26 @@
 # src/itv_asset_tree/core/push_manager.py
 
+import time
+import traceback
+from seeq.spy.assets._trees import _properties as spy_properties
+from .chunked_push import (
+    ChunkedPush,
+    archive_items,
+    discard_metadata_state,
+    full_paths_of,
+    push_rows,
+    push_state_files,
+    push_workbook,
+    stale_item_ids,
+    with_known_ids,
+)
+from .parallel_push import ParallelSubtreePush
+from .tree_diff import TreeDiff, diff_trees, get_baseline, snapshot_tree
+from .push_planner import PushPlan, plan_push, record_push
+from .render_cache import render_cache
+from .tree_locks import locked, tree_locks
+from ..config import settings
+
 class PushManager:
     """
     Handles pushing an asset tree to Seeq.
@@ -12,19 +33,40 @@ class PushManager:
         print(f"✅ [DEBUG] PushManager initialized with tree '{tree.name}'.")
         self.tree = tree
 
-        # 🛑 **Add a safe-guard flag to prevent recursion**
+        # 🛑 **Add a safe-guard flag to prevent recursion** (only read and set under the tree lock)
         if not hasattr(self.tree, "_push_in_progress"):
             self.tree._push_in_progress = False  
 
-    def push(self, metadata_state_file=None):
+    def push(self, metadata_state_file=None, changes_only=False, dry_run=False, parallel_depth=None):
         """
         Pushes the asset tree to Seeq.
 
         Parameters:
         ----------
         metadata_state_file : str, optional
-            Path to save the metadata state file.
+            Path to save the metadata state file. Defaults to the tree's own file
+            (see `state_files`).
+        changes_only : bool, default False
+            Push only what changed since the tree was loaded or last pushed
+            (see `push_changes`). Falls back to a full push without a baseline.
+        dry_run : bool, default False
+            Do not touch Seeq; return the push plan (counts, payload size and
+            estimated duration) instead.
+        parallel_depth : int, optional
+            Push the whole tree with its branches at this depth pushed
+            concurrently (see `push_subtrees`). Ignores `changes_only`.
         """
+        if dry_run:
+            plan = self.plan(changes_only=changes_only)
+            print(plan.describe())
+            return {"message": f"Dry run for tree '{self.tree.name}'.", "plan": plan.to_dict()}
+
+        # Pushes of the same tree from other threads wait here; other trees are not blocked
+        with tree_locks.lock(*self.lock_key):
+            return self._push(metadata_state_file=metadata_state_file, changes_only=changes_only,
+                              parallel_depth=parallel_depth)
+
+    def _push(self, metadata_state_file=None, changes_only=False, parallel_depth=None):
         if self.tree._push_in_progress:
             print("🚨 [ERROR] Recursive push detected! Preventing re-entry.")
             return {"error": "Recursive push prevented."}
@@ -49,7 +91,12 @@ class PushManager:
             print(f"📊 [DEBUG] Calling `self.tree.push()` now...")
 
             # ✅ **Actually push the tree**
-            result = self.tree.push(metadata_state_file=metadata_state_file)
+            if parallel_depth:
+                result = self.push_subtrees(depth=parallel_depth, metadata_state_file=metadata_state_file)
+            elif changes_only:
+                result = self.push_changes(metadata_state_file=metadata_state_file)
+            else:
+                result = self.push_full(metadata_state_file=metadata_state_file)
 
             print(f"✅ [DEBUG] Tree '{self.tree.name}' successfully pushed.")
             return {"message": f"Tree '{self.tree.name}' pushed successfully.", "result": result}
@@ -63,4 +110,144 @@ class PushManager:
             return {"error": str(e)}
 
         finally:
-            self.tree._push_in_progress = False  # ✅ Reset flag after execution
\ No newline at end of file
+            self.tree._push_in_progress = False  # ✅ Reset flag after execution
+
+    def plan(self, changes_only=True) -> PushPlan:
+        """Dry-run plan of what a push would create, update and archive."""
+        return plan_push(self.tree, changes_only=changes_only)
+
+    @property
+    def lock_key(self):
+        """(workbook, tree name) under which pushes of this tree are serialized (see `tree_locks`)."""
+        return self.tree._workbook, self.tree.name
+
+    def state_files(self):
+        """This tree's SPy metadata state file and push checkpoint paths."""
+        return push_state_files(self.tree._workbook, self.tree.name)
+
+    @locked
+    def push_full(self, metadata_state_file=None):
+        """
+        Push the whole tree (archiving anything no longer in it) and record the new baseline.
+
+        Trees of ``settings.PUSH_CHUNK_THRESHOLD`` items or more are pushed in
+        checkpointed chunks, as is any push that has a checkpoint to resume. Like
+        ``Tree.push``, a chunked push creates the workbook first and archives what
+        the tree no longer contains (see `_ids_to_archive`).
+        """
+        chunked = self._chunked_push(metadata_state_file)
+        if chunked.resumable():
+            result = chunked.run()
+            self._pushed()
+            return result
+        if len(self.tree) >= settings.PUSH_CHUNK_THRESHOLD and not self._has_display_work():
+            push_workbook(self.tree)
+            result = chunked.run(ids_to_archive=self._ids_to_archive())
+            self._pushed()
+            return result
+
+        started = time.monotonic()
+        result = self.tree.push(metadata_state_file=chunked.metadata_state_file)
+        record_push(len(self.tree), time.monotonic() - started)
+        self._pushed()
+        return result
+
+    @locked
+    def push_subtrees(self, depth=None, max_workers=None, metadata_state_file=None):
+        """
+        Push the whole tree with independent branches in parallel.
+
+        The rows above `depth` (default ``settings.PARALLEL_PUSH_DEPTH``; the root
+        has depth 1) are pushed first, then the subtrees under each node at `depth`
+        go to Seeq concurrently, at most `max_workers` at a time (default
+        ``settings.PARALLEL_PUSH_WORKERS``). Branches that reference each other are
+        pushed together. As in `push_full`, the workbook is created first and items
+        the tree no longer contains are archived (see `_ids_to_archive`).
+        """
+        push_workbook(self.tree)
+        ids_to_archive = self._ids_to_archive()
+        push = ParallelSubtreePush(self.tree, depth=depth, max_workers=max_workers,
+                                   metadata_state_file=metadata_state_file or self.state_files()[0])
+        result = push.run(ids_to_archive=ids_to_archive)
+        self._pushed()
+        return result
+
+    def _ids_to_archive(self):
+        """
+        Seeq IDs a whole-tree push archives: those that left the tree since its
+        baseline or, without one (a tree rebuilt from a CSV), whatever Seeq holds
+        under the root that the tree no longer contains.
+        """
+        baseline = get_baseline(self.tree)
+        if baseline is not None:
+            return diff_trees(baseline, self.tree.df).ids_to_archive
+        return stale_item_ids(self.tree)
+
+    def diff(self) -> TreeDiff:
+        """Changes between the tree's last-known Seeq state and its local state."""
+        baseline = get_baseline(self.tree)
+        if baseline is None:
+            raise ValueError("❌ No baseline recorded for this tree; it was not loaded or pushed through this service.")
+        return diff_trees(baseline, self.tree.df)
+
+    @locked
+    def push_changes(self, metadata_state_file=None):
+        """
+        Push only the added, moved and changed items, and archive removed ones.
+
+        Falls back to a full push when there is no baseline to diff against or the
+        tree has pending display-template work that only a full push handles.
+        Large changesets are pushed in checkpointed chunks; an interrupted chunked
+        push is resumed before anything else.
+        """
+        chunked = self._chunked_push(metadata_state_file)
+        if chunked.resumable():
+            result = chunked.run()
+            self._pushed()
+            return result
+
+        if get_baseline(self.tree) is None or self._has_display_work():
+            print("ℹ️ No usable baseline for an incremental push; pushing the whole tree.")
+            return self.push_full(metadata_state_file=metadata_state_file)
+
+        changes = self.diff()
+        print(f"🧮 Tree diff for '{self.tree.name}': {changes.summary()}")
+        if changes.is_empty:
+            return {"changes": changes.summary(), "pushed": 0, "archived": 0}
+
+        if len(changes.push_index) >= settings.PUSH_CHUNK_THRESHOLD:
+            result = chunked.run(rows=changes.push_index, ids_to_archive=changes.ids_to_archive)
+            self._pushed()
+            return dict(result, changes=changes.summary())
+
+        started = time.monotonic()
+        pushed = 0
+        if changes.push_index:
+            # A partial push: the state file would end up describing only this subset
+            discard_metadata_state(chunked.metadata_state_file)
+            # SPy resolves path references only within one push: send those outside the subset as IDs
+            df = self.tree._dataframe
+            full_paths = full_paths_of(df)
+            has_id = df["ID"].notna()
+            subset = spy_properties.format_references(df).loc[changes.push_index]
+            subset = with_known_ids(subset, full_paths, dict(zip(full_paths[has_id], df.loc[has_id, "ID"])))
+            pushed = push_rows(self.tree, subset)
+
+        archived = archive_items(self.tree, changes.ids_to_archive)
+
+        record_push(pushed + archived, time.monotonic() - started)
+        self.tree.is_dirty = False
+        self._pushed()
+        return {"changes": changes.summary(), "pushed": pushed, "archived": archived}
+
+    def _pushed(self):
+        """Record the pushed state: the diff baseline, and a new version for cached renderings."""
+        snapshot_tree(self.tree)
+        render_cache.bump(self.tree._workbook, self.tree.name, self.tree)
+
+    def _chunked_push(self, metadata_state_file=None) -> ChunkedPush:
+        state_file, checkpoint_file = self.state_files()
+        return ChunkedPush(self.tree, metadata_state_file or state_file, checkpoint_file)
+
+    def _has_display_work(self) -> bool:
+        return bool(self.tree._display_template_map or self.tree._display_ids_to_archive)
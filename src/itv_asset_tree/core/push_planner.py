@@ -0,0 +1,144 @@
+# src/itv_asset_tree/core/push_planner.py
+
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import List, Optional
+
+import pandas as pd
+
+from .tree_diff import diff_trees, get_baseline
+from ..config import settings
+
+DEFAULT_ITEMS_PER_SECOND = 200.0  # Used until a push has been observed
+PAYLOAD_SAMPLE_ROWS = 1000  # Rows serialized to estimate the payload of larger pushes
+MAX_THROUGHPUT_RECORDS = 50
+
+_log_lock = threading.Lock()
+
+
+@dataclass
+class PushPlan:
+    """What a push would do, and roughly how long it would take."""
+    tree_name: str
+    mode: str  # "full" or "changes"
+    creates: int
+    updates: int
+    archives: int
+    payload_bytes: int
+    estimated_seconds: float
+    items_per_second: float
+    throughput_source: str  # "observed" or "default"
+
+    @property
+    def items(self) -> int:
+        return self.creates + self.updates
+
+    def to_dict(self) -> dict:
+        return dict(asdict(self), items=self.items, nothing_pending=self.is_empty)
+
+    @property
+    def is_empty(self) -> bool:
+        """An incremental plan with nothing to push or archive."""
+        return self.mode == "changes" and self.items + self.archives == 0
+
+    def describe(self) -> str:
+        if self.is_empty:
+            return (f"📋 Nothing pending for '{self.tree_name}': it matches its last-known Seeq state, "
+                    f"so a push would not change anything (a full push re-sends it anyway).")
+        minutes, seconds = divmod(round(self.estimated_seconds), 60)
+        return (
+            f"📋 Push plan for '{self.tree_name}' ({self.mode}): "
+            f"{self.creates} to create, {self.updates} to update, {self.archives} to archive; "
+            f"~{self.payload_bytes / 1024 / 1024:.1f} MiB; "
+            f"estimated {minutes}m {seconds}s at {self.items_per_second:.0f} items/s ({self.throughput_source})."
+        )
+
+
+def plan_push(tree, changes_only: bool = True) -> PushPlan:
+    """
+    Dry-run a push: count what would be created, updated and archived, without calling Seeq.
+
+    Parameters:
+    ----------
+    tree : spy.assets.Tree
+        The tree to push.
+    changes_only : bool, default True
+        Plan an incremental push against the tree's baseline (see `tree_diff`).
+        Without a baseline, or when False, the whole tree is planned.
+    """
+    current = tree.df
+    baseline = get_baseline(tree)
+
+    if changes_only and baseline is not None:
+        changes = diff_trees(baseline, current)
+        to_push = current.loc[changes.push_index]
+        archives = len(changes.ids_to_archive)
+        mode = "changes"
+    else:
+        to_push = current
+        # A full push archives whatever left the tree; only known if there is a baseline
+        archives = len(diff_trees(baseline, current).ids_to_archive) if baseline is not None else 0
+        mode = "full"
+
+    has_id = to_push["ID"].notna() if "ID" in to_push.columns else pd.Series(False, index=to_push.index)
+    items_per_second, source = observed_throughput()
+    items = len(to_push) + archives
+    return PushPlan(
+        tree_name=tree.name,
+        mode=mode,
+        creates=int((~has_id).sum()),
+        updates=int(has_id.sum()),
+        archives=archives,
+        payload_bytes=estimate_payload_bytes(to_push),
+        estimated_seconds=round(items / items_per_second, 1),
+        items_per_second=round(items_per_second, 1),
+        throughput_source=source,
+    )
+
+
+def estimate_payload_bytes(rows: pd.DataFrame) -> int:
+    """Approximate JSON size of the rows to push, extrapolated from a sample."""
+    if len(rows) == 0:
+        return 0
+    sample = rows if len(rows) <= PAYLOAD_SAMPLE_ROWS else rows.sample(PAYLOAD_SAMPLE_ROWS, random_state=0)
+    sample_bytes = len(sample.to_json(orient="records", default_handler=str).encode("utf-8"))
+    return int(sample_bytes * len(rows) / len(sample))
+
+
+def record_push(items: int, seconds: float, payload_bytes: Optional[int] = None):
+    """Append an observed push to the throughput log used for estimates."""
+    if items <= 0 or seconds <= 0:
+        return
+    with _log_lock:
+        records = _read_records()
+        records.append({"items": items, "seconds": round(seconds, 3), "bytes": payload_bytes, "at": time.time()})
+        records = records[-MAX_THROUGHPUT_RECORDS:]
+        os.makedirs(os.path.dirname(settings.PUSH_THROUGHPUT_LOG) or ".", exist_ok=True)
+        tmp_path = f"{settings.PUSH_THROUGHPUT_LOG}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(records, f)
+        os.replace(tmp_path, settings.PUSH_THROUGHPUT_LOG)
+
+
+def observed_throughput() -> tuple:
+    """Items per second over the recent pushes, and whether it was observed or defaulted."""
+    with _log_lock:
+        records = _read_records()
+    items = sum(record["items"] for record in records)
+    seconds = sum(record["seconds"] for record in records)
+    if not items or not seconds:
+        return DEFAULT_ITEMS_PER_SECOND, "default"
+    return items / seconds, "observed"
+
+
+def _read_records() -> List[dict]:
+    if not os.path.exists(settings.PUSH_THROUGHPUT_LOG):
+        return []
+    try:
+        with open(settings.PUSH_THROUGHPUT_LOG, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return []  # A corrupt log only costs us the estimate
@@ -0,0 +1,165 @@
+# src/itv_asset_tree/core/render_cache.py
+
+import hashlib
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+
+import pandas as pd
+
+from .tree_index import TreeIndex
+from .tree_serializer import serialize_tree
+from ..config import settings
+
+TreeKey = Tuple[str, str]
+
+# Renderings a push warms up: the children index, the full text and the full nested JSON
+PRECOMPUTED = (("index", None), ("text", None), ("nested", None))
+
+
+class RenderCache:
+    """
+    Versioned cache of tree renderings (text, nested/adjacency JSON and the
+    ``TreeIndex``) keyed by (workbook, tree name).
+
+    Every tree has a version that is bumped whenever this service pushes or
+    reloads it. Renderings are cached per version, so repeated views of an
+    unchanged tree cost nothing, and `etag` gives HTTP clients a validator that
+    changes exactly when the tree does. ETags include a per-process token, so
+    they never match across restarts. Older versions of a tree are dropped on a
+    bump; beyond ``settings.RENDER_CACHE_MAX_ENTRIES`` renderings the least
+    recently used ones go.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None):
+        self.max_entries = max_entries or settings.RENDER_CACHE_MAX_ENTRIES
+        self._token = uuid.uuid4().hex[:8]
+        self._versions: Dict[TreeKey, int] = {}
+        self._entries = OrderedDict()  # (workbook, tree, version, kind, max_depth) -> Future
+        self._lock = threading.Lock()
+        self._executor = None
+        self.hits = 0
+        self.misses = 0
+
+    # ----- versions -----------------------------------------------------------------
+
+    def version(self, workbook: str, tree_name: str) -> Optional[int]:
+        """The tree's current version, or None if this service has not seen it yet."""
+        with self._lock:
+            return self._versions.get((workbook, tree_name))
+
+    def bump(self, workbook: str, tree_name: str, tree=None) -> int:
+        """
+        Start a new version of a tree after it was pushed or reloaded. With `tree`,
+        its renderings are precomputed on a background thread.
+        """
+        key = (workbook, tree_name)
+        with self._lock:
+            version = self._versions[key] = self._versions.get(key, 0) + 1
+            for stale in [entry for entry in self._entries if entry[:2] == key and entry[2] < version]:
+                del self._entries[stale]
+        if tree is not None and settings.RENDER_PRECOMPUTE:
+            # Structural edits replace the tree's DataFrame, so this reference stays the pushed state
+            frame = tree._dataframe
+            self._pool().submit(self._precompute, workbook, tree_name, version, frame)
+        return version
+
+    def etag(self, workbook: str, tree_name: str, version: int, *variant) -> str:
+        """
+        Strong ETag of one rendering (`variant`: format, depth, page, ...) of a tree version.
+        It names the workbook and tree, since versions of different trees coincide.
+        """
+        # Hashed, since names and variants may hold characters not allowed in an ETag
+        suffix = hashlib.sha1(repr((workbook, tree_name, variant)).encode("utf-8")).hexdigest()[:12]
+        return f'"{self._token}-{version}-{suffix}"'
+
+    # ----- renderings ---------------------------------------------------------------
+
+    def render(self, workbook: str, tree_name: str, tree, kind: str = "text",
+               max_depth: Optional[int] = None) -> Tuple[int, Any]:
+        """
+        Return ``(version, rendering)`` of a loaded tree (or its DataFrame) for the
+        tree's current version, computing it on a miss. `kind` is ``"index"``
+        (a ``TreeIndex``) or a `serialize_tree` format.
+        """
+        key = (workbook, tree_name)
+        with self._lock:
+            version = self._versions.setdefault(key, 1)
+        frame = tree if isinstance(tree, pd.DataFrame) else tree._dataframe
+        return version, self._get(key, version, kind, max_depth, frame)
+
+    def index(self, workbook: str, tree_name: str, tree) -> Tuple[int, TreeIndex]:
+        """``(version, TreeIndex)`` of a tree, for paging through children."""
+        return self.render(workbook, tree_name, tree, kind="index")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"trees": len(self._versions), "renderings": len(self._entries),
+                    "hits": self.hits, "misses": self.misses}
+
+    def clear(self):
+        """Forget every version and rendering."""
+        with self._lock:
+            self._versions.clear()
+            self._entries.clear()
+
+    # ----- internals ----------------------------------------------------------------
+
+    def _get(self, key: TreeKey, version: int, kind: str, max_depth: Optional[int], frame):
+        entry_key = (*key, version, kind, max_depth)
+        with self._lock:
+            future = self._entries.get(entry_key)
+            owner = future is None
+            if owner:
+                self.misses += 1
+                future = self._entries[entry_key] = Future()
+                self._evict()
+            else:
+                self.hits += 1
+                self._entries.move_to_end(entry_key)
+        if not owner:
+            # Computed, or being computed by another request or the precompute thread
+            return future.result()
+
+        try:
+            if kind == "index":
+                result = TreeIndex.from_dataframe(frame)
+            else:
+                # Every other rendering of this version builds on its (cached) index
+                nodes = self._get(key, version, "index", None, frame)
+                result = serialize_tree(nodes, format=kind, max_depth=max_depth)
+        except BaseException as e:
+            with self._lock:
+                self._entries.pop(entry_key, None)
+            future.set_exception(e)
+            raise
+        future.set_result(result)
+        return result
+
+    def _precompute(self, workbook: str, tree_name: str, version: int, frame):
+        key = (workbook, tree_name)
+        try:
+            for kind, max_depth in PRECOMPUTED:
+                if self.version(workbook, tree_name) != version:
+                    return  # Pushed again meanwhile; that push precomputes the newer version
+                self._get(key, version, kind, max_depth, frame)
+            print(f"🎨 Precomputed renderings of '{tree_name}' (version {version}).")
+        except Exception as e:
+            print(f"⚠️ Could not precompute renderings of '{tree_name}': {e}")
+
+    def _evict(self):
+        # Caller holds the lock
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="render-precompute")
+            return self._executor
+
+
+# ✅ Shared instance used by the API and push paths
+render_cache = RenderCache()
@@ -3,8 +3,14 @@
 import pandas as pd
 import io
 import contextlib
+from seeq import spy
 from seeq.spy.assets import Tree
+from seeq.spy.assets._trees import _csv as spy_csv
 from .push_manager import PushManager
+from .path_compiler import compile_tree_frame, get_level_columns
+from .tree_export import decode_formula_parameters
+from .tree_serializer import render_text, serialize_tree
+from ..utils.parsed_csv_cache import parsed_csv_cache
 from typing import Optional
 
 class TreeBuilder:
@@ -12,17 +18,19 @@ class TreeBuilder:
     Class to manage tree creation.
     """
 
-    def __init__(self, workbook: str, csv_file: Optional[str] = None):
+    def __init__(self, workbook: str, csv_file: Optional[str] = None, metadata: Optional[pd.DataFrame] = None):
         self.workbook = workbook
         self.csv_file = csv_file
-        self.metadata = None
+        self.metadata = metadata  # Already-parsed CSV contents, if the caller has them
         self.tree = None
 
     def parse_csv(self):
-        """Parse the CSV file and load metadata."""
+        """Parse the CSV file and load metadata (reuses the parsed-CSV cache)."""
+        if self.metadata is not None:
+            return
         if not self.csv_file:
             raise ValueError("CSV file not provided.")
-        self.metadata = pd.read_csv(self.csv_file)
+        self.metadata = parsed_csv_cache.get(self.csv_file)
         print(f"✅ CSV parsed successfully: {self.csv_file}")
 
     def build_empty_tree(self, friendly_name: str, description: str):
@@ -59,13 +67,14 @@ class TreeBuilder:
         description : str
             A description for the tree.
         """
-        if not self.csv_file:
+        if self.metadata is None and not self.csv_file:
             raise ValueError("CSV file not provided.")
+        self.parse_csv()
 
         try:
-            # Build the tree using Seeq API
+            # Build the tree from the in-memory frame so Seeq never re-reads the CSV
             self.tree = Tree(
-                data=self.csv_file,  # Pass the CSV file path directly
+                data=self._prepare_tree_data(),
                 workbook=self.workbook,
                 friendly_name=friendly_name,
                 description=description,
@@ -74,6 +83,60 @@ class TreeBuilder:
         except Exception as e:
             raise RuntimeError(f"Error creating tree: {e}")
 
+    def _prepare_tree_data(self) -> pd.DataFrame:
+        """
+        Apply the same preparation `Tree` performs on a CSV path to the parsed metadata:
+        forward-fill the Level columns, resolve Names to IDs, then compile the Level
+        columns into paths and parent assets.
+        """
+        status = spy.Status(quiet=True)
+        data = self.metadata.copy()
+        columns = list(data.columns)
+        levels = get_level_columns(data)
+        # Level columns stay categorical for the path compiler; Seeq's search expects text elsewhere
+        categorical = [column for column in data.select_dtypes(include="category").columns if column not in levels]
+        data[categorical] = data[categorical].astype(object)
+
+        if "Name" not in columns and "ID" not in columns:
+            raise ValueError("⚠️ A 'Name' or 'ID' column is required.")
+        if "Formula Parameters" in columns:
+            # Exported trees (see tree_export) carry formula parameters as JSON text
+            data["Formula Parameters"] = data["Formula Parameters"].map(decode_formula_parameters)
+        join_column = spy_csv.get_complete_column_for_join(data, columns, status)
+        if levels and spy_csv.is_first_row_of_levels_columns_blank(data, levels):
+            raise ValueError("⚠️ All Level columns must have a value in the first row.")
+
+        # Before resolving IDs, which drops unresolved rows and reorders the rest
+        data[levels] = data[levels].ffill()
+
+        if join_column == "Name":
+            data = self._resolve_ids(data, status)
+
+        return compile_tree_frame(data, levels)
+
+    def _resolve_ids(self, data: pd.DataFrame, status) -> pd.DataFrame:
+        """
+        Resolve Names to IDs like `Tree` does for CSV input. Parent Asset rows from an
+        already-compiled frame (see `BatchTreeBuilder`) are structure, and rows with a
+        Formula (e.g. from an exported tree, see `tree_export`) define calculations:
+        neither are items to look up.
+        """
+        defined = data["Type"].eq("Asset") if "Type" in data.columns else pd.Series(False, index=data.index)
+        if "Formula" in data.columns:
+            defined |= data["Formula"].notna() & data["Formula"].astype(str).str.strip().ne("")
+        if defined.all():
+            return data
+        items = data.loc[~defined].copy()
+        try:
+            items = spy_csv.get_ids_by_name_from_user_input(items, status, workbook=self.workbook)
+        except spy.errors.SPyRuntimeError:
+            # Workbook does not exist yet; Tree searches global items in that case too
+            items = spy_csv.get_ids_by_name_from_user_input(data.loc[~defined].copy(), status,
+                                                            workbook=spy.GLOBALS_ONLY)
+        if not defined.any():
+            return items
+        return pd.concat([data.loc[defined], items], ignore_index=True)
+
     def visualize_tree(self):
         """
         Visualize the tree structure in a comprehensible format.
@@ -82,8 +145,8 @@ class TreeBuilder:
             raise ValueError("Tree not built yet.")
         
         try:
-            # Attempt to summarize the tree
-            structure = self.tree.visualize()
+            # Render straight from the tree DataFrame (Tree.visualize() prints instead of returning)
+            structure = render_text(self.tree.df)
             if not structure:
                 raise ValueError("𐂷 Tree.summarize() returned an empty structure.")
             return structure
@@ -99,34 +162,8 @@ class TreeBuilder:
         if not self.tree:
             return {"error": "Tree not built yet."}
 
-        from io import StringIO
-        import contextlib
-
-        # Capture the tree visualization as a string
-        with StringIO() as buf, contextlib.redirect_stdout(buf):
-            self.tree.visualize()
-            visualization = buf.getvalue()
-
-        # Build a JSON-like structure from the tree visualization
-        tree_json = {}
-        current_level = [tree_json]
-        lines = visualization.splitlines()
-        for line in lines:
-            # Calculate the indentation level
-            level = (len(line) - len(line.lstrip("| "))) // 2
-            node_name = line.strip("| ").strip()
-
-            # Navigate to the correct level
-            while len(current_level) > level + 1:
-                current_level.pop()
-
-            # Add node to the current level
-            current_node = current_level[-1]
-            if node_name:
-                current_node[node_name] = {}
-                current_level.append(current_node[node_name])
-
-        return tree_json
+        # Build the nesting from the tree structure itself instead of parsing visualize() text
+        return serialize_tree(self.tree, format="nested")
 
     def get_push_manager(self):
         """Get a PushManager for the current tree."""
@@ -0,0 +1,97 @@
+# src/itv_asset_tree/core/tree_cache.py
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+
+from seeq.spy.assets import Tree
+
+from ..config import settings
+
+TreeKey = Tuple[str, str]
+
+
+class TreeCache:
+    """
+    Bounded cache of loaded ``Tree`` objects keyed by (workbook, tree name).
+
+    Entries expire after ``ttl_seconds``. Least recently used trees are evicted once
+    there are more than ``max_entries`` trees or their combined size exceeds
+    ``max_rows`` tree rows, so a few huge trees cannot crowd out memory. Services
+    that push a tree refresh or invalidate its entry so the next reader never sees
+    a stale copy.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, max_rows: Optional[int] = None,
+                 ttl_seconds: Optional[float] = None):
+        self.max_entries = max_entries or settings.TREE_CACHE_MAX_ENTRIES
+        self.max_rows = max_rows or settings.TREE_CACHE_MAX_ROWS
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.TREE_CACHE_TTL_SECONDS
+        self._entries = OrderedDict()  # key -> (tree, rows, loaded_at)
+        self._rows = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, workbook: str, tree_name: str) -> Optional[Tree]:
+        """Return the cached tree, or None if it is missing or expired."""
+        key = (workbook, tree_name)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[2] > self.ttl_seconds:
+                self._drop(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, workbook: str, tree_name: str, tree: Tree):
+        """Cache a loaded (or freshly pushed) tree, evicting the least recently used ones."""
+        key = (workbook, tree_name)
+        rows = len(tree)
+        with self._lock:
+            self._drop(key)
+            self._entries[key] = (tree, rows, time.monotonic())
+            self._rows += rows
+            while len(self._entries) > 1 and (len(self._entries) > self.max_entries or self._rows > self.max_rows):
+                evicted, _ = next(iter(self._entries.items()))
+                self._drop(evicted)
+                print(f"♻️ Evicted tree '{evicted[1]}' ({evicted[0]}) from the tree cache.")
+
+    def get_or_load(self, workbook: str, tree_name: str, loader: Callable[[], Tree]) -> Tree:
+        """Return the cached tree, calling `loader` and caching its result on a miss."""
+        tree = self.get(workbook, tree_name)
+        if tree is None:
+            tree = loader()
+            self.put(workbook, tree_name, tree)
+        return tree
+
+    def invalidate(self, workbook: str, tree_name: Optional[str] = None):
+        """Forget one tree, or every tree of a workbook when `tree_name` is None."""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == workbook and tree_name in (None, key[1])]:
+                self._drop(key)
+
+    def clear(self):
+        """Forget every cached tree."""
+        with self._lock:
+            self._entries.clear()
+            self._rows = 0
+
+    def stats(self) -> dict:
+        """Entry count, cached rows and hit/miss counters."""
+        with self._lock:
+            return {"entries": len(self._entries), "rows": self._rows, "hits": self.hits, "misses": self.misses}
+
+    def _drop(self, key: TreeKey):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._rows -= entry[1]
+
+
+# ✅ Shared instance used by TreeModifier and the API
+tree_cache = TreeCache()
@@ -0,0 +1,140 @@
+# src/itv_asset_tree/core/tree_diff.py
+
+import json
+from dataclasses import dataclass
+from typing import List, Optional
+
+import pandas as pd
+
+# Item properties that make a pushed item differ from its last-known Seeq state
+COMPARED_COLUMNS = ["Name", "Path", "Type", "Formula", "Formula Parameters", "Description", "Referenced ID"]
+# What identifies the same item after Tree.move(), which drops the moved items' IDs
+MOVE_IDENTITY = ["Name", "Type", "Formula", "Formula Parameters"]
+
+
+@dataclass
+class TreeDiff:
+    """
+    Changes between the last-known Seeq state of a tree and its local state.
+
+    ``added``, ``changed`` and ``moved`` rows are labelled with the *current* tree
+    DataFrame's index; ``removed`` rows (and the old side of moves) with the
+    baseline's. ``moved`` has the old location in ``Previous Path`` and the ID the
+    item had in Seeq in ``Previous ID`` (empty when the item kept its ID).
+    """
+    added: pd.DataFrame
+    removed: pd.DataFrame
+    moved: pd.DataFrame
+    changed: pd.DataFrame
+
+    @property
+    def is_empty(self) -> bool:
+        return all(len(frame) == 0 for frame in (self.added, self.removed, self.moved, self.changed))
+
+    @property
+    def push_index(self) -> List:
+        """Rows of the current tree DataFrame that must be pushed."""
+        return sorted(set(self.added.index) | set(self.moved.index) | set(self.changed.index))
+
+    @property
+    def ids_to_archive(self) -> List[str]:
+        """Seeq IDs that are gone from the local tree (removed, or recreated by a move)."""
+        return list(self.removed["ID"]) + [item_id for item_id in self.moved["Previous ID"] if item_id]
+
+    def summary(self) -> dict:
+        return {
+            "added": len(self.added),
+            "removed": len(self.removed),
+            "moved": len(self.moved),
+            "changed": len(self.changed),
+        }
+
+
+def snapshot_tree(tree) -> pd.DataFrame:
+    """
+    Remember a tree's current DataFrame as its last-known Seeq state.
+
+    Call this right after loading a tree from Seeq and after each successful push.
+    The snapshot is kept on the tree object (like PushManager's push flag).
+    """
+    tree._seeq_baseline = tree.df.copy()
+    return tree._seeq_baseline
+
+
+def get_baseline(tree) -> Optional[pd.DataFrame]:
+    """Return the last-known Seeq state recorded by `snapshot_tree`, if any."""
+    return getattr(tree, "_seeq_baseline", None)
+
+
+def diff_trees(baseline: pd.DataFrame, current: pd.DataFrame) -> TreeDiff:
+    """
+    Compare two tree DataFrames and classify every difference.
+
+    Items are matched by Seeq ``ID``. Rows without an ID are new, unless they look
+    exactly like a removed item (same name, type and formula), in which case they
+    are that item after a move. Matched items whose path changed are moves; any
+    other property change is a change.
+    """
+    columns = [column for column in COMPARED_COLUMNS if column in baseline.columns or column in current.columns]
+    old = _normalized(baseline, columns)
+    new = _normalized(current, columns)
+
+    has_id = new["ID"] != ""
+    current_ids = set(new.loc[has_id, "ID"])
+    removed = old.loc[(old["ID"] != "") & ~old["ID"].isin(current_ids)]
+    added = new.loc[~has_id]
+
+    matched = new.loc[has_id].reset_index().merge(
+        old.reset_index(), on="ID", how="inner", suffixes=("", " (baseline)")
+    ).set_index("index")
+    path_changed = matched["Path"] != matched["Path (baseline)"]
+    property_columns = [column for column in columns if column != "Path"]
+    properties_changed = pd.Series(False, index=matched.index)
+    for column in property_columns:
+        properties_changed |= matched[column] != matched[f"{column} (baseline)"]
+
+    # Moved but still carrying its ID: pushed in place, nothing to archive
+    moved_by_id = matched.loc[path_changed, ["ID"]].assign(
+        **{"Previous Path": matched.loc[path_changed, "Path (baseline)"], "Previous ID": ""}
+    )
+    changed = matched.loc[~path_changed & properties_changed, ["ID"]]
+
+    # Tree.move() drops IDs: pair ID-less rows with removed rows that have the same identity
+    identity = [column for column in MOVE_IDENTITY if column in columns]
+    candidates = removed.reset_index().drop_duplicates(subset=identity)
+    paired = added.reset_index().merge(candidates, on=identity, how="inner", suffixes=("", " (baseline)"))
+    paired = paired.drop_duplicates(subset=["index (baseline)"]).drop_duplicates(subset=["index"])
+    moved_by_identity = pd.DataFrame({
+        "ID": "",
+        "Previous Path": paired["Path (baseline)"].to_numpy(),
+        "Previous ID": paired["ID (baseline)"].to_numpy(),
+    }, index=pd.Index(paired["index"].to_numpy()))
+
+    moved_rows = pd.concat([moved_by_id, moved_by_identity])
+    moved = current.loc[moved_rows.index].assign(**{
+        "Previous Path": moved_rows["Previous Path"], "Previous ID": moved_rows["Previous ID"],
+    })
+
+    return TreeDiff(
+        added=current.loc[added.index.difference(moved_by_identity.index)],
+        removed=baseline.loc[removed.index.difference(pd.Index(paired["index (baseline)"].to_numpy()))],
+        moved=moved,
+        changed=current.loc[changed.index],
+    )
+
+
+def _normalized(df: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
+    """Comparable text version of the compared columns (plus ID); missing values become ''."""
+    normalized = pd.DataFrame(index=df.index.rename("index"))
+    for column in ["ID"] + columns:
+        values = df[column] if column in df.columns else pd.Series(None, index=df.index, dtype=object)
+        normalized[column] = values.map(_comparable)
+    return normalized
+
+
+def _comparable(value) -> str:
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, sort_keys=True, default=str)
+    if value is None or (isinstance(value, float) and pd.isna(value)) or value is pd.NA:
+        return ""
+    return str(value)
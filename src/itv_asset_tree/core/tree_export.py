@@ -0,0 +1,155 @@
+# src/itv_asset_tree/core/tree_export.py
+
+import csv
+import io
+import json
+import math
+from typing import Iterator, List, Optional
+
+import pandas as pd
+
+from ..config import settings
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    _PYARROW_AVAILABLE = True
+except ImportError:
+    _PYARROW_AVAILABLE = False
+
+EXPORT_FORMATS = ("ndjson", "csv", "parquet")
+# The layout `TreeBuilder.build_tree_from_csv` reads back (a Path column instead of Level columns)
+EXPORT_COLUMNS = ["Path", "Name", "Type", "Description", "Formula", "Formula Parameters"]
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+def export_columns(include_ids: bool = False) -> List[str]:
+    return EXPORT_COLUMNS + ["ID"] if include_ids else list(EXPORT_COLUMNS)
+
+
+def iter_export_batches(tree, batch_rows: Optional[int] = None, include_ids: bool = False) -> Iterator[pd.DataFrame]:
+    """
+    Yield a tree's rows in export layout, `batch_rows` at a time (default
+    ``settings.EXPORT_BATCH_ROWS``), parents before children.
+
+    Missing values are None and ``Formula Parameters`` stay dictionaries. References
+    are exported as stored in the tree (full or relative paths), which is what
+    ``spy.assets.Tree`` accepts back. Only one batch is converted at a time.
+    """
+    # Structural edits replace the tree's DataFrame, so this reference is a stable snapshot
+    df = tree if isinstance(tree, pd.DataFrame) else tree._dataframe
+    batch_rows = batch_rows or settings.EXPORT_BATCH_ROWS
+    columns = export_columns(include_ids)
+    for start in range(0, len(df), batch_rows):
+        # A plain DataFrame: the tree's own frame subclass does not support every pandas method
+        batch = pd.DataFrame(df.iloc[start:start + batch_rows]).reindex(columns=columns).astype(object)
+        yield batch.where(batch.notna(), None)
+
+
+def export_tree(tree, format: str = "ndjson", batch_rows: Optional[int] = None,
+                include_ids: bool = False) -> Iterator[bytes]:
+    """
+    Stream a ``spy.assets.Tree`` (or its DataFrame) as ``ndjson``, ``csv`` or
+    ``parquet`` bytes, one encoded batch at a time, so memory use depends on the
+    batch size rather than the tree size.
+
+    NDJSON has one object per item. CSV and Parquet carry ``Formula Parameters``
+    as JSON text (see `decode_formula_parameters`); Parquet writes one row group
+    per batch and needs pyarrow.
+    """
+    if format not in EXPORT_FORMATS:
+        raise ValueError(f"❌ Unknown export format '{format}'. Choose one of {EXPORT_FORMATS}.")
+    if format == "parquet" and not _PYARROW_AVAILABLE:
+        raise ValueError("❌ Parquet export requires pyarrow (pip install pyarrow).")
+
+    batches = iter_export_batches(tree, batch_rows, include_ids)
+    columns = export_columns(include_ids)
+    if format == "ndjson":
+        for batch in batches:
+            lines = (json.dumps(dict(zip(columns, row)), default=str) for row in batch.to_numpy().tolist())
+            yield ("\n".join(lines) + "\n").encode("utf-8")
+    elif format == "csv":
+        yield from _csv_chunks(batches, columns)
+    else:
+        yield from _parquet_chunks(batches, columns)
+
+
+def encode_formula_parameters(value) -> Optional[str]:
+    """Formula parameters as JSON text, for flat formats; None when there are none."""
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return None
+    return json.dumps(value) if isinstance(value, (dict, list)) else str(value)
+
+
+def decode_formula_parameters(value):
+    """Inverse of `encode_formula_parameters`: JSON objects become dictionaries, anything else is kept."""
+    if isinstance(value, str) and value.lstrip().startswith("{"):
+        try:
+            return json.loads(value)
+        except json.JSONDecodeError:
+            return value
+    return value
+
+
+def _flat(batch: pd.DataFrame) -> pd.DataFrame:
+    """A batch with its formula parameters encoded as JSON text."""
+    return batch.assign(**{"Formula Parameters": batch["Formula Parameters"].map(encode_formula_parameters)})
+
+
+def _csv_chunks(batches, columns: List[str]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for batch in batches:
+        writer.writerows(_flat(batch).to_numpy().tolist())
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")  # Header only: the tree had no rows
+
+
+class _ChunkSink:
+    """Write-only file object that hands out what was written so far; Parquet needs `tell`."""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def writable(self) -> bool:
+        return True
+
+    def drain(self) -> bytes:
+        data, self._chunks = b"".join(self._chunks), []
+        return data
+
+
+def _parquet_chunks(batches, columns: List[str]) -> Iterator[bytes]:
+    schema = pa.schema([(column, pa.string()) for column in columns])
+    sink = _ChunkSink()
+    with pq.ParquetWriter(sink, schema) as writer:
+        for batch in batches:
+            writer.write_table(pa.Table.from_pandas(_flat(batch), schema=schema, preserve_index=False))
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+    yield sink.drain()  # Footer
@@ -0,0 +1,305 @@
+# src/itv_asset_tree/core/tree_index.py
+
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .path_compiler import PATH_SEPARATOR
+
+NO_PARENT = -1
+_INITIAL_CAPACITY = 64
+
+
+class TreeIndex:
+    """
+    Compact array-backed model of an asset tree's structure.
+
+    Nodes are integers. Parent indices, depths and interned name/type ids live in
+    numpy arrays (Seeq IDs, when known, in a plain list); every live node's full path
+    is indexed (case-insensitively, as in Seeq) for O(1) lookup. Descendant and ancestor questions are answered with
+    Euler-tour intervals: ``b`` is below ``a`` exactly when ``enter[a] < enter[b] <= leave[a]``.
+    Insert, move and remove update the arrays in place without touching the
+    intervals; they are recomputed lazily, once, before the next interval query.
+    """
+
+    def __init__(self):
+        self._parent = np.full(_INITIAL_CAPACITY, NO_PARENT, dtype=np.int64)
+        self._depth = np.zeros(_INITIAL_CAPACITY, dtype=np.int32)
+        self._name = np.zeros(_INITIAL_CAPACITY, dtype=np.int32)
+        self._type = np.zeros(_INITIAL_CAPACITY, dtype=np.int32)
+        self._alive = np.zeros(_INITIAL_CAPACITY, dtype=bool)
+        self._children: List[List[int]] = []
+        self._ids: List[Optional[str]] = []
+        self._segments: List[str] = []
+        self._segment_ids: Dict[str, int] = {}
+        self._paths: Dict[str, int] = {}
+        self._size = 0  # Nodes ever allocated (removed nodes keep their slot)
+        self._count = 0  # Live nodes
+        self._root = NO_PARENT
+        self._order = np.empty(0, dtype=np.int64)
+        self._enter = np.empty(0, dtype=np.int64)
+        self._leave = np.empty(0, dtype=np.int64)
+        self._intervals_dirty = True
+
+    # ----- construction ---------------------------------------------------------------
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame) -> "TreeIndex":
+        """
+        Build an index from a tree DataFrame (``Path``, ``Name`` and ``Type`` columns,
+        root with an empty Path, optional ``ID``), such as ``spy.assets.Tree.df``.
+        """
+        index = cls()
+        paths = df["Path"].fillna("").astype(str).to_numpy()
+        names = df["Name"].astype(str).to_numpy()
+        types = df["Type"].fillna("").astype(str).to_numpy() if "Type" in df.columns else [""] * len(df)
+        ids = (df["ID"].astype(object).where(df["ID"].notna(), None).tolist()
+               if "ID" in df.columns else [None] * len(df))
+
+        # Parents before children: shallower paths first, file order within a depth
+        depths = np.array([0 if not path else path.count(PATH_SEPARATOR) + 1 for path in paths])
+        for row in np.argsort(depths, kind="stable"):
+            index.insert(paths[row] or None, names[row], types[row], ids[row])
+        return index
+
+    @classmethod
+    def from_tree(cls, tree) -> "TreeIndex":
+        """Build an index from a ``spy.assets.Tree``."""
+        return cls.from_dataframe(tree.df)
+
+    # ----- lookups --------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, path: str) -> bool:
+        return self.find(path) is not None
+
+    @property
+    def root(self) -> Optional[int]:
+        return None if self._root == NO_PARENT else self._root
+
+    def nodes(self) -> np.ndarray:
+        """All live nodes (removed nodes keep their slot but are skipped)."""
+        return np.flatnonzero(self._alive[:self._size])
+
+    def find(self, path: str) -> Optional[int]:
+        """Return the node at a full path (``Root >> Area >> Item``), or None."""
+        return self._paths.get(_path_key(path))
+
+    def require(self, path: str) -> int:
+        """Like `find`, but raise ValueError when the path is not in the tree."""
+        node = self.find(path)
+        if node is None:
+            raise ValueError(f"❌ Path '{path}' not found in the tree.")
+        return node
+
+    def name(self, node: int) -> str:
+        return self._segments[self._name[node]]
+
+    def type(self, node: int) -> str:
+        return self._segments[self._type[node]]
+
+    def id(self, node: int) -> Optional[str]:
+        """Seeq ID of a node, or None for items not pushed yet."""
+        return self._ids[node]
+
+    def depth(self, node: int) -> int:
+        """Depth of a node; the root has depth 1, as in ``Tree.df``."""
+        return int(self._depth[node])
+
+    def parent(self, node: int) -> Optional[int]:
+        parent = int(self._parent[node])
+        return None if parent == NO_PARENT else parent
+
+    def children(self, node: int) -> List[int]:
+        return list(self._children[node])
+
+    def path_of(self, node: int) -> str:
+        """Full path of a node, including its own name."""
+        return PATH_SEPARATOR.join(self.name(ancestor) for ancestor in reversed([node] + self.ancestors(node)))
+
+    def walk(self, max_depth: Optional[int] = None):
+        """Yield ``(node, depth, parent)`` in depth-first pre-order from the root, down to `max_depth`."""
+        if self._root == NO_PARENT:
+            return
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            yield node, self.depth(node), self.parent(node)
+            if max_depth is None or self._depth[node] < max_depth:
+                stack.extend(reversed(self._children[node]))
+
+    def ancestors(self, node: int) -> List[int]:
+        """Ancestors of a node, nearest first."""
+        ancestors = []
+        parent = self._parent[node]
+        while parent != NO_PARENT:
+            ancestors.append(int(parent))
+            parent = self._parent[parent]
+        return ancestors
+
+    def is_ancestor(self, ancestor: int, node: int) -> bool:
+        """True if `node` lies strictly below `ancestor` (O(1) interval check)."""
+        self._ensure_intervals()
+        return bool(self._enter[ancestor] < self._enter[node] <= self._leave[ancestor])
+
+    def descendants(self, node: int) -> np.ndarray:
+        """All nodes below `node`, in depth-first order."""
+        self._ensure_intervals()
+        return self._order[self._enter[node] + 1:self._leave[node] + 1]
+
+    def subtree_size(self, node: int) -> int:
+        """Number of nodes in the subtree rooted at `node` (including it)."""
+        self._ensure_intervals()
+        return int(self._leave[node] - self._enter[node] + 1)
+
+    # ----- incremental updates ----------------------------------------------------
+
+    def insert(self, parent_path: Optional[str], name: str, item_type: str = "Asset",
+               item_id: Optional[str] = None) -> int:
+        """
+        Add a node under `parent_path` (None for the root) and return it.
+        Inserting an existing path updates nothing and returns the existing node.
+        """
+        parent = NO_PARENT if parent_path is None else self.require(parent_path)
+        if parent == NO_PARENT and self._root != NO_PARENT:
+            raise ValueError("❌ The tree already has a root.")
+        full_path = name if parent == NO_PARENT else f"{parent_path}{PATH_SEPARATOR}{name}"
+        existing = self.find(full_path)
+        if existing is not None:
+            return existing
+
+        node = self._allocate()
+        self._parent[node] = parent
+        self._depth[node] = 1 if parent == NO_PARENT else self._depth[parent] + 1
+        self._name[node] = self._intern(name)
+        self._type[node] = self._intern(item_type)
+        self._alive[node] = True
+        self._ids[node] = item_id
+        self._paths[_path_key(full_path)] = node
+        if parent == NO_PARENT:
+            self._root = node
+        else:
+            self._children[parent].append(node)
+        self._count += 1
+        self._intervals_dirty = True
+        return node
+
+    def remove(self, path: str) -> int:
+        """Remove a node and its descendants; return how many nodes were removed."""
+        node = self.require(path)
+        subtree = list(self._walk(node))
+        for removed in subtree:
+            self._paths.pop(_path_key(self.path_of(removed)), None)
+        for removed in subtree:
+            self._alive[removed] = False
+        parent = self._parent[node]
+        if parent == NO_PARENT:
+            self._root = NO_PARENT
+        else:
+            self._children[parent].remove(node)
+        self._count -= len(subtree)
+        self._intervals_dirty = True
+        return len(subtree)
+
+    def move(self, source_path: str, destination_path: str) -> int:
+        """Re-parent a node (with its subtree) under `destination_path`; return the node."""
+        node = self.require(source_path)
+        destination = self.require(destination_path)
+        if destination == node or self._is_above(node, destination):
+            raise ValueError("❌ Source cannot contain the destination.")
+        if self.find(f"{destination_path}{PATH_SEPARATOR}{self.name(node)}") is not None:
+            raise ValueError(f"❌ '{destination_path}' already has a child named '{self.name(node)}'.")
+
+        subtree = list(self._walk(node))
+        for moved in subtree:
+            self._paths.pop(_path_key(self.path_of(moved)), None)
+
+        old_parent = self._parent[node]
+        if old_parent != NO_PARENT:
+            self._children[old_parent].remove(node)
+        self._children[destination].append(node)
+        self._parent[node] = destination
+        shift = self._depth[destination] + 1 - self._depth[node]
+        for moved in subtree:
+            self._depth[moved] += shift
+            self._paths[_path_key(self.path_of(moved))] = moved
+        self._intervals_dirty = True
+        return node
+
+    # ----- export -------------------------------------------------------------------
+
+    def to_nested(self, node: Optional[int] = None) -> dict:
+        """Nested ``{name: {child: {...}}}`` dictionary of the (sub)tree."""
+        node = self._root if node is None else node
+        if node == NO_PARENT:
+            return {}
+        return {self.name(node): self._nested_children(node)}
+
+    def _nested_children(self, node: int) -> dict:
+        return {self.name(child): self._nested_children(child) for child in self._children[node]}
+
+    # ----- internals ----------------------------------------------------------------
+
+    def _allocate(self) -> int:
+        if self._size == len(self._parent):
+            capacity = len(self._parent) * 2
+            self._parent = _grow(self._parent, capacity, NO_PARENT)
+            self._depth = _grow(self._depth, capacity, 0)
+            self._name = _grow(self._name, capacity, 0)
+            self._type = _grow(self._type, capacity, 0)
+            self._alive = _grow(self._alive, capacity, False)
+        self._children.append([])
+        self._ids.append(None)
+        self._size += 1
+        return self._size - 1
+
+    def _intern(self, segment: str) -> int:
+        segment_id = self._segment_ids.get(segment)
+        if segment_id is None:
+            segment_id = self._segment_ids[segment] = len(self._segments)
+            self._segments.append(segment)
+        return segment_id
+
+    def _walk(self, node: int):
+        """Depth-first pre-order traversal of a subtree (iterative, any depth)."""
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            yield current
+            stack.extend(reversed(self._children[current]))
+
+    def _is_above(self, ancestor: int, node: int) -> bool:
+        """`is_ancestor` by walking parents up from `node` (O(depth)); leaves the intervals stale."""
+        parent = self._parent[node]
+        while parent != NO_PARENT:
+            if parent == ancestor:
+                return True
+            parent = self._parent[parent]
+        return False
+
+    def _ensure_intervals(self):
+        if not self._intervals_dirty:
+            return
+        self._enter = np.full(self._size, -1, dtype=np.int64)
+        self._leave = np.full(self._size, -1, dtype=np.int64)
+        order = list(self._walk(self._root)) if self._root != NO_PARENT else []
+        self._order = np.array(order, dtype=np.int64)
+        self._enter[self._order] = np.arange(len(order))
+        # A node's interval ends where its last descendant sits in the pre-order
+        for node in reversed(order):
+            children = self._children[node]
+            self._leave[node] = self._leave[children[-1]] if children else self._enter[node]
+        self._intervals_dirty = False
+
+
+def _path_key(path: str) -> str:
+    return path.strip().casefold()
+
+
+def _grow(values: np.ndarray, capacity: int, fill) -> np.ndarray:
+    grown = np.full(capacity, fill, dtype=values.dtype)
+    grown[:len(values)] = values
+    return grown
@@ -0,0 +1,131 @@
+# src/itv_asset_tree/core/tree_locks.py
+
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Dict, Optional, Tuple
+
+TreeKey = Tuple[str, str]
+
+
+class TreeLockTimeout(TimeoutError):
+    """Raised when a tree lock could not be acquired in time."""
+
+
+@dataclass
+class LockStats:
+    """Wait and hold times of one tree's lock (outermost acquisitions only)."""
+    acquisitions: int = 0
+    contended: int = 0  # Acquisitions that had to wait for another thread
+    timeouts: int = 0
+    total_wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+    total_hold_seconds: float = 0.0
+    max_hold_seconds: float = 0.0
+
+
+class _TreeLock:
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.depth = 0  # Re-entrant depth of the current holder
+        self.holder: Optional[str] = None
+        self.acquired_at = 0.0
+        self.waiting = 0
+        self.stats = LockStats()
+
+
+class TreeLockManager:
+    """
+    One re-entrant lock per (workbook, tree name).
+
+    Every mutation or push of a tree runs under its lock, so concurrent requests
+    editing the same tree are serialized while different trees push in parallel.
+    The same thread may re-acquire a lock it holds (e.g. a TreeModifier edit that
+    pushes through PushManager). Wait and hold times are kept per tree.
+    """
+
+    def __init__(self):
+        self._locks: Dict[TreeKey, _TreeLock] = {}
+        self._guard = threading.Lock()
+
+    @contextmanager
+    def lock(self, workbook: str, tree_name: str, timeout: Optional[float] = None):
+        """Hold the tree's lock for the duration of the block (TreeLockTimeout after `timeout` seconds)."""
+        entry = self._entry(workbook, tree_name)
+        started = time.monotonic()
+        acquired = entry.lock.acquire(blocking=False)
+        if not acquired:
+            with self._guard:
+                entry.waiting += 1
+            try:
+                acquired = entry.lock.acquire(timeout=-1 if timeout is None else timeout)
+            finally:
+                with self._guard:
+                    entry.waiting -= 1
+            if not acquired:
+                with self._guard:
+                    entry.stats.timeouts += 1
+                raise TreeLockTimeout(
+                    f"❌ Tree '{tree_name}' ({workbook}) is busy: held by {entry.holder} for "
+                    f"{time.monotonic() - entry.acquired_at:.1f}s."
+                )
+            waited = time.monotonic() - started
+        else:
+            waited = 0.0
+
+        entry.depth += 1
+        if entry.depth == 1:
+            entry.holder = threading.current_thread().name
+            entry.acquired_at = time.monotonic()
+            with self._guard:
+                stats = entry.stats
+                stats.acquisitions += 1
+                stats.contended += waited > 0
+                stats.total_wait_seconds += waited
+                stats.max_wait_seconds = max(stats.max_wait_seconds, waited)
+        try:
+            yield
+        finally:
+            entry.depth -= 1
+            if entry.depth == 0:
+                held = time.monotonic() - entry.acquired_at
+                entry.holder = None
+                with self._guard:
+                    entry.stats.total_hold_seconds += held
+                    entry.stats.max_hold_seconds = max(entry.stats.max_hold_seconds, held)
+            entry.lock.release()
+
+    def is_locked(self, workbook: str, tree_name: str) -> bool:
+        with self._guard:
+            entry = self._locks.get((str(workbook), str(tree_name)))
+        return entry is not None and entry.holder is not None
+
+    def metrics(self) -> Dict[str, dict]:
+        """Lock statistics per tree (``"workbook >> tree"``), with the current holder and waiters."""
+        with self._guard:
+            return {
+                f"{workbook} >> {tree_name}": dict(
+                    asdict(entry.stats), holder=entry.holder, waiting=entry.waiting,
+                    held_for_seconds=round(time.monotonic() - entry.acquired_at, 3) if entry.holder else 0.0,
+                )
+                for (workbook, tree_name), entry in self._locks.items()
+            }
+
+    def _entry(self, workbook: str, tree_name: str) -> _TreeLock:
+        with self._guard:
+            return self._locks.setdefault((str(workbook), str(tree_name)), _TreeLock())
+
+
+def locked(method):
+    """Run a method under the tree lock of its object's ``lock_key``."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with tree_locks.lock(*self.lock_key):
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+# ✅ Shared instance used by PushManager, TreeModifier and the API
+tree_locks = TreeLockManager()
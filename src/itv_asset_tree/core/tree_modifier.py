@@ -2,29 +2,54 @@
 
 import csv
 import json
+from contextlib import contextmanager
+from typing import List, Optional
+from seeq import spy
 from seeq.spy.assets import Tree
 from .push_manager import PushManager
+from .tree_cache import tree_cache
+from .tree_index import TreeIndex
+from .render_cache import render_cache
+from .tree_diff import snapshot_tree
+from .tree_locks import locked
+from .tree_serializer import render_text
 
 class TreeModifier(PushManager):
     """
     A class for modifying asset trees in Seeq.
     """
 
-    def __init__(self, workbook: str, tree_name: str):
+    def __init__(self, workbook: str, tree_name: str, tree: Optional[Tree] = None, use_cache: bool = True):
         self.workbook = workbook
         self.tree_name = tree_name
-        self.tree = None
-        self.load_tree()
+        self.tree = tree
+        self._batch = None  # Queued operations while a batch is in progress
+        self._index = None  # Structural index of self.tree, built on first use
+        self._indexed_frame = None  # The tree DataFrame self._index describes
+        if self.tree is None and use_cache:
+            self.tree = tree_cache.get(workbook, tree_name)
+        if self.tree is None:
+            self.load_tree()
         super().__init__(tree=self.tree)
 
+    @property
+    def lock_key(self):
+        """Edits and pushes of this tree, from any TreeModifier, are serialized on this key."""
+        return self.workbook, self.tree_name
+
+    @locked
     def load_tree(self):
-        """Force a full reload of the tree from Seeq to ensure changes are reflected."""
+        """Force a full reload of the tree from Seeq (and refresh the tree cache)."""
         try:
             print(f"🔄 Reloading tree '{self.tree_name}' from workbook '{self.workbook}'...")
 
             # ⚠️ Create a NEW Tree object to force a fresh load
             self.tree = None  # Drop the old reference first
             self.tree = Tree(self.tree_name, workbook=self.workbook)  # Reload from Seeq
+            snapshot_tree(self.tree)  # Last-known Seeq state for incremental pushes
+            self._index = None
+            tree_cache.put(self.workbook, self.tree_name, self.tree)
+            render_cache.bump(self.workbook, self.tree_name, self.tree)  # Seeq may hold a newer state
 
             # ✅ Confirm tree loaded successfully
             print(f"🌳 Tree '{self.tree_name}' reloaded successfully!")
@@ -32,6 +57,7 @@ class TreeModifier(PushManager):
         except Exception as e:
             raise ValueError(f"❌ Error loading tree '{self.tree_name}': {e}")
 
+    @locked
     def insert_item(self, parent_name: str, item_definition: dict):
         """Insert an item under a specified parent in the asset tree."""
         
@@ -41,88 +67,241 @@ class TreeModifier(PushManager):
         if not isinstance(item_definition, dict) or 'Name' not in item_definition or 'Type' not in item_definition:
             raise ValueError("⚠️ item_definition must be a dictionary containing at least 'Name' and 'Type'.")
 
+        # Strip any unnecessary hierarchy from the Name
+        item_definition = dict(item_definition, Name=item_definition['Name'].split('.')[-1])
+        operation = {"action": "insert", "parent": parent_name, "item": item_definition}
+
+        if self._batch is not None:
+            self._batch.append(operation)
+            return
+
         try:
-            # Strip any unnecessary hierarchy from the Name
-            item_definition['Name'] = item_definition['Name'].split('.')[-1]  
-            
-            print("📌 [DEBUG] Tree Structure After Insert (Before Push):")
-            print(self.tree.visualize())  # Check tree state before pushing
-            
-            # Insert into the tree
-            self.tree.insert(children=[item_definition], parent=parent_name)
-            
-            print("📌 [DEBUG] Tree Structure After Insert (Before Push):")
-            print(self.tree.visualize())  # Check tree state before pushing
-            
+            self._apply_operations([operation])
             print(f"✅ Successfully inserted '{item_definition['Name']}' under '{parent_name}'.")
 
             # Push the tree update to Seeq
-            self.tree.push()
+            self._push_and_refresh_cache()
 
         except Exception as e:
             print(f"❌ [ERROR] Failed to insert item: {e}")
             raise ValueError(f"Error inserting item: {e}")
 
 
+    @locked
     def move_item(self, source: str, destination: str):
         """Move an item to a new parent in the tree."""
-        try:
-            print(f"📌 [DEBUG] move_item() called: source='{source}', destination='{destination}'")
+        print(f"📌 [DEBUG] move_item() called: source='{source}', destination='{destination}'")
+        operation = {"action": "move", "source": source, "destination": destination}
 
-            # Ensure the tree is reloaded
-            del self.tree
-            self.load_tree()
+        if self._batch is not None:
+            self._batch.append(operation)
+            return
 
+        try:
             # Verify that `self.tree` is not None
             if not self.tree:
                 raise ValueError("❌ Tree object is None. Reload failed.")
 
-            # Perform move operation
-            self.tree.move(source=source, destination=destination)
+            # Perform move operation on the tree already in memory
+            self._apply_operations([operation])
             print(f"✅ Successfully moved '{source}' to '{destination}'.")
 
             # Explicitly push the tree to commit changes
-            self.tree.push(metadata_state_file="Output/asset_tree_metadata_state_file.pickle.zip")
+            self._push_and_refresh_cache()
             print(f"✅ Tree update pushed successfully.")
 
         except Exception as e:
             print(f"❌ [ERROR] move_item failed: {e}")
             raise ValueError(f"Error moving item: {e}")
 
+    @locked
     def remove_item(self, item_path: str):
         """Remove an item from the tree by its full path."""
+        operation = {"action": "remove", "path": item_path}
+
+        if self._batch is not None:
+            self._batch.append(operation)
+            return
+
         try:
             print(f"🗑️ Removing item at path: {item_path}")
 
             if not self.tree:
                 raise ValueError("❌ Tree object is None. Cannot remove item.")
 
-            self.tree.remove(item_path)
+            self._apply_operations([operation])
             print(f"✅ Successfully removed '{item_path}'.")
 
             # Ensure the tree is pushed after modification
-            self.tree.push()
+            self._push_and_refresh_cache()
             print("✅ Tree updated and pushed successfully.")
 
         except Exception as e:
             print(f"❌ [ERROR] remove_item failed: {e}")
             raise ValueError(f"Error removing item: {e}")
+
+    def begin_batch(self):
+        """Start queueing insert/move/remove operations instead of pushing each one."""
+        if self._batch is not None:
+            raise ValueError("⚠️ A batch is already in progress.")
+        self._batch = []
+
+    def rollback_batch(self):
+        """Discard the queued operations without touching the tree."""
+        self._batch = None
+
+    @locked
+    def commit_batch(self, metadata_state_file: Optional[str] = None) -> dict:
+        """
+        Apply every queued operation to the local tree, then push the tree once.
+
+        Operations are applied in order and checked against the local tree; if one
+        fails, the tree is restored to its state before the batch and nothing is pushed.
+
+        Parameters:
+        ----------
+        metadata_state_file : str, optional
+            Path to save the metadata state file.
+        """
+        if self._batch is None:
+            raise ValueError("⚠️ No batch in progress. Call 'begin_batch()' first.")
+        operations, self._batch = self._batch, None
+        if not operations:
+            return {"operations": 0, "pushed": False}
+
+        snapshot = self.tree._dataframe.copy()
+        try:
+            self._apply_operations(operations)
+        except Exception:
+            self.tree._dataframe = snapshot  # Leave the tree as it was before the batch
+            self._index = None
+            raise
+
+        self._push_and_refresh_cache(metadata_state_file=metadata_state_file)
+        print(f"✅ Batch of {len(operations)} operation(s) committed with a single push.")
+        return {"operations": len(operations), "pushed": True}
+
+    @contextmanager
+    def batch(self, metadata_state_file: Optional[str] = None):
+        """Context manager: queue operations inside the block and commit them with one push."""
+        self.begin_batch()
+        try:
+            yield self
+        except Exception:
+            self.rollback_batch()
+            raise
+        self.commit_batch(metadata_state_file=metadata_state_file)
+
+    @property
+    def index(self) -> TreeIndex:
+        """
+        Array-backed structural index of the tree, kept in step with local edits.
+        Every edit replaces the tree's DataFrame, so an index that no longer matches
+        it (the tree was edited elsewhere, e.g. through the shared tree cache) is rebuilt.
+        """
+        if self._index is None or self._indexed_frame is not self.tree._dataframe:
+            self._index = TreeIndex.from_tree(self.tree)
+            self._indexed_frame = self.tree._dataframe
+        return self._index
+
+    def item_exists(self, item_path: str) -> bool:
+        """Check whether a full path exists in the local tree (no Seeq call)."""
+        return item_path in self.index
+
+    def children_of(self, item_path: str) -> List[str]:
+        """Names of the direct children of a full path in the local tree."""
+        index = self.index
+        return [index.name(child) for child in index.children(index.require(item_path))]
+
+    def _apply_operations(self, operations: List[dict]):
+        """Apply operations to the local tree, inserting consecutive siblings in one call."""
+        index = 0
+        while index < len(operations):
+            operation = operations[index]
+            before = self.tree._dataframe
+            try:
+                if operation["action"] == "insert":
+                    children = [operation["item"]]
+                    while (index + 1 < len(operations) and operations[index + 1]["action"] == "insert"
+                           and operations[index + 1]["parent"] == operation["parent"]):
+                        index += 1
+                        children.append(operations[index]["item"])
+                    status = spy.Status(quiet=True, errors="raise")
+                    self.tree.insert(children=children, parent=operation["parent"], status=status)
+                    self._require_changes(status, "Total Items Inserted", f"parent '{operation['parent']}'")
+                    self._update_index(before, lambda index: [
+                        index.insert(operation["parent"], child["Name"], child["Type"]) for child in children
+                    ])
+                elif operation["action"] == "move":
+                    status = spy.Status(quiet=True, errors="raise")
+                    self.tree.move(source=operation["source"], destination=operation["destination"], status=status)
+                    self._require_changes(status, "Total Items Moved", f"source '{operation['source']}'")
+                    self._update_index(before, lambda index: index.move(operation["source"], operation["destination"]))
+                elif operation["action"] == "remove":
+                    status = spy.Status(quiet=True, errors="raise")
+                    self.tree.remove(operation["path"], status=status)
+                    self._require_changes(status, "Total Items Removed", f"path '{operation['path']}'")
+                    self._update_index(before, lambda index: index.remove(operation["path"]))
+                else:
+                    raise ValueError(f"⚠️ Unknown operation '{operation['action']}'.")
+            except Exception as e:
+                raise ValueError(f"Operation {index} ({operation['action']}) failed: {e}")
+            index += 1
+
+    def _update_index(self, before, update):
+        """
+        Mirror an applied operation in the index, if it described the tree DataFrame
+        `before` the operation. Seeq also matches names, globs and partial paths; when
+        an argument is not an exact full path the index is rebuilt on next use instead.
+        """
+        if self._index is None or self._indexed_frame is not before:
+            self._index = None
+            return
+        try:
+            update(self._index)
+            self._indexed_frame = self.tree._dataframe
+        except ValueError:
+            self._index = None
+
+    def _push_and_refresh_cache(self, metadata_state_file: Optional[str] = None, changes_only: bool = True):
+        """Push the tree (incrementally by default); cache the pushed state, or drop the entry on failure."""
+        try:
+            if changes_only:
+                result = self.push_changes(metadata_state_file=metadata_state_file)
+            else:
+                result = self.push_full(metadata_state_file=metadata_state_file)
+        except Exception:
+            tree_cache.invalidate(self.workbook, self.tree_name)
+            raise
+        tree_cache.put(self.workbook, self.tree_name, self.tree)
+        return result
+
+    @staticmethod
+    def _require_changes(status, counter: str, target: str):
+        if status.df.squeeze()[counter] == 0:
+            raise ValueError(f"❌ No items matched {target} in the tree.")
         
     def visualize_tree(self):
         """Visualize the tree structure."""
         if not self.tree:
             raise ValueError("Tree is not loaded. Call 'load_tree()' first.")
         try:
-            visualization = self.tree.visualize()
+            visualization = render_text(self.index)
             print("🌳 Tree visualization generated successfully.")
             return visualization
         except Exception as e:
             raise RuntimeError(f"❌ Error visualizing tree: {e}")
         
-    def push_tree(self):
-        """Push the current tree state to Seeq."""
+    @locked
+    def push_tree(self, changes_only: bool = True):
+        """
+        Push the current tree state to Seeq and return the push result. Only what changed
+        is pushed unless `changes_only` is False. A tree that is unedited since it was loaded
+        or pushed (cached or not) has nothing pending; re-pushing it takes `changes_only=False`.
+        """
         try:
-            self.tree.push()
+            result = self._push_and_refresh_cache(changes_only=changes_only)
             print("✅ Tree pushed successfully.")
+            return result
         except Exception as e:
             raise RuntimeError(f"❌ Error pushing tree: {e}")
\ No newline at end of file
@@ -0,0 +1,142 @@
+# src/itv_asset_tree/core/tree_serializer.py
+
+import base64
+import binascii
+from typing import List, Optional, Union
+
+import pandas as pd
+
+from .tree_index import TreeIndex
+
+FORMATS = ("text", "nested", "adjacency")
+
+
+def tree_index(df: Union[pd.DataFrame, TreeIndex]) -> TreeIndex:
+    """The structure of a tree DataFrame; an already-built ``TreeIndex`` is reused as it is."""
+    return df if isinstance(df, TreeIndex) else TreeIndex.from_dataframe(df)
+
+
+def describe(index: TreeIndex, node: int) -> dict:
+    """One node as JSON, without its children (``child_count`` tells how many there are)."""
+    return {
+        "name": index.name(node),
+        "type": index.type(node),
+        "id": index.id(node),
+        "path": index.path_of(node),
+        "child_count": len(index.children(node)),
+    }
+
+
+def to_nested(df: Union[pd.DataFrame, TreeIndex], max_depth: Optional[int] = None) -> Optional[dict]:
+    """
+    Nested JSON of the tree: ``{"name", "type", "id", "path", "child_count", "children"}``
+    per node. Below `max_depth` children are left out (``child_count`` still tells
+    how many there are), so the client can fetch them later.
+    """
+    index = tree_index(df)
+    built = {}
+    for node, depth, parent in index.walk(max_depth):
+        item = built[node] = {**describe(index, node), "children": []}
+        if parent is not None:
+            built[parent]["children"].append(item)
+    return built.get(index.root)
+
+
+def to_adjacency(df: Union[pd.DataFrame, TreeIndex], max_depth: Optional[int] = None) -> List[dict]:
+    """Flat node list in pre-order; each node names its ``parent`` by node number."""
+    index = tree_index(df)
+    return [
+        {
+            "node": node,
+            "parent": parent,
+            "name": index.name(node),
+            "type": index.type(node),
+            "id": index.id(node),
+            "depth": depth,
+            "child_count": len(index.children(node)),
+        }
+        for node, depth, parent in index.walk(max_depth)
+    ]
+
+
+def render_text(df: Union[pd.DataFrame, TreeIndex], max_depth: Optional[int] = None) -> str:
+    """The same ASCII layout as ``Tree.visualize()``, without printing or re-scanning rows."""
+    index = tree_index(df)
+    lines = []
+    # (node, depth, indentation before its "|-- ", whether it is its parent's last child)
+    stack = [] if index.root is None else [(index.root, 1, "", True)]
+    while stack:
+        node, depth, indent, last = stack.pop()
+        lines.append(index.name(node) if depth == 1 else f"{indent}|-- {index.name(node)}")
+        if max_depth is not None and depth >= max_depth:
+            continue
+        # Below a child that has later siblings, the column keeps its bar
+        child_indent = "" if depth == 1 else indent + ("    " if last else "|   ")
+        children = index.children(node)
+        stack.extend((child, depth + 1, child_indent, position == len(children) - 1)
+                     for position, child in reversed(list(enumerate(children))))
+    return "\n".join(lines)
+
+
+def children_page(df: Union[pd.DataFrame, TreeIndex], path: Optional[str] = None, cursor: Optional[str] = None,
+                  limit: int = 200) -> dict:
+    """
+    One page of the direct children of the node at `path` (the root when `path`
+    is None), for expanding a tree view on demand.
+
+    Returns ``{"path", "child_count", "children", "next_cursor"}``. Pass
+    ``next_cursor`` back to get the following page; it is None on the last page.
+    The cursor names the last child returned, so pages stay consistent when
+    siblings are inserted or removed between requests.
+    """
+    index = tree_index(df)
+    if path:
+        node = index.find(path)
+        if node is None:
+            raise KeyError(f"❌ Path '{path}' not found in the tree.")
+        siblings = index.children(node)
+    else:
+        siblings = [] if index.root is None else [index.root]
+
+    start = 0
+    if cursor:
+        after = decode_cursor(cursor).casefold()
+        names = [index.name(child).casefold() for child in siblings]
+        if after not in names:
+            raise ValueError("❌ Cursor no longer matches a child of this node; restart from the first page.")
+        start = names.index(after) + 1
+
+    page = siblings[start:start + limit]
+    more = start + limit < len(siblings)
+    return {
+        "path": path or None,
+        "child_count": len(siblings),
+        "children": [describe(index, child) for child in page],
+        "next_cursor": encode_cursor(index.name(page[-1])) if page and more else None,
+    }
+
+
+def encode_cursor(name: str) -> str:
+    return base64.urlsafe_b64encode(name.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> str:
+    try:
+        return base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+    except (binascii.Error, UnicodeError, ValueError):
+        raise ValueError(f"❌ Invalid cursor '{cursor}'.")
+
+
+def serialize_tree(tree, format: str = "nested", max_depth: Optional[int] = None):
+    """
+    Serialize a ``spy.assets.Tree`` (or its DataFrame or ``TreeIndex``) as ``"nested"``
+    JSON, an ``"adjacency"`` list or ``"text"`` (the ``visualize()`` layout).
+    """
+    df = tree if isinstance(tree, (pd.DataFrame, TreeIndex)) else tree.df
+    if format == "nested":
+        return to_nested(df, max_depth)
+    if format == "adjacency":
+        return to_adjacency(df, max_depth)
+    if format == "text":
+        return render_text(df, max_depth)
+    raise ValueError(f"❌ Unknown tree format '{format}'. Choose one of {FORMATS}.")
@@ -0,0 +1,189 @@
+# src/itv_asset_tree/utils/csv_ingest.py
+
+import hashlib
+import json
+import os
+import re
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from ..config import settings
+from .upload_stream import sniff_csv_header
+
+try:
+    import pyarrow as pa  # Enables the multi-threaded engine
+    from pyarrow import csv as pa_csv
+    _PYARROW_AVAILABLE = True
+except ImportError:
+    _PYARROW_AVAILABLE = False
+
+ENGINES = ("auto", "c", "pyarrow")
+PROFILE_CACHE_FILE = "./parsed_cache/dtype_profiles.json"
+INFER_ROWS = 1000  # Rows sampled to infer a profile for a new CSV layout
+
+# Columns that are always categorical: few distinct values repeated on every row
+CATEGORICAL_COLUMNS = {"Equipment_Desc"}
+CATEGORICAL_PREFIXES = ("Level ",)
+
+_INTEGER_PATTERN = re.compile(r"^[+-]?\d+$")
+_profiles: Dict[str, Dict[str, str]] = {}
+_profiles_lock = threading.Lock()
+_profiles_loaded = False
+
+
+def read_csv_fast(file_path: str, engine: Optional[str] = None, text_columns_only: bool = False) -> pd.DataFrame:
+    """
+    Load a CSV with an explicit dtype profile and the fastest available parser.
+
+    ``Level *`` and ``Equipment_Desc`` columns are read as categoricals. Columns
+    whose sampled values are all whole numbers (e.g. ``PLC_Tag_Value``) are read
+    as nullable integers. Everything else stays text. The profile is inferred
+    once per CSV layout (its header row) and cached, so repeat loads of the same
+    layout skip inference.
+
+    Parameters:
+    ----------
+    file_path : str
+        Path to the CSV file.
+    engine : {'auto', 'c', 'pyarrow'}, optional
+        Parser to use. 'auto' (the default from ``settings.CSV_ENGINE``) picks the
+        multi-threaded pyarrow engine when it is installed, else the C engine.
+    text_columns_only : bool, default False
+        Read every non-categorical column as text instead of inferring integers.
+        Tree CSVs use this, because Seeq expects names and paths as strings.
+    """
+    engine = _resolve_engine(engine or settings.CSV_ENGINE)
+    header = sniff_csv_header(file_path)
+    profile = get_dtype_profile(file_path, header, text_columns_only)
+
+    read = _read_pyarrow if engine == "pyarrow" else _read_c
+    try:
+        return read(file_path, profile)
+    except ValueError as e:
+        # A value outside the sampled rows did not fit an inferred integer column
+        relaxed = _relaxed_profile(profile)
+        print(f"⚠️ Dtype profile did not fit '{file_path}' ({e}); reading integer columns as text.")
+        _store_profile(_layout_key(header, text_columns_only), relaxed)
+        return read(file_path, relaxed)
+
+
+def _read_c(file_path: str, profile: Dict[str, str]) -> pd.DataFrame:
+    return pd.read_csv(file_path, engine="c", dtype=profile)
+
+
+def _read_pyarrow(file_path: str, profile: Dict[str, str]) -> pd.DataFrame:
+    """
+    Read with pyarrow, declaring the profile's column types to pyarrow itself.
+
+    pandas' pyarrow engine infers types first and applies ``dtype`` afterwards,
+    so text such as "007" would come back as "7.0" and blanks as "None". The
+    result here matches the C engine: text as objects with NaN for blanks and
+    categories in sorted order.
+    """
+    column_types = {column: pa.int64() if dtype == "Int64" else pa.string() for column, dtype in profile.items()}
+    table = pa_csv.read_csv(file_path, convert_options=pa_csv.ConvertOptions(
+        column_types=column_types, strings_can_be_null=True))
+    data = table.to_pandas(types_mapper={pa.int64(): pd.Int64Dtype()}.get)
+    for column, dtype in profile.items():
+        if column in data.columns and dtype != "Int64":
+            text = data[column].where(data[column].notna(), np.nan)
+            data[column] = text.astype("category") if dtype == "category" else text
+    return data
+
+
+def read_csv_chunks(file_path: str, chunk_rows: int, usecols: Optional[List[str]] = None,
+                    text_columns_only: bool = False, relaxed: bool = False):
+    """
+    Read a CSV like `read_csv_fast`, `chunk_rows` rows at a time.
+
+    Chunks come from the C engine, because the pyarrow engine cannot read in
+    chunks. A value outside the sampled rows that does not fit an inferred
+    integer column raises ``ValueError`` part-way through. In that case, read
+    again with `relaxed` to take those columns as text; the relaxed profile is
+    cached for the layout.
+    """
+    header = sniff_csv_header(file_path)
+    profile = get_dtype_profile(file_path, header, text_columns_only)
+    if relaxed:
+        profile = _relaxed_profile(profile)
+        _store_profile(_layout_key(header, text_columns_only), profile)
+    return pd.read_csv(file_path, engine="c", dtype=profile, usecols=usecols, chunksize=chunk_rows)
+
+
+def csv_row_dtype(file_path: str, text_columns_only: bool = False) -> np.dtype:
+    """The dtype a row of the whole CSV has when read with its profile (see `LookupTableBuilder.build`)."""
+    profile = get_dtype_profile(file_path, sniff_csv_header(file_path), text_columns_only)
+    empty = pd.DataFrame({column: pd.Series(dtype=dtype) for column, dtype in profile.items()})
+    return empty.to_numpy().dtype
+
+
+def get_dtype_profile(file_path: str, header: List[str], text_columns_only: bool = False) -> Dict[str, str]:
+    """Return the cached dtype profile for this CSV layout, inferring it on first sight."""
+    key = _layout_key(header, text_columns_only)
+    _load_profiles()
+    profile = _profiles.get(key)
+    if profile is None:
+        profile = infer_dtype_profile(file_path, header, text_columns_only)
+        _store_profile(key, profile)
+        print(f"🧬 Inferred dtype profile for CSV layout {key[:12]}: {profile}")
+    return profile
+
+
+def infer_dtype_profile(file_path: str, header: List[str], text_columns_only: bool = False) -> Dict[str, str]:
+    """Infer a dtype profile from the first `INFER_ROWS` rows of a CSV."""
+    sample = None if text_columns_only else pd.read_csv(file_path, nrows=INFER_ROWS, dtype=str)
+    profile = {}
+    for column in header:
+        if column in CATEGORICAL_COLUMNS or column.startswith(CATEGORICAL_PREFIXES):
+            profile[column] = "category"
+        elif sample is not None and _is_integer_column(sample[column]):
+            profile[column] = "Int64"
+        else:
+            profile[column] = "str"
+    return profile
+
+
+def _relaxed_profile(profile: Dict[str, str]) -> Dict[str, str]:
+    return {column: dtype if dtype == "category" else "str" for column, dtype in profile.items()}
+
+
+def _is_integer_column(values: pd.Series) -> bool:
+    values = values.dropna()
+    return not values.empty and bool(values.str.strip().str.match(_INTEGER_PATTERN).all())
+
+
+def _resolve_engine(engine: str) -> str:
+    if engine not in ENGINES:
+        raise ValueError(f"❌ Unknown CSV engine '{engine}'. Choose one of {ENGINES}.")
+    if engine == "auto":
+        return "pyarrow" if _PYARROW_AVAILABLE else "c"
+    return engine
+
+
+def _layout_key(header: List[str], text_columns_only: bool) -> str:
+    layout = json.dumps({"columns": header, "text_columns_only": text_columns_only})
+    return hashlib.sha1(layout.encode("utf-8")).hexdigest()
+
+
+def _load_profiles():
+    global _profiles_loaded
+    if _profiles_loaded:
+        return
+    with _profiles_lock:
+        if not _profiles_loaded and os.path.exists(PROFILE_CACHE_FILE):
+            with open(PROFILE_CACHE_FILE, encoding="utf-8") as f:
+                _profiles.update(json.load(f))
+        _profiles_loaded = True
+
+
+def _store_profile(key: str, profile: Dict[str, str]):
+    with _profiles_lock:
+        _profiles[key] = profile
+        os.makedirs(os.path.dirname(PROFILE_CACHE_FILE), exist_ok=True)
+        tmp_path = f"{PROFILE_CACHE_FILE}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(_profiles, f, indent=2)
+        os.replace(tmp_path, PROFILE_CACHE_FILE)
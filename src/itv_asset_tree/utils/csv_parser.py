@@ -2,6 +2,7 @@
 
 import os
 import pandas as pd
+from .csv_ingest import read_csv_fast
 
 class CSVHandler:
     """
@@ -17,7 +18,7 @@ class CSVHandler:
         if not os.path.exists(self.csv_path):
             raise FileNotFoundError(f"❌ File '{self.csv_path}' not found.")
 
-        self.data = pd.read_csv(self.csv_path)
+        self.data = read_csv_fast(self.csv_path)
         print("✅ CSV loaded successfully.\n")
         print("📊 Columns in the file:", list(self.data.columns))
         return self.data
\ No newline at end of file
@@ -1,7 +1,15 @@
 # src/utilities/lookup_builder.py
 
 import csv
+import hashlib
 import json
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+# Formula (and its parameter) of a lookup string that reuses another group's identical table
+SHARED_LOOKUP_PARAMETER = "$lookup"
 
 class LookupTableBuilder:
     """Builds lookup tables from cleaned data."""
@@ -16,50 +24,153 @@ class LookupTableBuilder:
         """
         Builds lookup tables as a dictionary.
 
+        Vectorized: keys and values are converted to text one column at a time, rows
+        are ordered by group with a single stable sort, and every group's table is a
+        slice of that order. The result matches a ``groupby`` + ``iterrows`` loop:
+        groups sorted, rows within a group in file order, missing groups dropped, and
+        cells written as ``str()`` of the value a row would have held.
+
         Args:
             data (DataFrame): The DataFrame containing the data.
 
         Returns:
             dict: Grouped lookup table data.
         """
+        codes, group_names = pd.factorize(data[self.group_column], sort=True)  # Missing groups get -1
+        # A row of `data` holds its values in the frame's common dtype (e.g. ints become
+        # floats next to float columns); convert the cells from that same dtype
+        row_dtype = data.iloc[:0].to_numpy().dtype
+        keys = cells_as_text(data[self.key_column], row_dtype)
+        values = cells_as_text(data[self.value_column], row_dtype)
+
+        in_group = codes >= 0
+        codes = codes[in_group]
+        order = np.argsort(codes, kind="stable")
+        # One (rows, 2) object array; tolist() builds every [key, value] pair in C
+        pairs = np.empty((len(order), 2), dtype=object)
+        pairs[:, 0] = keys[in_group][order]
+        pairs[:, 1] = values[in_group][order]
+        pairs = pairs.tolist()
+
         lookup_tables = {}
-        for group_name, group in data.groupby(self.group_column):
-            table = [[str(row[self.key_column]), str(row[self.value_column])] for _, row in group.iterrows()]
-            lookup_tables[group_name] = table
+        ends = np.cumsum(np.bincount(codes, minlength=len(group_names)))
+        start = 0
+        for group_name, end in zip(group_names, ends.tolist()):
+            if end > start:  # Unobserved categories have no rows
+                lookup_tables[group_name] = pairs[start:end]
+            start = end
         return lookup_tables
 
     # Add a new static method to the class to save the lookup table data to a CSV file
     @staticmethod
-    def save_lookup_to_csv(lookup_data, parent_paths, output_file):
+    def save_lookup_to_csv(lookup_data, parent_paths, output_file, fingerprints=None, dedupe=False,
+                           default_parent_path="Root Asset"):
         """
         Save lookup table data to a CSV file in the required format.
 
+        Rows are written as the tables arrive, so `lookup_data` may also be an
+        iterator of ``(group_name, table)`` pairs that is never held in memory
+        whole (see `lookup_stream.stream_lookup_to_csv`).
+
         Args:
-            lookup_data (dict): Lookup table dictionary where keys are group names.
-            parent_paths (dict): Dictionary mapping group names to Parent Paths.
+            lookup_data (dict or iterable): Lookup table dictionary where keys are group names,
+                or ``(group_name, table)`` pairs.
+            parent_paths (dict): Parent Paths by lookup string name (``<group>_LookupString``,
+                as `set_parent_paths` receives them) or by group name.
             output_file (str): Path to save the output CSV file.
+            fingerprints (LookupFingerprints, optional): Records every row's fingerprint, to
+                report what changed since the previous generation. Every row is still written;
+                unchanged lookup strings are only skipped when pushed (see `push_lookup`).
+            dedupe (bool): Write each distinct table once. Later groups with the same table
+                reference the first one's lookup string (see `SharedLookups`).
+            default_parent_path (str): Parent Path of groups missing from `parent_paths`.
+
+        Returns:
+            int: Number of lookup rows written.
         """
         fields = ["Name", "Formula", "Formula Parameters", "Parent Path"]
-        rows = []
-
-        for group_name, table in lookup_data.items():
-            # Correct JSON dump, without additional escaping
-            formatted_formula = json.dumps(table, ensure_ascii=False)
-            
-            # Print the formula *before* writing it
-            print(f"🚨 DEBUG: About to save formula for '{group_name}': {formatted_formula}")
-
-            rows.append({
-                "Name": group_name.replace(" ", "_") + "_LookupString",
-                "Formula": f'"{formatted_formula}"',
-                "Formula Parameters": "{}",
-                "Parent Path": parent_paths.get(group_name, "Root Asset"),
-            })
-
-        # Write CSV
+        items = lookup_data.items() if isinstance(lookup_data, dict) else lookup_data
+        shared = SharedLookups() if dedupe else None
+        written = 0
+
         with open(output_file, mode="w", newline="", encoding="utf-8") as file:
             writer = csv.DictWriter(file, fieldnames=fields, quoting=csv.QUOTE_MINIMAL)
             writer.writeheader()
-            writer.writerows(rows)
 
-        print(f"✅ Lookup CSV file '{output_file}' created successfully.")
\ No newline at end of file
+            for group_name, table in items:
+                # Correct JSON dump, without additional escaping
+                formatted_formula = json.dumps(table, ensure_ascii=False)
+
+                name = lookup_string_name(group_name)
+                row = {
+                    "Name": name,
+                    "Formula": f'"{formatted_formula}"',
+                    "Formula Parameters": "{}",
+                    "Parent Path": parent_paths.get(name, parent_paths.get(group_name, default_parent_path)),
+                }
+                if shared is not None:
+                    row = shared.row(row, table)
+                if fingerprints is not None:
+                    fingerprints.keep(row)
+
+                # Print the formula *before* writing it
+                print(f"🚨 DEBUG: About to save formula for '{group_name}': {formatted_formula}")
+                writer.writerow(row)
+                written += 1
+
+        if shared is not None:
+            print(f"🔗 {shared.references} lookup strings reference one of {shared.distinct} distinct tables.")
+        print(f"✅ Lookup CSV file '{output_file}' created successfully.")
+        return written
+
+
+class SharedLookups:
+    """
+    Deduplicates lookup tables across groups.
+
+    Each table is hashed. The first group with a given table keeps its lookup
+    string; every later group with the same table gets a formula that
+    references it (``$lookup``, with the first one's ``Parent Path >> Name``
+    as the parameter, which `push_lookup` resolves to its full path in the
+    tree). Seeq then compiles one formula per distinct table. Only the
+    hashes and paths of distinct tables are kept, so streamed lookups can be
+    deduplicated too.
+    """
+
+    def __init__(self):
+        self._first_paths = {}
+        self.references = 0
+
+    @property
+    def distinct(self) -> int:
+        return len(self._first_paths)
+
+    def shared_path(self, table, full_path: str) -> Optional[str]:
+        """Full path of the lookup string that already holds `table`, or None (and remember `full_path`)."""
+        digest = hashlib.sha256(json.dumps(table, ensure_ascii=False).encode("utf-8")).hexdigest()
+        first = self._first_paths.setdefault(digest, full_path)
+        return None if first == full_path else first
+
+    def row(self, row: dict, table) -> dict:
+        """`row` as it is, or turned into a reference when an earlier row has the same table."""
+        shared_path = self.shared_path(table, f"{row['Parent Path']} >> {row['Name']}")
+        if shared_path is None:
+            return row
+        self.references += 1
+        return {**row, "Formula": SHARED_LOOKUP_PARAMETER,
+                "Formula Parameters": json.dumps({SHARED_LOOKUP_PARAMETER: shared_path}, ensure_ascii=False)}
+
+
+def lookup_string_name(group_name: str) -> str:
+    """Name of a group's lookup string item: spaces become underscores, plus ``_LookupString``."""
+    return group_name.replace(" ", "_") + "_LookupString"
+
+
+def cells_as_text(column: pd.Series, row_dtype: np.dtype) -> np.ndarray:
+    """`str()` of every cell, as an object array, computed column-wise."""
+    if row_dtype != object:
+        column = column.astype(row_dtype)
+    if column.dtype.kind in "mM" or isinstance(column.dtype, pd.PeriodDtype):
+        # astype(str) drops the time of midnight timestamps; str() keeps it
+        return column.map(str).to_numpy(dtype=object)
+    return column.astype(str).to_numpy(dtype=object)
@@ -0,0 +1,87 @@
+# src/itv_asset_tree/utils/lookup_fingerprints.py
+
+import hashlib
+import json
+import os
+from typing import Dict, List, Optional
+
+FINGERPRINT_SUFFIX = ".fingerprints.json"
+FINGERPRINTED_COLUMNS = ("Formula", "Formula Parameters", "Parent Path")
+
+
+def fingerprint_file(lookup_file: str, stage: str) -> str:
+    """
+    The fingerprint file a workflow `stage` keeps next to the lookup CSV it writes
+    (``lookup_output.set_parent_paths.fingerprints.json``). Each stage has its own,
+    because stages fingerprint different parent paths for the same lookup strings.
+    """
+    return f"{os.path.splitext(lookup_file)[0]}.{stage}{FINGERPRINT_SUFFIX}"
+
+
+def row_fingerprint(row) -> str:
+    """Hash of what a lookup row puts in the tree: its formula, parameters and parent path."""
+    content = json.dumps([str(row.get(column, "")) for column in FINGERPRINTED_COLUMNS], ensure_ascii=False)
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+class LookupFingerprints:
+    """
+    Per-lookup-string fingerprints of one generation (or push), compared with the previous one.
+
+    Every row is passed through `keep`. Rows whose fingerprint matches the
+    previous run are unchanged and, with `skip_unchanged`, left out (reported as
+    skipped). New or changed rows are kept. Fingerprints are keyed by the row's ``Name``
+    (``<group>_LookupString``), the name the lookup string gets in the tree.
+    """
+
+    def __init__(self, previous: Optional[Dict[str, str]] = None, skip_unchanged: bool = True):
+        self.previous = previous or {}
+        self.skip_unchanged = skip_unchanged
+        self.current: Dict[str, str] = {}
+        self.changed: List[str] = []
+        self.unchanged: List[str] = []
+
+    @classmethod
+    def load(cls, path: str, skip_unchanged: bool = True) -> "LookupFingerprints":
+        """Start from the fingerprints saved at `path` (none if the file does not exist yet)."""
+        previous = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                previous = json.load(f)
+        return cls(previous, skip_unchanged)
+
+    def keep(self, row) -> bool:
+        """Record a row's fingerprint; False when it is unchanged and should be skipped."""
+        name = row["Name"]
+        fingerprint = self.current[name] = row_fingerprint(row)
+        if self.previous.get(name) == fingerprint:
+            self.unchanged.append(name)
+            return not self.skip_unchanged
+        self.changed.append(name)
+        return True
+
+    @property
+    def removed(self) -> List[str]:
+        """Lookup strings of the previous run that this one no longer produced."""
+        return sorted(set(self.previous) - set(self.current))
+
+    @property
+    def skipped(self) -> List[str]:
+        """Unchanged lookup strings that were left out."""
+        return self.unchanged if self.skip_unchanged else []
+
+    def report(self) -> dict:
+        return {"changed": self.changed, "unchanged": self.unchanged, "skipped": self.skipped, "removed": self.removed}
+
+    def save(self, path: str, keep_previous: bool = False):
+        """
+        Write the fingerprints to `path` for the next run to compare against. With
+        `keep_previous`, names this run did not see keep their earlier fingerprint
+        (a push of only some lookup strings does not forget the others).
+        """
+        fingerprints = {**self.previous, **self.current} if keep_previous else self.current
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(fingerprints, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, path)
@@ -0,0 +1,134 @@
+# src/itv_asset_tree/utils/lookup_stream.py
+
+import os
+import shutil
+import tempfile
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..config import settings
+from .csv_ingest import csv_row_dtype, read_csv_chunks
+from .lookup_builder import LookupTableBuilder, cells_as_text
+
+SPILL_COLUMNS = ["group", "key", "value"]
+MAX_SPLIT_DEPTH = 4  # Times an oversized partition is split again before it is read as it is
+
+
+def iter_lookup_tables(csv_path: str, group_column: str, key_column: str, value_column: str,
+                       chunk_rows: Optional[int] = None, partitions: Optional[int] = None,
+                       spill_dir: Optional[str] = None) -> Iterator[Tuple[str, List[List[str]]]]:
+    """
+    Yield ``(group_name, table)`` for every group of a reference CSV without loading it whole.
+
+    The CSV is read `chunk_rows` rows at a time. Each row's group, key and value
+    text (the same text `LookupTableBuilder.build` produces) is appended to one of
+    `partitions` spill files on disk, chosen by a hash of the group. Every group
+    then lives in a single partition. The partitions are built one at a time, and
+    a partition larger than ``settings.LOOKUP_SPILL_MAX_BYTES`` is split again
+    first. Peak memory is therefore one chunk or one partition, and never less
+    than the largest group.
+
+    Rows keep their file order within a group. Groups are sorted within each
+    partition, but the partitions are not merged, so the overall group order
+    differs from the in-memory build. The spill files are deleted once the
+    generator is exhausted or closed.
+    """
+    chunk_rows = chunk_rows or settings.LOOKUP_CHUNK_ROWS
+    partitions = partitions or settings.LOOKUP_SPILL_PARTITIONS
+    spill_root = tempfile.mkdtemp(prefix="lookup-spill-", dir=spill_dir or settings.LOOKUP_SPILL_DIR)
+    try:
+        spill_files = _spill_reference_table(csv_path, [group_column, key_column, value_column],
+                                             spill_root, partitions, chunk_rows)
+        for path in spill_files:
+            yield from _partition_tables(path, partitions, chunk_rows, depth=0)
+    finally:
+        shutil.rmtree(spill_root, ignore_errors=True)
+
+
+def stream_lookup_to_csv(csv_path: str, output_file: str, group_column: str, key_column: str, value_column: str,
+                         parent_paths: Optional[Dict[str, str]] = None, fingerprints=None, dedupe: bool = False,
+                         default_parent_path: str = "Root Asset", **options) -> int:
+    """
+    Build the lookup CSV of `LookupTableBuilder.save_lookup_to_csv` through `iter_lookup_tables`.
+    Each lookup row is written as soon as its group is built. Returns the number of rows.
+    """
+    tables = iter_lookup_tables(csv_path, group_column, key_column, value_column, **options)
+    try:
+        return LookupTableBuilder.save_lookup_to_csv(tables, parent_paths or {}, output_file, fingerprints, dedupe,
+                                                     default_parent_path)
+    finally:
+        tables.close()
+
+
+def _spill_reference_table(csv_path: str, columns: List[str], spill_root: str, partitions: int,
+                           chunk_rows: int) -> List[str]:
+    try:
+        return _spill_chunks(csv_path, columns, spill_root, partitions, chunk_rows, relaxed=False)
+    except ValueError as e:
+        # A late value did not fit an inferred integer column; start over reading it as text
+        print(f"⚠️ Dtype profile did not fit '{csv_path}' ({e}); spilling again with integer columns as text.")
+        for name in os.listdir(spill_root):
+            os.remove(os.path.join(spill_root, name))
+        return _spill_chunks(csv_path, columns, spill_root, partitions, chunk_rows, relaxed=True)
+
+
+def _spill_chunks(csv_path: str, columns: List[str], spill_root: str, partitions: int, chunk_rows: int,
+                  relaxed: bool) -> List[str]:
+    group_column, key_column, value_column = columns
+    spill_files = [os.path.join(spill_root, f"part-{number:04d}.csv") for number in range(partitions)]
+    chunks = read_csv_chunks(csv_path, chunk_rows, usecols=list(dict.fromkeys(columns)), relaxed=relaxed)
+    # Cells become text exactly as the in-memory build would see them (the whole file's row dtype)
+    row_dtype = csv_row_dtype(csv_path)
+    total = 0
+    with chunks:
+        for chunk in chunks:
+            chunk = chunk[chunk[group_column].notna()]
+            spill = pd.DataFrame({
+                "group": cells_as_text(chunk[group_column], np.dtype(object)),
+                "key": cells_as_text(chunk[key_column], row_dtype),
+                "value": cells_as_text(chunk[value_column], row_dtype),
+            })
+            _append_partitions(spill, spill_files, salt=0)
+            total += len(spill)
+    print(f"💾 Spilled {total} rows of '{csv_path}' into {partitions} partitions.")
+    return spill_files
+
+
+def _append_partitions(spill: pd.DataFrame, spill_files: List[str], salt: int):
+    """Append each row to the spill file its group hashes to, keeping row order."""
+    if spill.empty:
+        return
+    hashes = pd.util.hash_pandas_object(spill["group"], index=False, hash_key=f"lookup-spill-{salt:03d}")
+    targets = (hashes.to_numpy() % len(spill_files)).astype(int)
+    for target, rows in spill.groupby(targets, sort=False):
+        rows.to_csv(spill_files[target], mode="a", header=False, index=False)
+
+
+def _read_spill(path: str, chunk_rows: Optional[int] = None):
+    # Everything in a spill file is already text: no NA parsing, so "nan" and "" stay as written
+    return pd.read_csv(path, header=None, names=SPILL_COLUMNS, dtype=str, keep_default_na=False,
+                       na_filter=False, chunksize=chunk_rows)
+
+
+def _partition_tables(path: str, partitions: int, chunk_rows: int, depth: int):
+    if not os.path.exists(path):
+        return  # No group hashed to this partition
+    if depth < MAX_SPLIT_DEPTH and os.path.getsize(path) > settings.LOOKUP_SPILL_MAX_BYTES:
+        split_files = [f"{path[:-len('.csv')]}-{number:04d}.csv" for number in range(partitions)]
+        with _read_spill(path, chunk_rows) as chunks:
+            for chunk in chunks:
+                _append_partitions(chunk, split_files, salt=depth + 1)
+        if sum(os.path.exists(split) for split in split_files) > 1:
+            os.remove(path)
+            for split in split_files:
+                yield from _partition_tables(split, partitions, chunk_rows, depth + 1)
+            return
+        # A single group fills the partition; splitting cannot make it smaller
+        for split in split_files:
+            if os.path.exists(split):
+                os.remove(split)
+
+    yield from LookupTableBuilder("group", "key", "value").build(_read_spill(path)).items()
+    os.remove(path)
@@ -0,0 +1,116 @@
+# src/itv_asset_tree/utils/parsed_csv_cache.py
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+import pandas as pd
+
+from .csv_ingest import read_csv_fast
+
+try:
+    import pyarrow  # noqa: F401  (only needed for the Parquet sidecars)
+    _SIDECAR_SUFFIX = ".parquet"
+except ImportError:
+    _SIDECAR_SUFFIX = ".pkl"
+
+PARSED_CACHE_DIR = "./parsed_cache"  # Sidecars live outside ./uploaded_files on purpose
+
+
+def file_content_hash(file_path: str, chunk_size: int = 1024 * 1024) -> str:
+    """Return the SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ParsedCSVCache:
+    """
+    Parses each distinct tree CSV once and hands out the same DataFrame afterwards.
+
+    Frames are keyed by the SHA-256 of the file contents. Recently used frames stay
+    in memory; every frame is also written to a Parquet sidecar (pickle if pyarrow
+    is missing) so other workers and later requests skip `pd.read_csv` entirely.
+
+    Frames are parsed with ``read_csv_fast`` using text columns only: Level columns
+    are categorical and everything else is a string, as ``spy.assets.Tree`` expects.
+    Treat returned frames as read-only and ``copy()`` before mutating.
+    """
+
+    def __init__(self, cache_dir: str = PARSED_CACHE_DIR, max_entries: int = 8):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self._frames = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, file_path: str, content_hash: Optional[str] = None) -> pd.DataFrame:
+        """
+        Return the parsed DataFrame for a CSV file, parsing it only on first sight.
+
+        Parameters:
+        ----------
+        file_path : str
+            Path to the CSV file.
+        content_hash : str, optional
+            Pre-computed SHA-256 of the file, if the caller already has it.
+        """
+        content_hash = content_hash or file_content_hash(file_path)
+
+        with self._lock:
+            frame = self._frames.get(content_hash)
+            if frame is not None:
+                self._frames.move_to_end(content_hash)
+                return frame
+
+        sidecar = self._sidecar_path(content_hash)
+        if os.path.exists(sidecar):
+            frame = self._read_sidecar(sidecar)
+            print(f"♻️ Reusing parsed CSV {content_hash[:12]} from sidecar.")
+        else:
+            frame = read_csv_fast(file_path, text_columns_only=True)
+            self._write_sidecar(frame, sidecar)
+            print(f"✅ CSV parsed once and cached: {file_path} ({content_hash[:12]})")
+
+        self._remember(content_hash, frame)
+        return frame
+
+    def invalidate(self, content_hash: str):
+        """Forget a parsed frame and delete its sidecar."""
+        with self._lock:
+            self._frames.pop(content_hash, None)
+        sidecar = self._sidecar_path(content_hash)
+        if os.path.exists(sidecar):
+            os.remove(sidecar)
+
+    def _remember(self, content_hash: str, frame: pd.DataFrame):
+        with self._lock:
+            self._frames[content_hash] = frame
+            self._frames.move_to_end(content_hash)
+            while len(self._frames) > self.max_entries:
+                self._frames.popitem(last=False)
+
+    def _sidecar_path(self, content_hash: str) -> str:
+        return os.path.join(self.cache_dir, f"{content_hash}{_SIDECAR_SUFFIX}")
+
+    @staticmethod
+    def _read_sidecar(sidecar: str) -> pd.DataFrame:
+        if sidecar.endswith(".parquet"):
+            return pd.read_parquet(sidecar)
+        return pd.read_pickle(sidecar)
+
+    def _write_sidecar(self, frame: pd.DataFrame, sidecar: str):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = f"{sidecar}.tmp"
+        if sidecar.endswith(".parquet"):
+            frame.to_parquet(tmp_path, index=False)
+        else:
+            frame.to_pickle(tmp_path)
+        os.replace(tmp_path, sidecar)  # Atomic, so concurrent readers never see half a file
+
+
+# ✅ Shared instance used by the API, CLI and TreeBuilder
+parsed_csv_cache = ParsedCSVCache()
@@ -0,0 +1,141 @@
+# src/itv_asset_tree/utils/upload_store.py
+
+import json
+import os
+import re
+import threading
+import uuid
+from contextlib import contextmanager
+from typing import Dict
+
+from fastapi import UploadFile
+
+from .upload_stream import sniff_csv_header, stream_upload_to_disk
+
+try:
+    import fcntl
+    _FCNTL_AVAILABLE = True
+except ImportError:  # Windows: index writes are serialized within one process only
+    _FCNTL_AVAILABLE = False
+
+UPLOAD_DIR = "./uploaded_files"
+INDEX_FILE = "index.json"
+_UPLOAD_ID_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+
+class UploadStore:
+    """
+    Content-addressed store for uploaded tree CSVs.
+
+    Every upload is saved as ``<sha256>.csv`` and its SHA-256 is the upload ID the
+    client uses afterwards. Re-uploading identical content reuses the stored file.
+    ``index.json`` maps each ID to its original filename, size and columns, so a
+    lookup is a single dictionary access instead of a directory scan.
+
+    Several worker processes may share the store. Index writes hold a lock on the
+    store directory and merge the index on disk first, so no worker erases the
+    records of another. A stored file that still has no record (e.g. written
+    before this locking existed) gets one rebuilt from the file itself.
+    """
+
+    def __init__(self, root: str = UPLOAD_DIR):
+        self.root = root
+        self.index_path = os.path.join(root, INDEX_FILE)
+        self._lock = threading.Lock()
+        self._index: Dict[str, dict] = self._load_index()
+
+    async def save(self, file: UploadFile) -> dict:
+        """Stream an upload into the store and return its index record."""
+        incoming_path = os.path.join(self.root, f".incoming-{uuid.uuid4().hex}.csv")
+        upload = await stream_upload_to_disk(file, incoming_path)
+        stored_path = self._stored_path(upload.sha256)
+
+        try:
+            columns = sniff_csv_header(incoming_path)
+            with self._index_lock():
+                deduplicated = os.path.exists(stored_path)
+                if not deduplicated:
+                    os.replace(incoming_path, stored_path)
+                record = {
+                    "upload_id": upload.sha256,
+                    "filename": file.filename,
+                    "size": upload.size,
+                    "columns": columns,
+                }
+                self._write_index(record)
+        finally:
+            if os.path.exists(incoming_path):
+                os.remove(incoming_path)
+
+        print(f"{'♻️ Reused' if deduplicated else '✅ Stored'} upload '{file.filename}' as {upload.sha256[:12]}.")
+        return dict(record, deduplicated=deduplicated)
+
+    def get(self, upload_id: str) -> dict:
+        """Return the index record for an upload ID (with its on-disk path)."""
+        if not upload_id or not _UPLOAD_ID_PATTERN.match(upload_id):
+            raise ValueError(f"❌ Invalid upload ID: '{upload_id}'.")
+
+        path = self._stored_path(upload_id)
+        record = self._index.get(upload_id)
+        if record is None:
+            # Another worker may have stored it since this process loaded the index
+            with self._index_lock():
+                self._index = {**self._index, **self._load_index()}
+                record = self._index.get(upload_id)
+                if record is None and os.path.exists(path):
+                    record = self._rebuild_record(upload_id, path)
+                    self._write_index(record)
+
+        if record is None or not os.path.exists(path):
+            raise FileNotFoundError(f"❌ No uploaded CSV found for upload ID '{upload_id}'.")
+        return dict(record, path=path)
+
+    def path_for(self, upload_id: str) -> str:
+        """Return the on-disk path of an uploaded CSV."""
+        return self.get(upload_id)["path"]
+
+    def _stored_path(self, upload_id: str) -> str:
+        return os.path.join(self.root, f"{upload_id}.csv")
+
+    def _load_index(self) -> Dict[str, dict]:
+        os.makedirs(self.root, exist_ok=True)
+        if not os.path.exists(self.index_path):
+            return {}
+        with open(self.index_path, encoding="utf-8") as f:
+            return json.load(f)
+
+    @staticmethod
+    def _rebuild_record(upload_id: str, path: str) -> dict:
+        print(f"🩹 Rebuilding the index record of upload {upload_id[:12]} from its file.")
+        return {
+            "upload_id": upload_id,
+            "filename": os.path.basename(path),  # The original name is not known any more
+            "size": os.path.getsize(path),
+            "columns": sniff_csv_header(path),
+        }
+
+    @contextmanager
+    def _index_lock(self):
+        """Serialize index updates across threads and, through a lock on the store directory, processes."""
+        with self._lock:
+            if not _FCNTL_AVAILABLE:
+                yield
+                return
+            directory = os.open(self.root, os.O_RDONLY)
+            try:
+                fcntl.flock(directory, fcntl.LOCK_EX)
+                yield
+            finally:
+                os.close(directory)  # Releases the lock
+
+    def _write_index(self, record: dict):
+        """Add `record` to the index on disk, keeping records other workers wrote (hold `_index_lock`)."""
+        self._index = {**self._index, **self._load_index(), record["upload_id"]: record}
+        tmp_path = f"{self.index_path}.tmp.{os.getpid()}"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._index, f)
+        os.replace(tmp_path, self.index_path)
+
+
+# ✅ Shared instance used by the upload endpoints
+upload_store = UploadStore()
@@ -0,0 +1,91 @@
+# src/itv_asset_tree/utils/upload_stream.py
+
+import csv
+import hashlib
+import os
+from dataclasses import dataclass
+from typing import List, Optional
+
+from fastapi import UploadFile
+
+from ..config import settings
+
+
+class UploadTooLargeError(ValueError):
+    """Raised when an upload exceeds the configured size limit."""
+
+
+@dataclass
+class StreamedUpload:
+    """Where an upload landed on disk, its SHA-256 and its size in bytes."""
+    path: str
+    sha256: str
+    size: int
+
+
+async def stream_upload_to_disk(
+    file: UploadFile,
+    destination: str,
+    chunk_size: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+) -> StreamedUpload:
+    """
+    Copy an upload to disk in fixed-size chunks, hashing it on the way.
+
+    The body is never held in memory as a whole. The file is written to a
+    ``.part`` file first and only renamed into place once it is complete, so a
+    rejected or interrupted upload never leaves a truncated CSV behind.
+
+    Parameters:
+    ----------
+    file : UploadFile
+        The incoming upload.
+    destination : str
+        Final path of the file.
+    chunk_size : int, optional
+        Bytes read per chunk. Defaults to ``settings.UPLOAD_CHUNK_SIZE``.
+    max_bytes : int, optional
+        Size limit in bytes. Defaults to ``settings.MAX_UPLOAD_BYTES``.
+    """
+    chunk_size = chunk_size or settings.UPLOAD_CHUNK_SIZE
+    max_bytes = max_bytes or settings.MAX_UPLOAD_BYTES
+
+    os.makedirs(os.path.dirname(destination) or ".", exist_ok=True)
+    part_path = f"{destination}.part"
+    digest = hashlib.sha256()
+    size = 0
+
+    try:
+        with open(part_path, "wb") as buffer:
+            while chunk := await file.read(chunk_size):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLargeError(
+                        f"❌ Upload '{file.filename}' exceeds the {max_bytes} byte limit."
+                    )
+                digest.update(chunk)
+                buffer.write(chunk)
+        os.replace(part_path, destination)
+    finally:
+        if os.path.exists(part_path):
+            os.remove(part_path)
+
+    return StreamedUpload(path=destination, sha256=digest.hexdigest(), size=size)
+
+
+def sniff_csv_header(file_path: str) -> List[str]:
+    """Read only the header row of a CSV file and return its column names."""
+    with open(file_path, newline="", encoding="utf-8-sig") as f:
+        header = next(csv.reader(f), None)
+    if not header:
+        raise ValueError(f"❌ '{os.path.basename(file_path)}' is empty or has no header row.")
+    return header
+
+
+def require_columns(file_path: str, required: List[str]) -> List[str]:
+    """Validate required columns from the header row alone and return all columns."""
+    columns = sniff_csv_header(file_path)
+    for column in required:
+        if column not in columns:
+            raise ValueError(f"❌ Column '{column}' not found in the uploaded CSV.")
+    return columns
@@ -1,5 +1,7 @@
 // Track the current tree state
 let currentTree = null;
+// Upload ID (content hash) of the last tree CSV uploaded
+let currentUploadId = null;
 
 //////////////////////////////////////////////////////////////////////////////////////////////
 //                                   🔹 UTILITY FUNCTIONS 🔹                                //
@@ -222,8 +224,7 @@ function attachCreateTreeListener() {
 
         if (result) {
             alert(result.message);
-            document.getElementById("tree-visualization").innerHTML = 
-                `<pre style="white-space: pre-wrap;">${result.tree_structure || "No tree structure available"}</pre>`;
+            await updateTreeVisualization(treeName, workbookName);
         }
     });
 }
@@ -243,6 +244,7 @@ function attachCsvUploadListener() {
         try {
             const response = await fetch("http://127.0.0.1:8000/upload_csv/", { method: "POST", body: formData });
             const result = await response.json();
+            currentUploadId = result.upload_id;  // Content hash; process_csv builds from exactly this file
             alert(`File uploaded: ${result.filename}`);
         } catch (error) {
             console.error("❌ Error uploading file:", error);
@@ -260,12 +262,15 @@ function attachProcessCsvListener() {
             alert("⚠️ Please provide both tree name and workbook name.");
             return;
         }
+        if (!currentUploadId) {
+            alert("⚠️ Please upload a CSV file first.");
+            return;
+        }
 
-        const result = await sendPostRequest("http://127.0.0.1:8000/process_csv/", { tree_name: treeName, workbook_name: workbookName });
+        const result = await sendPostRequest("http://127.0.0.1:8000/process_csv/", { upload_id: currentUploadId, tree_name: treeName, workbook_name: workbookName });
         if (result) {
             alert(result.message);
-            document.getElementById("tree-visualization").innerHTML = 
-                `<pre style="white-space: pre-wrap;">${result.tree_structure || "No tree structure available"}</pre>`;
+            await updateTreeVisualization(treeName, workbookName);
         }
     });
 }
@@ -319,6 +324,203 @@ function attachPushTreeListener() {
     });
 }
 
+//////////////////////////////////////////////////////////////////////////////////////////////
+//                                   🔹 LAZY TREE VIEW 🔹                                   //
+//////////////////////////////////////////////////////////////////////////////////////////////
+
+const TREE_ROW_HEIGHT = 22;      // px; every row has the same height so rows can be positioned by index
+const TREE_OVERSCAN = 20;        // Rows rendered above and below the viewport
+const TREE_PAGE_SIZE = 200;      // Children fetched per expansion / "load more"
+
+/**
+ * Tree view that fetches children on demand and renders only the visible rows.
+ *
+ * `rows` is the flattened list of what is currently expanded: node rows
+ * ({ node, depth, expanded, loading }) and, after a partly loaded child list,
+ * a "more" row ({ more, parentPath, cursor, depth }).
+ */
+const treeView = {
+    treeName: null,
+    workbookName: null,
+    rows: [],
+    container: null,
+    viewport: null,
+    spacer: null,
+
+    /** Show a tree: load the root level and render it into #tree-visualization */
+    async open(treeName, workbookName) {
+        this.treeName = treeName;
+        this.workbookName = workbookName;
+        this.rows = [];
+        this.mount();
+
+        const page = await this.fetchChildren(null, null);
+        this.rows = this.pageRows(page, null, 1);
+        // Expand a single root straight away
+        if (this.rows.length === 1 && this.rows[0].node && this.rows[0].node.child_count > 0) {
+            await this.toggle(0);
+        }
+        this.render();
+    },
+
+    /** Replace the visualization panel content with a scrolling viewport */
+    mount() {
+        this.container = document.getElementById("tree-visualization");
+        this.container.innerHTML = "";
+        this.container.classList.add("tree-view");
+
+        this.viewport = document.createElement("div");
+        this.viewport.className = "tree-view-rows";
+        this.spacer = document.createElement("div");
+        this.spacer.className = "tree-view-spacer";
+        this.container.appendChild(this.spacer);
+        this.container.appendChild(this.viewport);
+
+        this.container.onscroll = () => window.requestAnimationFrame(() => this.render());
+        this.container.onclick = (event) => this.onClick(event);
+    },
+
+    async fetchChildren(path, cursor) {
+        const params = new URLSearchParams({
+            tree_name: this.treeName,
+            workbook_name: this.workbookName,
+            limit: TREE_PAGE_SIZE,
+        });
+        if (path) params.append("path", path);
+        if (cursor) params.append("cursor", cursor);
+
+        const response = await fetch(`http://127.0.0.1:8000/api/v1/asset_tree/children/?${params}`);
+        if (!response.ok) {
+            throw new Error(`Children request failed with status: ${response.status}`);
+        }
+        return await response.json();
+    },
+
+    /** Rows for one page of children, plus a "more" row if the page is not the last */
+    pageRows(page, parentPath, depth) {
+        const rows = page.children.map((node) => ({ node, depth, expanded: false, loading: false }));
+        if (page.next_cursor) {
+            rows.push({ more: true, parentPath, cursor: page.next_cursor, depth,
+                        remaining: page.child_count - rows.length });
+        }
+        return rows;
+    },
+
+    /** Expand or collapse the node row at `index` */
+    async toggle(index) {
+        const row = this.rows[index];
+        if (!row || !row.node || row.node.child_count === 0 || row.loading) return;
+
+        if (row.expanded) {
+            let end = index + 1;
+            while (end < this.rows.length && this.rows[end].depth > row.depth) end++;
+            this.rows.splice(index + 1, end - index - 1);
+            row.expanded = false;
+            this.render();
+            return;
+        }
+
+        row.loading = true;
+        this.render();
+        try {
+            const page = await this.fetchChildren(row.node.path, null);
+            // The rows may have shifted while waiting; find this row again
+            const at = this.rows.indexOf(row);
+            if (at >= 0) {
+                this.rows.splice(at + 1, 0, ...this.pageRows(page, row.node.path, row.depth + 1));
+                row.expanded = true;
+            }
+        } finally {
+            row.loading = false;
+            this.render();
+        }
+    },
+
+    /** Replace a "more" row with the next page of its siblings */
+    async loadMore(index) {
+        const row = this.rows[index];
+        if (!row || !row.more || row.loading) return;
+
+        row.loading = true;
+        this.render();
+        try {
+            const page = await this.fetchChildren(row.parentPath, row.cursor);
+            const at = this.rows.indexOf(row);
+            if (at >= 0) {
+                const more = this.pageRows(page, row.parentPath, row.depth);
+                if (more.length && more[more.length - 1].more) {
+                    more[more.length - 1].remaining = row.remaining - page.children.length;
+                }
+                this.rows.splice(at, 1, ...more);
+            }
+        } finally {
+            row.loading = false;
+            this.render();
+        }
+    },
+
+    /** Drop the loaded rows and show a message instead */
+    clear(message) {
+        this.rows = [];
+        if (this.container) {
+            this.container.onscroll = null;
+            this.container.onclick = null;
+            this.container.classList.remove("tree-view");
+        }
+        this.container = null;
+        document.getElementById("tree-visualization").innerHTML = `<p class="placeholder-message">${message}</p>`;
+    },
+
+    onClick(event) {
+        const element = event.target.closest(".tree-row");
+        if (!element) return;
+        const index = Number(element.dataset.index);
+        const action = this.rows[index] && this.rows[index].more ? this.loadMore(index) : this.toggle(index);
+        action.catch((error) => {
+            console.error("❌ Error expanding tree node:", error);
+            alert("⚠️ Failed to load tree nodes.");
+        });
+    },
+
+    /** Draw only the rows inside (or just around) the visible part of the panel */
+    render() {
+        if (!this.container) return;
+        this.spacer.style.height = `${this.rows.length * TREE_ROW_HEIGHT}px`;
+
+        const first = Math.max(0, Math.floor(this.container.scrollTop / TREE_ROW_HEIGHT) - TREE_OVERSCAN);
+        const visible = Math.ceil(this.container.clientHeight / TREE_ROW_HEIGHT) + 2 * TREE_OVERSCAN;
+        const last = Math.min(this.rows.length, first + visible);
+
+        const fragment = document.createDocumentFragment();
+        for (let index = first; index < last; index++) {
+            fragment.appendChild(this.rowElement(this.rows[index], index));
+        }
+        this.viewport.style.transform = `translateY(${first * TREE_ROW_HEIGHT}px)`;
+        this.viewport.replaceChildren(fragment);
+    },
+
+    rowElement(row, index) {
+        const element = document.createElement("div");
+        element.className = "tree-row";
+        element.dataset.index = index;
+        element.style.height = `${TREE_ROW_HEIGHT}px`;
+        element.style.paddingLeft = `${10 + (row.depth - 1) * 16}px`;
+
+        if (row.more) {
+            element.classList.add("tree-row-more");
+            element.textContent = row.loading ? "⏳ Loading..." : `▸ Load more (${row.remaining} remaining)`;
+            return element;
+        }
+
+        const { node } = row;
+        const toggle = node.child_count === 0 ? " " : row.loading ? "⏳" : row.expanded ? "▾" : "▸";
+        const count = node.child_count > 0 ? ` (${node.child_count})` : "";
+        element.textContent = `${toggle} ${node.name}${count}`;
+        element.title = `${node.path}${node.type ? ` [${node.type}]` : ""}`;
+        return element;
+    },
+};
+
 /** TREE VISUALIZATION */
 async function updateTreeVisualization(treeName, workbookName) {
     console.log(`📡 [DEBUG] updateTreeVisualization() CALLED for Tree: '${treeName}', Workbook: '${workbookName}'`);
@@ -331,19 +533,8 @@ async function updateTreeVisualization(treeName, workbookName) {
 
     try {
         loadingSpinner.style.display = "block";
-        // Force fresh response by adding timestamp
-        const timestamp = new Date().getTime();
-        const response = await fetch(`http://127.0.0.1:8000/visualize_tree/?tree_name=${treeName}&workbook_name=${workbookName}&_=${timestamp}`);
-
-        if (!response.ok) {
-            throw new Error(`Visualization request failed with status: ${response.status}`);
-        }
-
-        const result = await response.json();
-        console.log("✅ Latest Visualization:", result);
-
-        document.getElementById("tree-visualization").innerHTML = 
-            `<pre style="white-space: pre-wrap;">${result.tree_structure || "No tree available"}</pre>`;
+        await treeView.open(treeName, workbookName);
+        console.log(`✅ Showing tree '${treeName}' (${treeView.rows.length} rows loaded).`);
     } catch (error) {
         console.error("❌ Error updating tree visualization:", error);
         alert("⚠️ Failed to update tree visualization.");
@@ -404,22 +595,17 @@ function attachVisualizeTreeListener() {
 
     visualizeTreeButton.addEventListener("click", async () => {
         console.log("🚀 Visualize Tree button clicked!");
+        const treeName = document.getElementById("tree-name")?.value.trim();
+        const workbookName = document.getElementById("workbook-name")?.value.trim();
+
+        if (!treeName || !workbookName) {
+            alert("⚠️ Please provide both tree name and workbook name.");
+            return;
+        }
 
         try {
             loadingSpinner.style.display = "block";
-            const response = await fetch("http://127.0.0.1:8000/visualize_tree/");
-            if (!response.ok) throw new Error(`❌ Failed with status: ${response.status}`);
-
-            const result = await response.json();
-            console.log("✅ Visualization response received:", result);
-
-            const treeVisualizationElement = document.getElementById("tree-visualization");
-            if (treeVisualizationElement) {
-                treeVisualizationElement.innerHTML = 
-                    `<pre style="white-space: pre-wrap;">${result.tree_structure || "No tree available"}</pre>`;
-            } else {
-                console.warn("⚠️ 'tree-visualization' element not found in the DOM.");
-            }
+            await treeView.open(treeName, workbookName);
         } catch (error) {
             console.error("❌ Error visualizing tree:", error);
             alert("⚠️ Failed to visualize the tree. Check console for details.");
@@ -434,7 +620,7 @@ function attachVisualizeTreeListener() {
 function attachClearTreeListener() {
     document.getElementById("clear-tree").addEventListener("click", () => {
         console.log("Clear Tree button clicked.");
-        document.getElementById("tree-visualization").innerHTML = `<p class="placeholder-message">Tree visualization cleared.</p>`;
+        treeView.clear("Tree visualization cleared.");
     });
 }
 
@@ -503,13 +689,11 @@ function attachSearchTreeListener() {
 
         try {
             loadingSpinner.style.display = "block";
-            const response = await fetch(`http://127.0.0.1:8000/search_tree/?tree_name=${treeName}&workbook_name=${workbookName}`);
-            if (!response.ok) throw new Error(`❌ Search failed with status: ${response.status}`);
-            const result = await response.json();
-            document.getElementById("tree-visualization").innerHTML = 
-                `<pre style="white-space: pre-wrap;">${result.tree_structure || "Tree not found"}</pre>`;
+            // Only the top levels are fetched; deeper nodes load as they are expanded
+            await treeView.open(treeName, workbookName);
         } catch (error) {
             console.error("Error searching for tree:", error);
+            treeView.clear("Tree not found");
             alert("⚠️ Failed to search for tree.");
         } finally {
             // Hide spinner when request is complete
@@ -1127,16 +1311,8 @@ document.getElementById("push-lookup-btn").addEventListener("click", async () =>
         console.log("✅ Lookup Push Response:", result);
         alert(result.message);
 
-        // USE THE BACKEND VISUALIZATION DIRECTLY (from response)
-        if (result.tree_structure) {
-            console.log("📡 Using visualization directly from push_lookup response.");
-            document.getElementById("tree-visualization").innerHTML = 
-                `<pre style="white-space: pre-wrap;">${result.tree_structure}</pre>`;
-        } else {
-            // Fallback to updateTreeVisualization only if no structure is returned
-            console.warn("⚠️ No tree_structure returned from backend. Calling updateTreeVisualization...");
-            await updateTreeVisualization(treeName, workbookName);
-        }
+        // Reload the lazy view rather than rendering the whole tree_structure text
+        await updateTreeVisualization(treeName, workbookName);
 
     } catch (error) {
         console.error("Error pushing lookup data:", error);
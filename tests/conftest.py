@@ -5,6 +5,20 @@ import os
 from dotenv import load_dotenv
 from seeq import spy
 
+def pytest_configure(config):
+    """Register the markers used to separate offline unit tests from tests that need a Seeq server."""
+    config.addinivalue_line("markers", "unit: offline test of local logic; Seeq calls are mocked or not needed")
+    config.addinivalue_line("markers", "integration: test that talks to a Seeq server (skipped on CI)")
+
+def pytest_collection_modifyitems(config, items):
+    """Skip integration tests on CI, where there is no Seeq server to log into."""
+    if os.getenv("CI") != "true":
+        return
+    skip_integration = pytest.mark.skip(reason="needs a Seeq server; skipped on CI")
+    for item in items:
+        if "integration" in item.keywords:
+            item.add_marker(skip_integration)
+
 @pytest.fixture(scope="session", autouse=True)
 def seeq_login():
     """Automatically logs into Seeq for local tests or mocks it for CI."""
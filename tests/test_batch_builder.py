@@ -0,0 +1,29 @@
+import pytest
+from unittest.mock import patch
+from src.itv_asset_tree.core.batch_builder import BatchTreeBuilder
+
+PLANT_A = "Level 1,Level 2,Name\nPlant A,Reactor 1,Temperature\n,,Pressure\nPlant B,Reactor 1,Temperature\n"
+PLANT_C = "Level 1,Level 2,Name\nPlant C,Line 1,Speed\n"
+
+@pytest.mark.unit
+def test_batch_build_partitions_roots_across_files(tmp_path):
+    """Unit test: a directory of multi-root CSVs yields one compiled tree per root."""
+    (tmp_path / "site_1.csv").write_text(PLANT_A)
+    (tmp_path / "site_2.csv").write_text(PLANT_C)
+
+    built = {}
+
+    def fake_build_and_push(self, root, frame):
+        built[root] = frame
+        return {"tree": root, "rows": len(frame), "status": "built"}
+
+    batch_builder = BatchTreeBuilder("Test Workbook", max_workers=1, max_concurrent_pushes=2, push=False)
+    with patch.object(BatchTreeBuilder, "build_and_push", fake_build_and_push):
+        results = batch_builder.build(str(tmp_path))
+
+    assert [result["tree"] for result in results] == ["Plant A", "Plant B", "Plant C"]
+    plant_a = built["Plant A"]
+    assert "Level 1" not in plant_a.columns
+    leaves = plant_a[plant_a["Type"].isna()]
+    assert leaves["Path"].tolist() == ["Plant A >> Reactor 1", "Plant A >> Reactor 1"]
+    print("✅ Multi-root CSVs partitioned and compiled per tree.")
@@ -0,0 +1,61 @@
+import pandas as pd
+import pytest
+from seeq.spy.assets import Tree
+from src.itv_asset_tree.core.bulk_insert import insert_items, item_definitions, parse_formula_parameters
+
+def plant_tree():
+    return Tree(pd.DataFrame({"Path": ["", "Plant"], "Name": ["Plant", "Area"], "Type": ["Asset", "Asset"]}), quiet=True)
+
+INSERTIONS = pd.DataFrame({
+    "Parent Path": ["Plant >> Area", "Plant >> Area", " Plant", "Plant >> Unit"],
+    "Name": ["Temp", "Ratio", "Unit ", "Flow"],
+    "Formula": ["sinusoid()", "$t * 2", None, "sinusoid()"],
+    "Formula Parameters": ["", "{'$t': 'Temp'}", None, '{"$x": "Plant >> Area >> Temp"}'],
+})
+
+@pytest.mark.unit
+def test_bulk_insert_matches_row_by_row_insert():
+    """Unit test: one insert per level gives the same tree as inserting each row under its parent."""
+    bulk = plant_tree()
+    calls = insert_items(bulk, item_definitions(INSERTIONS))
+
+    row_by_row = plant_tree()
+    for _, row in INSERTIONS.iterrows():
+        child = {"Name": row["Name"].strip()}
+        if row["Formula"]:
+            child.update({"Formula": row["Formula"], "Formula Parameters": parse_formula_parameters(
+                pd.Series([row["Formula Parameters"]]))[0]})
+        row_by_row.insert(children=[child], parent=row["Parent Path"].strip(), quiet=True)
+
+    assert calls == 2  # "Flow" waits for "Unit", which the same file creates
+    columns = ["Path", "Name", "Type", "Formula", "Formula Parameters"]
+    pd.testing.assert_frame_equal(bulk.df[columns], row_by_row.df[columns])
+    print("✅ Bulk insert matches row-by-row inserts.")
+
+@pytest.mark.unit
+def test_children_listed_before_their_parents_wait_for_them():
+    """Unit test: a row whose parent is created further down the file is inserted after that parent."""
+    reordered = INSERTIONS.iloc[[3, 0, 1, 2]]  # "Flow" comes before "Unit", which creates its parent
+    bulk = plant_tree()
+    calls = insert_items(bulk, item_definitions(reordered))
+
+    in_order = plant_tree()
+    insert_items(in_order, item_definitions(INSERTIONS))
+
+    assert calls == 2
+    columns = ["Path", "Name", "Type", "Formula"]
+    pd.testing.assert_frame_equal(bulk.df[columns].sort_values(["Path", "Name"], ignore_index=True),
+                                  in_order.df[columns].sort_values(["Path", "Name"], ignore_index=True))
+    assert bulk.df.set_index("Name").loc["Flow", "Path"] == "Plant >> Unit"
+    print("✅ Children listed before their parents are inserted after them.")
+
+@pytest.mark.unit
+def test_formula_parameters_parsed_without_eval():
+    """Unit test: JSON and Python-literal parameters parse once per value; code is rejected."""
+    parsed = parse_formula_parameters(pd.Series(['{"$a": "A"}', "{'$a': 'A'}", " ", None, '{"$a": "A"}']))
+    assert parsed.tolist() == [{"$a": "A"}, {"$a": "A"}, {}, {}, {"$a": "A"}]
+    with pytest.raises(ValueError):
+        parse_formula_parameters(pd.Series(["__import__('os').getcwd()"]))
+    with pytest.raises(ValueError):
+        item_definitions(pd.DataFrame({"Parent Path": [None], "Name": ["Orphan"]}))
+    print("✅ Formula parameters parsed safely.")
@@ -0,0 +1,104 @@
+import os
+import pandas as pd
+import pytest
+from unittest.mock import patch
+from seeq.spy.assets import Tree
+from src.itv_asset_tree.core.chunked_push import AdaptiveChunkSizer
+from src.itv_asset_tree.core.push_manager import PushManager
+from src.itv_asset_tree.config import settings
+
+def unpushed_tree():
+    tree = Tree(pd.DataFrame({
+        "Path": ["", "Plant", "Plant >> Area", "Plant >> Area"],
+        "Name": ["Plant", "Area", "T1", "T2"],
+        "Type": ["Asset", "Asset", "Signal", "Signal"],
+        "Formula": [None, None, "sinusoid()", "sinusoid()"],
+    }), quiet=True)
+    tree.insert(children=[{"Name": "Delta", "Formula": "$a - $b", "Formula Parameters": {"$a": "T1", "$b": "T2"}}],
+                parent="Plant >> Area", quiet=True)
+    return tree
+
+@pytest.mark.unit
+def test_chunked_push_resumes_from_checkpoint(tmp_path):
+    """Unit test: a push interrupted mid-way resumes after the last checkpointed chunk."""
+    calls, frames = [], []
+
+    def flaky_push(metadata, **kwargs):
+        calls.append(list(metadata["Name"]))
+        frames.append(metadata)
+        if len(calls) == 2:
+            raise ConnectionError("gateway timeout")
+        return metadata.assign(**{"ID": [f"ID-{name}" for name in metadata["Name"]], "Push Result": "Success"})
+
+    overrides = {"PUSH_STATE_DIR": str(tmp_path / "state"), "PUSH_THROUGHPUT_LOG": str(tmp_path / "throughput.json"),
+                 "PUSH_CHUNK_THRESHOLD": 1, "PUSH_CHUNK_SIZE": 2, "PUSH_CHUNK_MIN": 1, "PUSH_CHUNK_MAX": 2,
+                 "PUSH_CHUNK_RETRIES": 0}
+    tree = unpushed_tree()
+    with patch.multiple(settings, **overrides), \
+         patch("src.itv_asset_tree.core.chunked_push.spy.push", side_effect=flaky_push), \
+         patch("src.itv_asset_tree.core.chunked_push.spy.search", return_value=pd.DataFrame()), \
+         patch.object(Tree, "_push_workbook"):
+        manager = PushManager(tree)
+        with pytest.raises(RuntimeError, match="resume"):
+            manager.push_full()
+        state_file, checkpoint_file = manager.state_files()
+        assert (tmp_path / "state").exists() and state_file.startswith(str(tmp_path / "state"))
+
+        result = PushManager(tree).push_full()
+
+    # Parents first, the calculation after what it references; chunk 2 failed and was resumed
+    assert calls[0] == ["Plant", "Area"]
+    assert calls[1] == calls[2] == ["T1", "T2"]
+    assert calls[3] == ["Delta"]
+    assert frames[3]["Formula Parameters"].iloc[0] == {"$a": "ID-T1", "$b": "ID-T2"}  # Earlier chunks by ID
+    assert result["resumed"] is True and result["pushed"] == 5
+    assert tree.df["ID"].notna().all()
+    assert list(tmp_path.glob("state/*.checkpoint.*")) == []  # Checkpoint cleared once done
+    print("✅ Chunked push resumed from its checkpoint.")
+
+@pytest.mark.unit
+def test_rebuilt_tree_archives_stale_items_and_drops_state_file(tmp_path):
+    """Unit test: a chunked push without a baseline creates the workbook, archives what Seeq has beyond the tree, and pushes chunks without the state file."""
+    events, state_files, archived = [], [], []
+
+    def push(metadata, metadata_state_file=None, **kwargs):
+        if "Archived" in metadata.columns:  # SPy archives by pushing IDs with Archived set
+            archived.extend(metadata.loc[metadata["Archived"], "ID"])
+            return metadata.assign(**{"Push Result": "Success"})
+        events.append("push")
+        state_files.append(metadata_state_file)
+        return metadata.assign(**{"ID": [f"ID-{name}" for name in metadata["Name"]], "Push Result": "Success"})
+
+    in_seeq = pd.DataFrame({"ID": ["OLD-AREA", "OLD-T1", "OLD-GONE"], "Path": ["Plant", "Plant >> Area", "Plant >> AREA"],
+                            "Name": ["Area", "t1", "Gone"], "Type": ["Asset", "StoredSignal", "CalculatedSignal"]})
+    overrides = {"PUSH_STATE_DIR": str(tmp_path / "state"), "PUSH_THROUGHPUT_LOG": str(tmp_path / "throughput.json"),
+                 "PUSH_CHUNK_THRESHOLD": 1, "PUSH_CHUNK_SIZE": 2, "PUSH_CHUNK_MIN": 1, "PUSH_CHUNK_MAX": 2}
+    tree = unpushed_tree()
+    with patch.multiple(settings, **overrides), \
+         patch("src.itv_asset_tree.core.chunked_push.spy.push", side_effect=push), \
+         patch("src.itv_asset_tree.core.chunked_push.spy.search", return_value=in_seeq) as search, \
+         patch.object(Tree, "_push_workbook", side_effect=lambda: events.append("workbook")):
+        manager = PushManager(tree)
+        state_file = manager.state_files()[0]
+        open(state_file, "wb").close()  # Left by an earlier whole-tree push
+        result = manager.push_full()
+
+    assert events[0] == "workbook" and events.count("push") == 3
+    assert search.call_args.args[0] == {"Path": "Plant"}
+    assert archived == ["OLD-GONE"] and result["archived"] == 1
+    assert state_files == [None] * 3 and not os.path.exists(state_file)
+    print("✅ Rebuilt tree pushed in chunks archives stale items.")
+
+@pytest.mark.unit
+def test_adaptive_chunk_size_follows_latency():
+    """Unit test: chunk size moves towards the target duration, at most halving or doubling."""
+    sizer = AdaptiveChunkSizer(initial=1000, minimum=100, maximum=10_000, target_seconds=10)
+    sizer.observe(1000, 2)  # 500 items/s -> ideal 5000, capped at double
+    assert sizer.size == 2000
+    sizer.observe(2000, 40)  # 50 items/s -> ideal 500, floored at half
+    assert sizer.size == 1000
+    sizer.observe(1000, 10)
+    assert sizer.size == 1000
+    sizer.shrink()
+    assert sizer.size == 500
+    print("✅ Chunk size adapts to latency.")
@@ -0,0 +1,48 @@
+import pytest
+import pandas as pd
+from unittest.mock import patch
+from src.itv_asset_tree.utils import csv_ingest
+from src.itv_asset_tree.utils.csv_ingest import read_csv_fast
+
+REFERENCE_CSV = "﻿Equipment_Desc,PLC_Tag_Value,Reason_Desc\nSlitter,1,Running\nSlitter,2,Stopped\nCase Packer,1,Running\n"
+
+@pytest.mark.unit
+def test_read_csv_fast_applies_and_caches_dtype_profile(tmp_path):
+    """Unit test: categorical/integer profile is inferred once per CSV layout and reused."""
+    csv_file = tmp_path / "reference.csv"
+    csv_file.write_text(REFERENCE_CSV, encoding="utf-8")
+
+    with patch.object(csv_ingest, "PROFILE_CACHE_FILE", str(tmp_path / "profiles.json")), \
+         patch.object(csv_ingest, "_profiles", {}), \
+         patch.object(csv_ingest, "_profiles_loaded", False):
+        data = read_csv_fast(str(csv_file), engine="c")
+        assert str(data["Equipment_Desc"].dtype) == "category"
+        assert str(data["PLC_Tag_Value"].dtype) == "Int64"
+        assert data["Reason_Desc"].tolist() == ["Running", "Stopped", "Running"]
+
+        with patch.object(csv_ingest, "infer_dtype_profile") as mock_infer:
+            read_csv_fast(str(csv_file), engine="c")
+            mock_infer.assert_not_called()
+
+        tree_data = read_csv_fast(str(csv_file), engine="c", text_columns_only=True)
+        assert tree_data["PLC_Tag_Value"].tolist() == ["1", "2", "1"]
+
+    assert (tmp_path / "profiles.json").exists()
+    print("✅ Dtype profile applied and cached.")
+
+@pytest.mark.unit
+@pytest.mark.skipif(not csv_ingest._PYARROW_AVAILABLE, reason="pyarrow not installed")
+def test_pyarrow_engine_reads_text_like_c_engine(tmp_path):
+    """Unit test: with pyarrow, text columns keep their exact text and blanks stay NaN, as with the C engine."""
+    csv_file = tmp_path / "reference.csv"
+    csv_file.write_text("Equipment_Desc,PLC_Tag_Value,Reason_Desc\nZ,1,\nA,2,007\n,3,1.50\n", encoding="utf-8")
+
+    with patch.object(csv_ingest, "PROFILE_CACHE_FILE", str(tmp_path / "profiles.json")), \
+         patch.object(csv_ingest, "_profiles", {}), \
+         patch.object(csv_ingest, "_profiles_loaded", False):
+        fast = read_csv_fast(str(csv_file), engine="pyarrow")
+        reference = read_csv_fast(str(csv_file), engine="c")
+
+    pd.testing.assert_frame_equal(fast, reference)
+    assert fast["Reason_Desc"].tolist()[1:] == ["007", "1.50"]
+    print("✅ pyarrow engine matches the C engine.")
@@ -0,0 +1,95 @@
+import csv
+import json
+import numpy as np
+import pandas as pd
+import pytest
+from unittest.mock import MagicMock, patch
+from seeq.spy.assets import Tree
+from src.itv_asset_tree.api import csv_lookup_generator as lookups
+from src.itv_asset_tree.utils.lookup_builder import SHARED_LOOKUP_PARAMETER, LookupTableBuilder
+
+def loop_build(builder, data):
+    """The original groupby + iterrows implementation, as the reference."""
+    return {group_name: [[str(row[builder.key_column]), str(row[builder.value_column])] for _, row in group.iterrows()]
+            for group_name, group in data.groupby(builder.group_column, observed=True)}
+
+@pytest.mark.unit
+@pytest.mark.parametrize("data", [
+    pd.DataFrame({"Tag": ["B", "A", None, "B", "A"], "Code": [3, 1, 2, 1, 2], "Text": ["Fault", "Idle", "x", np.nan, "Run"]}),
+    pd.DataFrame({"Tag": [2, 1, 2], "Code": [10, 11, 12], "Text": [0.5, 1.0, np.nan]}),  # Rows upcast ints to float
+    pd.DataFrame({"Tag": pd.Categorical(["z", "a", "z"], categories=["z", "a", "unused"]),
+                  "Code": pd.to_datetime(["2024-01-01", "2024-01-02", "2024-01-03"]),
+                  "Text": pd.array([1, None, 3], dtype="Int64")}),
+    pd.DataFrame({"Tag": pd.Series([], dtype=object), "Code": [], "Text": []}),
+])
+def test_vectorized_build_matches_row_loop(data):
+    """Unit test: the vectorized build gives the same tables, group order and cell text as the row loop."""
+    builder = LookupTableBuilder("Tag", "Code", "Text")
+    expected = loop_build(builder, data)
+    result = builder.build(data)
+    assert result == expected and list(result) == list(expected)
+    print("✅ Vectorized lookup tables match the row loop.")
+
+@pytest.mark.unit
+def test_identical_tables_share_one_lookup_string(tmp_path):
+    """Unit test: with dedupe, groups repeating an earlier table reference its lookup string instead."""
+    tables = {"Case Packer": [["1", "Running"]], "Slitter": [["1", "Running"], ["2", "Stopped"]],
+              "Wrapper": [["1", "Running"]]}
+    output = tmp_path / "lookup.csv"
+    written = LookupTableBuilder.save_lookup_to_csv(tables, {"Case Packer": "Plant >> Line 1"}, str(output), dedupe=True)
+
+    rows = {row["Name"]: row for row in csv.DictReader(output.open(newline="", encoding="utf-8"))}
+    assert written == 3
+    assert rows["Case_Packer_LookupString"]["Formula"] == '"[["1", "Running"]]"'
+    assert rows["Slitter_LookupString"]["Formula Parameters"] == "{}"
+    assert rows["Wrapper_LookupString"]["Formula"] == SHARED_LOOKUP_PARAMETER
+    assert json.loads(rows["Wrapper_LookupString"]["Formula Parameters"]) == \
+        {SHARED_LOOKUP_PARAMETER: "Plant >> Line 1 >> Case_Packer_LookupString"}
+    print("✅ Identical lookup tables deduplicated.")
+
+@pytest.mark.unit
+def test_shared_lookup_reference_resolved_to_full_path(tmp_path):
+    """Unit test: a shared-table reference under a partial parent path is pushed with the string's real full path, or as its own table when ambiguous."""
+    def push(first_parent):
+        tree = Tree(pd.DataFrame({"Path": ["", "Plant", "Plant"], "Name": ["Plant", "Area 1", "Area 2"],
+                                  "Type": ["Asset"] * 3}), quiet=True)
+        lookup_file = tmp_path / "lookup_output.csv"
+        pd.DataFrame({
+            "Name": ["A_LookupString", "B_LookupString"],
+            "Formula": ["[['1', 'Running']]", SHARED_LOOKUP_PARAMETER],
+            "Formula Parameters": ["{}", json.dumps({SHARED_LOOKUP_PARAMETER: f"{first_parent} >> A_LookupString"})],
+            "Parent Path": [first_parent, "Plant >> Area 2"],
+        }).to_csv(lookup_file, index=False)
+        with patch.object(lookups, "TreeModifier", return_value=MagicMock(tree=tree)), \
+             patch.object(lookups, "push_state_path", return_value=str(tmp_path / "pushed.json")):
+            lookups._push_lookup_file(str(lookup_file), "Plant", "WB")
+        return tree.df.set_index(tree.df["Path"] + " >> " + tree.df["Name"])
+
+    pushed = push("Area 1")  # Tree.insert accepts the partial path
+    reference = pushed.loc["Plant >> Area 2 >> B_LookupString"]
+    assert reference["Formula"] == SHARED_LOOKUP_PARAMETER
+    assert reference["Formula Parameters"] == {SHARED_LOOKUP_PARAMETER: "Plant >> Area 1 >> A_LookupString"}
+
+    pushed = push("Area *")  # Lands under both areas: no single item to reference
+    assert pushed.loc["Plant >> Area 2 >> B_LookupString", "Formula"] == "\"[['1', 'Running']]\""
+    print("✅ Shared lookup references resolved against the tree.")
+
+@pytest.mark.unit
+def test_malformed_lookup_file_is_a_bad_request(tmp_path):
+    """Unit test: the push job raises ValueError for unparsable parameters, and push_lookup answers 400."""
+    import asyncio
+    from fastapi import HTTPException
+    from src.itv_asset_tree.core.push_jobs import PushJobQueue
+
+    pd.DataFrame({"Name": ["A_LookupString"], "Formula": ["$x"], "Formula Parameters": ["{not parameters"],
+                  "Parent Path": ["Plant"]}).to_csv(tmp_path / "lookup_output.csv", index=False)
+    queue = PushJobQueue(interactive_workers=1)
+    with patch.object(lookups, "UPLOAD_DIR", str(tmp_path)), patch.object(lookups, "push_jobs", queue), \
+         patch.object(lookups, "push_state_path", return_value=str(tmp_path / "pushed.json")):
+        with pytest.raises(ValueError):
+            lookups._push_lookup_file(str(tmp_path / "lookup_output.csv"), "Plant", "WB")
+        with pytest.raises(HTTPException) as rejected:
+            asyncio.run(lookups.push_lookup(tree_name="Plant", workbook_name="WB", background=False, incremental=False))
+    queue.shutdown()
+    assert rejected.value.status_code == 400 and "Formula Parameters" in rejected.value.detail
+    print("✅ Malformed lookup files are rejected with 400.")
@@ -0,0 +1,101 @@
+import asyncio
+import csv
+import json
+import pandas as pd
+import pytest
+from unittest.mock import MagicMock, patch
+from src.itv_asset_tree.utils import csv_ingest
+from src.itv_asset_tree.api import csv_lookup_generator as lookups
+from src.itv_asset_tree.utils.lookup_builder import LookupTableBuilder
+from src.itv_asset_tree.utils.lookup_fingerprints import LookupFingerprints, fingerprint_file
+
+def generate(tables, output):
+    fingerprints = LookupFingerprints.load(fingerprint_file(str(output), "test"), skip_unchanged=False)
+    LookupTableBuilder.save_lookup_to_csv(tables, {}, str(output), fingerprints)
+    fingerprints.save(fingerprint_file(str(output), "test"))
+    with open(output, newline="", encoding="utf-8") as f:
+        return [row["Name"] for row in csv.DictReader(f)], fingerprints.report()
+
+@pytest.mark.unit
+def test_generation_writes_every_group_and_reports_changes(tmp_path):
+    """Unit test: a rerun still writes every lookup string, and reports which changed since the last one."""
+    output = tmp_path / "lookup_output.csv"
+    tables = {"Case Packer": [["1", "Running"]], "Slitter": [["1", "Running"], ["2", "Stopped"]], "Wrapper": [["1", "Idle"]]}
+
+    names, report = generate(tables, output)
+    assert names == ["Case_Packer_LookupString", "Slitter_LookupString", "Wrapper_LookupString"]
+    assert len(report["changed"]) == 3 and (tmp_path / "lookup_output.test.fingerprints.json").exists()
+
+    tables["Slitter"].append(["3", "Blocked"])
+    del tables["Wrapper"]
+    names, report = generate(tables, output)
+    assert names == ["Case_Packer_LookupString", "Slitter_LookupString"]
+    assert report == {"changed": ["Slitter_LookupString"], "unchanged": ["Case_Packer_LookupString"],
+                      "skipped": [], "removed": ["Wrapper_LookupString"]}
+    print("✅ Lookup file complete, changes reported.")
+
+@pytest.mark.unit
+def test_partial_push_keeps_earlier_fingerprints(tmp_path):
+    """Unit test: saving after a push of some lookup strings keeps the fingerprints of the others."""
+    pushed = tmp_path / "pushed.json"
+    first = LookupFingerprints()
+    for name in ("A_LookupString", "B_LookupString"):
+        first.keep({"Name": name, "Formula": "x", "Parent Path": "Plant"})
+    first.save(str(pushed))
+
+    second = LookupFingerprints.load(str(pushed))
+    assert second.keep({"Name": "B_LookupString", "Formula": "y", "Parent Path": "Plant"})
+    assert not second.keep({"Name": "A_LookupString", "Formula": "x", "Parent Path": "Plant"})
+    second.save(str(pushed), keep_previous=True)
+
+    saved = json.loads(pushed.read_text(encoding="utf-8"))
+    assert set(saved) == {"A_LookupString", "B_LookupString"} and saved["B_LookupString"] == second.current["B_LookupString"]
+    print("✅ Pushed fingerprints merged.")
+
+@pytest.mark.unit
+def test_only_push_skips_and_only_after_a_successful_push(tmp_path):
+    """Unit test: rerun stages keep the whole file; pushes skip per tree, and a failed push skips nothing next time."""
+    (tmp_path / "resolved_data.csv").write_text(
+        "Equipment_Desc,PLC_Tag_Value,Reason_Desc\nSlitter,1,Running\nSlitter,2,Stopped\nWrapper,1,Idle\n",
+        encoding="utf-8")
+    request = lookups.ParentPathsRequest(
+        parent_paths={"Slitter_LookupString": "Plant >> Line 1"}, group_column="Equipment_Desc",
+        key_column="PLC_Tag_Value", value_column="Reason_Desc")
+
+    def run_both_stages():
+        generated = asyncio.run(lookups.generate_lookup(
+            "Equipment_Desc", "PLC_Tag_Value", "Reason_Desc", "lookup_output.csv", streaming=False))
+        assigned = asyncio.run(lookups.set_parent_paths(request))
+        return generated["lookup_strings"], assigned["lookup_strings"]
+
+    inserted = []
+
+    def push(tree_name, fail=False):
+        def insert(tree, items):
+            if fail:
+                raise RuntimeError("Seeq unavailable")
+            inserted.append(sorted(items["Name"]))
+        with patch.object(lookups, "insert_items", side_effect=insert):
+            try:
+                return lookups._push_lookup_file(str(tmp_path / "lookup_output.csv"), tree_name, "WB", incremental=True)
+            except RuntimeError:
+                return None
+
+    with patch.object(lookups, "UPLOAD_DIR", str(tmp_path)), \
+         patch.object(csv_ingest, "PROFILE_CACHE_FILE", str(tmp_path / "profiles.json")), \
+         patch.object(lookups, "push_state_path", lambda workbook, tree, suffix: str(tmp_path / f"{tree}.{suffix}")), \
+         patch.object(lookups, "TreeModifier", return_value=MagicMock()), \
+         patch.object(lookups, "render_text", return_value=""):
+        first = run_both_stages()
+        assert push("Tree A", fail=True) is None
+        second = run_both_stages()
+        push("Tree A")  # The failed push recorded nothing, so everything goes
+        push("Tree B")  # Another tree gets the full set too
+        third = push("Tree A")
+
+    assert all(len(report["changed"]) == 2 for report in first)
+    assert all(report["changed"] == [] and len(report["unchanged"]) == 2 and report["skipped"] == [] for report in second)
+    assert pd.read_csv(tmp_path / "lookup_output.csv")["Name"].tolist() == ["Slitter_LookupString", "Wrapper_LookupString"]
+    assert inserted == [["Slitter_LookupString", "Wrapper_LookupString"]] * 2
+    assert "pushed" not in third and len(third["skipped"]) == 2
+    print("✅ Unchanged lookup strings are skipped only by pushes to a tree that has them.")
@@ -0,0 +1,62 @@
+import csv
+import pytest
+from unittest.mock import patch
+from src.itv_asset_tree.utils import csv_ingest
+from src.itv_asset_tree.utils import lookup_stream
+from src.itv_asset_tree.utils.csv_parser import CSVHandler
+from src.itv_asset_tree.utils.lookup_builder import LookupTableBuilder
+
+def write_reference(path, late_text_code=False):
+    rows = [(f"Line {n % 7}", n, f"Reason, {n}" if n % 5 else "") for n in range(1, 1500)]
+    rows[3] = ("", 4, "no group")  # Dropped, as in the in-memory build
+    if late_text_code:
+        rows[-1] = ("Line 1", "A7", "past the sampled rows")  # Breaks the inferred integer column
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Equipment_Desc", "PLC_Tag_Value", "Reason_Desc"])
+        writer.writerows(rows)
+
+def read_lookup(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return sorted(map(tuple, csv.reader(f)))
+
+@pytest.mark.unit
+@pytest.mark.parametrize("late_text_code", [False, True])
+def test_streamed_lookup_matches_in_memory(tmp_path, late_text_code):
+    """Unit test: spilled, re-split partitions give the same lookup rows as loading the whole file."""
+    reference = tmp_path / "resolved_data.csv"
+    write_reference(reference, late_text_code)
+
+    with patch.object(csv_ingest, "PROFILE_CACHE_FILE", str(tmp_path / "profiles.json")), \
+         patch.object(csv_ingest, "_profiles", {}), \
+         patch.object(csv_ingest, "_profiles_loaded", False), \
+         patch.multiple(lookup_stream.settings, LOOKUP_SPILL_MAX_BYTES=4096):
+        written = lookup_stream.stream_lookup_to_csv(
+            str(reference), str(tmp_path / "streamed.csv"), "Equipment_Desc", "PLC_Tag_Value", "Reason_Desc",
+            chunk_rows=100, partitions=3, spill_dir=str(tmp_path))
+
+        builder = LookupTableBuilder("Equipment_Desc", "PLC_Tag_Value", "Reason_Desc")
+        builder.save_lookup_to_csv(builder.build(CSVHandler(str(reference)).load_csv()), {}, str(tmp_path / "loaded.csv"))
+
+    assert written == 7
+    assert read_lookup(tmp_path / "streamed.csv") == read_lookup(tmp_path / "loaded.csv")
+    assert not list(tmp_path.glob("lookup-spill-*"))  # Spill files are cleaned up
+    print("✅ Streamed lookup matches the in-memory build.")
+
+@pytest.mark.unit
+def test_generate_lookup_sets_the_same_parent_paths_streamed_or_not(tmp_path):
+    """Unit test: both generate_lookup paths write the placeholder Parent Path that set_parent_paths fills in."""
+    import asyncio
+    from src.itv_asset_tree.api import csv_lookup_generator as lookups
+
+    write_reference(tmp_path / "resolved_data.csv")
+    with patch.object(lookups, "UPLOAD_DIR", str(tmp_path)), \
+         patch.object(csv_ingest, "PROFILE_CACHE_FILE", str(tmp_path / "profiles.json")):
+        for name, streaming in (("streamed.csv", True), ("loaded.csv", False)):
+            asyncio.run(lookups.generate_lookup("Equipment_Desc", "PLC_Tag_Value", "Reason_Desc", name,
+                                                streaming=streaming))
+
+    streamed = read_lookup(tmp_path / "streamed.csv")
+    assert streamed == read_lookup(tmp_path / "loaded.csv")
+    assert {row[3] for row in streamed if row[0] != "Name"} == {lookups.PARENT_PATH_PLACEHOLDER}
+    print("✅ Streamed and in-memory lookups get the same Parent Paths.")
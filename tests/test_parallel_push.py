@@ -0,0 +1,82 @@
+import threading
+import pandas as pd
+import pytest
+from unittest.mock import patch
+from seeq.spy.assets import Tree
+from src.itv_asset_tree.core.parallel_push import split_branches
+from src.itv_asset_tree.core.push_manager import PushManager
+from src.itv_asset_tree.config import settings
+
+def plant_tree():
+    tree = Tree(pd.DataFrame({
+        "Path": ["", "Plant", "Plant", "Plant", "Plant >> Reactor A", "Plant >> Reactor B", "Plant >> Line C"],
+        "Name": ["Plant", "Reactor A", "Reactor B", "Line C", "Temp", "Temp", "Flow"],
+        "Type": ["Asset", "Asset", "Asset", "Asset", "Signal", "Signal", "Signal"],
+        "Formula": [None, None, None, None, "sinusoid()", "sinusoid()", "sinusoid()"],
+    }), quiet=True)
+    # Line C reads Reactor A's temperature, so those two branches are not independent
+    tree.insert(children=[{"Name": "Ratio", "Formula": "$f / $t",
+                           "Formula Parameters": {"$f": "Flow", "$t": "Plant >> Reactor A >> Temp"}}],
+                parent="Plant >> Line C", quiet=True)
+    return tree
+
+@pytest.mark.unit
+def test_push_subtrees_pushes_root_then_branches_concurrently(tmp_path):
+    """Unit test: the root goes first, independent branches are pushed on worker threads and merged back."""
+    calls, archived = [], []
+
+    def fake_push(metadata, **kwargs):
+        if "Archived" in metadata.columns:  # SPy archives by pushing IDs with Archived set
+            archived.extend(metadata.loc[metadata["Archived"], "ID"])
+            return metadata.assign(**{"Push Result": "Success"})
+        calls.append((threading.current_thread().name, sorted(metadata["Name"])))
+        return metadata.assign(**{"ID": [f"ID-{label}" for label in metadata.index], "Push Result": "Success"})
+
+    in_seeq = pd.DataFrame({"ID": ["OLD-A", "OLD-D"], "Path": ["Plant", "Plant"], "Name": ["Reactor A", "Reactor D"]})
+    tree = plant_tree()
+    with patch.multiple(settings, PUSH_STATE_DIR=str(tmp_path / "state"), PUSH_THROUGHPUT_LOG=str(tmp_path / "t.json")), \
+         patch("src.itv_asset_tree.core.chunked_push.spy.push", side_effect=fake_push), \
+         patch("src.itv_asset_tree.core.chunked_push.spy.search", return_value=in_seeq), \
+         patch.object(Tree, "_push_workbook", side_effect=lambda: calls.append("workbook")):
+        result = PushManager(tree).push(parallel_depth=2)["result"]
+
+    assert calls.pop(0) == "workbook"  # Created before anything is pushed
+    assert archived == ["OLD-D"] and result["archived"] == 1  # Rebuilt without Reactor D
+    assert calls[0] == (threading.current_thread().name, ["Plant"])
+    branch_calls = sorted(names for _, names in calls[1:])
+    assert branch_calls == [["Flow", "Line C", "Ratio", "Reactor A", "Temp"], ["Reactor B", "Temp"]]
+    assert all(thread.startswith("subtree-push") for thread, _ in calls[1:])
+    assert result["branches"] == 2 and result["pushed"] == len(tree.df)
+    assert tree.df["ID"].notna().all()
+    print("✅ Subtrees pushed in parallel after the root.")
+
+@pytest.mark.unit
+def test_split_branches_rejects_root_depth():
+    """Unit test: the root cannot be split off from itself."""
+    with pytest.raises(ValueError):
+        split_branches(plant_tree().df, depth=1)
+    print("✅ Split depth validated.")
+
+@pytest.mark.unit
+def test_root_formula_reading_a_branch_is_pushed_with_that_branch(tmp_path):
+    """Unit test: a root-part calculation referencing a branch signal is pushed after that signal."""
+    frames = []
+
+    def fake_push(metadata, **kwargs):
+        frames.append(list(zip(metadata["Path"], metadata["Name"])))
+        return metadata.assign(**{"ID": [f"ID-{label}" for label in metadata.index], "Push Result": "Success"})
+
+    tree = plant_tree()
+    tree.insert(children=[{"Name": "Avg", "Formula": "$a", "Formula Parameters": {"$a": "Plant >> Reactor A >> Temp"}}],
+                parent="Plant", quiet=True)
+    with patch.multiple(settings, PUSH_STATE_DIR=str(tmp_path / "state"), PUSH_THROUGHPUT_LOG=str(tmp_path / "t.json")), \
+         patch("src.itv_asset_tree.core.chunked_push.spy.push", side_effect=fake_push), \
+         patch("src.itv_asset_tree.core.chunked_push.spy.search", return_value=pd.DataFrame()), \
+         patch.object(Tree, "_push_workbook"):
+        PushManager(tree).push(parallel_depth=3)
+
+    assert ("Plant", "Avg") not in frames[0]
+    with_avg = next(frame for frame in frames if ("Plant", "Avg") in frame)
+    assert with_avg.index(("Plant >> Reactor A", "Temp")) < with_avg.index(("Plant", "Avg"))
+    assert tree.df["ID"].notna().all()
+    print("✅ Root formulas wait for the branches they read.")
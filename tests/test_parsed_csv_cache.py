@@ -0,0 +1,26 @@
+import pytest
+from unittest.mock import patch
+from src.itv_asset_tree.utils.parsed_csv_cache import ParsedCSVCache
+
+CSV_CONTENT = "Level 1,Level 2,Name\nPlant,Reactor 1,Temperature\n,,Pressure\n"
+
+@pytest.mark.unit
+def test_csv_is_parsed_once_per_content(tmp_path):
+    """Unit test: identical content is parsed once and served from memory/sidecar afterwards."""
+    csv_file = tmp_path / "tree.csv"
+    csv_file.write_text(CSV_CONTENT)
+    copy_file = tmp_path / "tree_copy.csv"
+    copy_file.write_text(CSV_CONTENT)
+
+    cache = ParsedCSVCache(cache_dir=str(tmp_path / "parsed"))
+    first = cache.get(str(csv_file))
+
+    with patch("src.itv_asset_tree.utils.parsed_csv_cache.read_csv_fast") as mock_read:
+        assert cache.get(str(copy_file)) is first  # Same hash, served from memory
+        fresh_cache = ParsedCSVCache(cache_dir=str(tmp_path / "parsed"))
+        reloaded = fresh_cache.get(str(csv_file))  # New process, served from the sidecar
+        mock_read.assert_not_called()
+
+    assert list(reloaded.columns) == ["Level 1", "Level 2", "Name"]
+    assert reloaded["Name"].tolist() == ["Temperature", "Pressure"]
+    print("✅ CSV parsed once and reused.")
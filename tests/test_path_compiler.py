@@ -0,0 +1,55 @@
+import pandas as pd
+import pytest
+from src.itv_asset_tree.core.path_compiler import compile_tree_frame
+
+@pytest.mark.unit
+def test_compile_tree_frame_builds_paths_and_parent_assets():
+    """Unit test: sparse Level columns become ' >> ' paths plus one Asset row per parent."""
+    data = pd.DataFrame({
+        "Level 1": ["Plant", None, None, None],
+        "Level 2": ["Reactor 1", None, "Reactor 2", None],
+        "Level 3": ["Zone A", "nan", None, None],
+        "Name": ["Temperature", "Pressure", "Temperature", "Level"],
+    }).astype({"Level 1": "category", "Level 2": "category"})
+
+    result = compile_tree_frame(data)
+
+    assert "Level 1" not in result.columns
+    leaves = result[result["Type"].isna()]
+    assert leaves["Path"].tolist() == [
+        "Plant >> Reactor 1 >> Zone A",
+        "Plant >> Reactor 1",  # A literal 'nan' level is skipped (and filled down), like Seeq does
+        "Plant >> Reactor 2",
+        "Plant >> Reactor 2",
+    ]
+    assets = result[result["Type"] == "Asset"]
+    assert sorted(zip(assets["Path"], assets["Name"])) == [
+        ("", "Plant"),
+        ("Plant", "Reactor 1"),
+        ("Plant", "Reactor 2"),
+        ("Plant >> Reactor 1", "Zone A"),
+    ]
+    print("✅ Level columns compiled into paths.")
+
+@pytest.mark.unit
+def test_levels_are_filled_before_names_are_resolved():
+    """Unit test: rows after an unresolved name keep the Levels it carried."""
+    from unittest.mock import patch
+    from src.itv_asset_tree.core.tree_builder import TreeBuilder
+
+    data = pd.DataFrame({
+        "Level 1": ["Plant A", None, None],
+        "Level 2": ["Reactor 1", None, "Reactor 2"],
+        "Name": ["Missing Tag", "Pressure", "Temperature"],
+    }).astype({"Level 1": "category", "Level 2": "category"})
+
+    def resolve(items, status, workbook=None):
+        return items.iloc[1:]  # Seeq found no item named 'Missing Tag'
+
+    with patch("src.itv_asset_tree.core.tree_builder.spy_csv.get_ids_by_name_from_user_input", side_effect=resolve):
+        result = TreeBuilder("WB", metadata=data)._prepare_tree_data()
+
+    leaves = result[result["Type"] != "Asset"].set_index("Name")
+    assert leaves.loc["Pressure", "Path"] == "Plant A >> Reactor 1"
+    assert leaves.loc["Temperature", "Path"] == "Plant A >> Reactor 2"
+    print("✅ Level columns filled before IDs are resolved.")
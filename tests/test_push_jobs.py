@@ -0,0 +1,120 @@
+import asyncio
+import threading
+import pytest
+from fastapi import HTTPException
+from unittest.mock import patch
+from src.itv_asset_tree.api import templates
+from src.itv_asset_tree.core.push_jobs import (
+    BULK, CANCELLED, FAILED, INTERACTIVE, QUEUED, SUCCEEDED, JobCancelledError, JobNotCancellableError, PushJobQueue,
+    check_cancelled,
+)
+
+@pytest.mark.unit
+def test_push_jobs_lanes_status_and_cancel():
+    """Unit test: a busy bulk lane does not block interactive jobs; queued and running jobs can be cancelled."""
+    queue = PushJobQueue(interactive_workers=1, bulk_workers=1)
+    release = threading.Event()
+    started = threading.Event()
+
+    def long_rebuild():
+        check_cancelled()
+        started.set()
+        while not release.wait(0.01):
+            check_cancelled()
+        return "rebuilt"
+
+    rebuild = queue.submit(long_rebuild, name="rebuild", lane=BULK)
+    queued_rebuild = queue.submit(lambda: "never", name="queued rebuild", lane=BULK)
+    assert started.wait(5)
+
+    edit = queue.submit(lambda x: x * 2, 21, name="edit", lane=INTERACTIVE)
+    assert edit.future.result(timeout=5) == 42
+    assert queue.get(edit.id).status == SUCCEEDED and edit.to_dict()["result"] == 42
+
+    assert queue.cancel(queued_rebuild.id).status == CANCELLED
+    queue.cancel(rebuild.id)  # Running: stops at its next check_cancelled()
+    with pytest.raises(Exception):
+        rebuild.future.result(timeout=5)
+    assert rebuild.status == CANCELLED
+
+    failing = queue.submit(lambda: 1 / 0, name="broken", lane=INTERACTIVE)
+    with pytest.raises(ZeroDivisionError):
+        failing.future.result(timeout=5)
+    assert failing.status == FAILED and "division" in failing.error
+
+    assert queue.stats()[BULK] == {CANCELLED: 2}
+
+    blocking = queue.submit(release.wait, name="non-chunked push", lane=INTERACTIVE)
+    while blocking.status == QUEUED:
+        threading.Event().wait(0.01)
+    with pytest.raises(JobNotCancellableError):  # It never checks for cancellation, so it cannot be stopped
+        queue.cancel(blocking.id)
+    assert not blocking.cancel_requested.is_set() and blocking.to_dict()["cancellable"] is False
+    release.set()
+    assert blocking.future.result(timeout=5) and blocking.status == SUCCEEDED
+    with pytest.raises(ValueError):
+        queue.submit(lambda: None, name="bad lane", lane="urgent")
+    queue.shutdown()
+    print("✅ Push jobs run per lane, report status and honour cancellation.")
+
+@pytest.mark.unit
+def test_waiting_on_a_job_cancelled_before_it_started():
+    """Unit test: a queued job cancelled while awaited raises JobCancelledError; cancelling the waiter still propagates."""
+    queue = PushJobQueue(bulk_workers=1)
+    release = threading.Event()
+    queue.submit(release.wait, name="rebuild", lane=BULK)
+    queued = queue.submit(lambda: "never", name="queued rebuild", lane=BULK)
+    other = queue.submit(lambda: "later", name="later rebuild", lane=BULK)
+
+    async def cancel_while_waiting():
+        waiter = asyncio.ensure_future(queue.wait(queued))
+        await asyncio.sleep(0.05)
+        queue.cancel(queued.id)
+        with pytest.raises(JobCancelledError):
+            await waiter
+
+        waiter = asyncio.ensure_future(queue.wait(other))
+        await asyncio.sleep(0.05)
+        waiter.cancel()  # The request went away; the job itself was not cancelled
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+    try:
+        asyncio.run(cancel_while_waiting())
+    finally:
+        release.set()  # Free the lane even if an assertion failed
+    queue.shutdown()
+    print("✅ Cancelled jobs surface as JobCancelledError to their waiters.")
+
+@pytest.mark.unit
+def test_template_build_runs_on_the_bulk_lane_and_reports_cancellation():
+    """Unit test: an inline template build is a bulk-lane job; cancelling it answers 409."""
+    queue = PushJobQueue(bulk_workers=1)
+    request = templates.BuildRequest(template_name="HVAC", type="StoredSignal", build_asset_regex="(.*)",
+                                     build_path="Plant")
+    lanes = []
+    release = threading.Event()
+
+    def fake_build(request):
+        lanes.append(threading.current_thread().name)
+        return {"message": "built"}
+
+    async def build_then_cancel():
+        assert await templates.build_template(request) == {"message": "built"}
+
+        queue.submit(release.wait, name="rebuild", lane=BULK)
+        build = asyncio.ensure_future(templates.build_template(request))
+        await asyncio.sleep(0.05)
+        queue.cancel(queue.list(lane=BULK, status=QUEUED)[0].id)
+        with pytest.raises(HTTPException) as cancelled:
+            await build
+        return cancelled.value
+
+    try:
+        with patch.multiple(templates, push_jobs=queue, _build_and_push_template=fake_build):
+            cancelled = asyncio.run(build_then_cancel())
+    finally:
+        release.set()
+    assert lanes == ["push-bulk_0"] and cancelled.status_code == 409
+    queue.shutdown()
+    print("✅ Template builds wait on the bulk lane and report cancellation as 409.")
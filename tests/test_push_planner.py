@@ -0,0 +1,64 @@
+import pandas as pd
+import pytest
+from unittest.mock import MagicMock, patch
+from seeq.spy.assets import Tree
+from src.itv_asset_tree.core import push_planner, tree_modifier
+from src.itv_asset_tree.core.push_manager import PushManager
+from src.itv_asset_tree.core.tree_diff import snapshot_tree
+from src.itv_asset_tree.core.tree_modifier import TreeModifier
+
+
+def load_from_seeq(name, workbook):
+    tree = Tree(pd.DataFrame({"Path": ["", "Plant"], "Name": ["Plant", "T1"], "Type": ["Asset", "Signal"],
+                              "Formula": [None, "sinusoid()"]}), quiet=True)
+    tree._dataframe["ID"] = ["ID-0", "ID-1"]  # Items loaded from Seeq have IDs
+    return tree
+
+
+@pytest.mark.unit
+def test_unedited_tree_has_nothing_pending_cached_or_not():
+    """Unit test: a tree just loaded (cache miss) or taken from the cache plans and pushes nothing until --full."""
+    try:
+        with patch.object(tree_modifier, "Tree", load_from_seeq):
+            loaded = TreeModifier(workbook="Test Workbook", tree_name="Plant")
+        cached = TreeModifier(workbook="Test Workbook", tree_name="Plant")
+        assert cached.tree is loaded.tree
+
+        for modifier in (loaded, cached):
+            plan = modifier.plan()
+            assert plan.mode == "changes" and plan.is_empty and plan.to_dict()["nothing_pending"]
+            assert "Nothing pending" in plan.describe()
+
+        loaded.tree.push = MagicMock(return_value=pd.DataFrame())
+        assert loaded.push_tree()["pushed"] == 0 and loaded.tree.push.call_count == 0
+        full = cached.plan(changes_only=False)
+        assert full.mode == "full" and full.updates == 2 and not full.is_empty
+    finally:
+        tree_modifier.tree_cache.invalidate("Test Workbook", "Plant")
+    print("✅ Unedited trees have nothing pending.")
+
+
+@pytest.mark.unit
+def test_dry_run_plan_uses_observed_throughput(tmp_path):
+    """Unit test: a dry run counts creates/updates/archives and estimates from the throughput log."""
+    tree = Tree(pd.DataFrame({"Path": ["", "Plant", "Plant"], "Name": ["Plant", "T1", "T2"],
+                              "Type": ["Asset", "Signal", "Signal"], "Formula": [None, "sinusoid()", "sinusoid()"]}),
+                quiet=True)
+    tree._dataframe["ID"] = ["ID-0", "ID-1", "ID-2"]
+    snapshot_tree(tree)
+    tree.remove("Plant >> T2", quiet=True)
+    tree.insert(children=[{"Name": "Setpoint", "Type": "Scalar", "Formula": "1"}], parent="Plant", quiet=True)
+
+    with patch.object(push_planner.settings, "PUSH_THROUGHPUT_LOG", str(tmp_path / "throughput.json")):
+        assert push_planner.plan_push(tree).throughput_source == "default"
+        push_planner.record_push(items=100, seconds=10)
+
+        with patch("src.itv_asset_tree.core.chunked_push.spy.push") as mock_push:
+            result = PushManager(tree).push(changes_only=True, dry_run=True)
+            mock_push.assert_not_called()
+
+    plan = result["plan"]
+    assert (plan["creates"], plan["updates"], plan["archives"]) == (1, 0, 1)
+    assert plan["items_per_second"] == 10.0 and plan["estimated_seconds"] == 0.2
+    assert plan["payload_bytes"] > 0
+    print("✅ Dry run planned without touching Seeq.")
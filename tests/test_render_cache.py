@@ -0,0 +1,118 @@
+import pandas as pd
+import pytest
+from unittest.mock import patch
+from src.itv_asset_tree.core.render_cache import RenderCache
+from src.itv_asset_tree.core.tree_index import TreeIndex
+
+def plant_df(*units):
+    return pd.DataFrame({
+        "Path": [""] + ["Plant"] * len(units),
+        "Name": ["Plant", *units],
+        "Type": ["Asset"] * (len(units) + 1),
+    })
+
+@pytest.mark.unit
+def test_renderings_are_cached_per_version():
+    """Unit test: renderings are computed once per tree version and a bump changes the ETag."""
+    cache = RenderCache(max_entries=8)
+    assert cache.version("WB", "Plant") is None
+
+    with patch.object(TreeIndex, "from_dataframe", wraps=TreeIndex.from_dataframe) as nodes:
+        version, text = cache.render("WB", "Plant", plant_df("Unit 1"))
+        assert (version, text) == (1, "Plant\n|-- Unit 1")
+        assert cache.render("WB", "Plant", plant_df("Unit 1"), kind="nested")[1]["child_count"] == 1
+        assert cache.render("WB", "Plant", plant_df("Unit 1"))[1] == text
+        assert nodes.call_count == 1  # One index per version serves every rendering
+    first_etag = cache.etag("WB", "Plant", version, "text", None)
+
+    with patch.multiple("src.itv_asset_tree.core.render_cache.settings", RENDER_PRECOMPUTE=False):
+        assert cache.bump("WB", "Plant") == 2
+    version, text = cache.render("WB", "Plant", plant_df("Unit 1", "Unit 2"))
+    assert text.endswith("|-- Unit 2")
+    assert cache.etag("WB", "Plant", version, "text", None) != first_etag
+    assert cache.stats()["renderings"] == 2  # Version 1 was dropped on the bump
+    print("✅ Renderings cached per version.")
+
+@pytest.mark.unit
+def test_bump_precomputes_in_background():
+    """Unit test: a bump with the pushed tree warms up its renderings on the precompute thread."""
+    cache = RenderCache()
+    tree = type("PushedTree", (), {"_dataframe": plant_df("Unit 1")})()
+
+    cache.bump("WB", "Plant", tree)
+    cache._pool().submit(lambda: None).result(timeout=5)  # Wait for the precompute to finish
+    assert cache.stats()["renderings"] == 3 and cache.misses == 3
+
+    assert cache.render("WB", "Plant", tree, kind="nested")[1]["name"] == "Plant"
+    assert cache.hits >= 1 and cache.misses == 3
+    print("✅ Pushed trees are rendered ahead of the next request.")
+
+@pytest.mark.unit
+def test_expired_tree_is_reloaded_instead_of_not_modified():
+    """Unit test: a matching ETag gets 304 only while the tree cache entry is fresh; after its TTL the tree reloads."""
+    from unittest.mock import MagicMock
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from seeq.spy.assets import Tree
+    from src.itv_asset_tree.api import api
+    from src.itv_asset_tree.core.tree_cache import TreeCache
+
+    tree_cache, render_cache = TreeCache(ttl_seconds=60), RenderCache()
+    cached, reloaded = Tree(plant_df("Unit 1"), quiet=True), Tree(plant_df("Unit 1", "Unit 2"), quiet=True)
+    cached.name = reloaded.name = "Plant"
+    tree_cache.put("WB", "Plant", cached)
+    render_cache.bump("WB", "Plant")
+    loader = MagicMock(return_value=MagicMock(tree=reloaded))
+
+    app = FastAPI()
+    app.include_router(api.router)
+    client = TestClient(app)
+    params = {"tree_name": "Plant", "workbook_name": "WB"}
+    with patch.multiple(api, tree_cache=tree_cache, render_cache=render_cache, TreeModifier=loader,
+                        current_tree=cached):
+        first = client.get("/api/v1/asset_tree/visualize_tree/", params=params)
+        etag = first.headers["ETag"]
+        assert client.get("/api/v1/asset_tree/visualize_tree/", params=params,
+                          headers={"If-None-Match": etag}).status_code == 304
+
+        tree_cache.ttl_seconds = 0  # The cached entry is now past its TTL
+        after = client.get("/api/v1/asset_tree/visualize_tree/", params=params, headers={"If-None-Match": etag})
+    assert after.status_code == 200 and after.headers["ETag"] != etag
+    assert after.json()["tree_structure"].endswith("|-- Unit 2") and loader.call_count == 1
+    assert render_cache.version("WB", "Plant") == 2
+    print("✅ Expired trees reload instead of answering 304.")
+
+@pytest.mark.unit
+def test_same_tree_name_in_two_workbooks_is_not_mixed_up():
+    """Unit test: a same-named tree of another workbook is neither rendered nor vouched for by its ETag."""
+    from unittest.mock import MagicMock
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from seeq.spy.assets import Tree
+    from src.itv_asset_tree.api import api
+    from src.itv_asset_tree.core.tree_cache import TreeCache
+
+    tree_cache, render_cache = TreeCache(ttl_seconds=60), RenderCache()
+    in_a, in_b = Tree(plant_df("Unit A"), quiet=True), Tree(plant_df("Unit B"), quiet=True)
+    in_a.name = in_b.name = "Plant"
+    for workbook, tree in (("WB A", in_a), ("WB B", in_b)):
+        tree_cache.put(workbook, "Plant", tree)
+        render_cache.bump(workbook, "Plant")
+    loader = MagicMock()
+
+    app = FastAPI()
+    app.include_router(api.router)
+    client = TestClient(app)
+    url = "/api/v1/asset_tree/visualize_tree/"
+    with patch.multiple(api, tree_cache=tree_cache, render_cache=render_cache, TreeModifier=loader,
+                        current_tree=in_a):  # Workbook A's tree was the last one used
+        b = client.get(url, params={"tree_name": "Plant", "workbook_name": "WB B"})
+        a = client.get(url, params={"tree_name": "Plant", "workbook_name": "WB A"},
+                       headers={"If-None-Match": b.headers["ETag"]})
+        b_again = client.get(url, params={"tree_name": "Plant", "workbook_name": "WB B"},
+                             headers={"If-None-Match": b.headers["ETag"]})
+    assert b.json()["tree_structure"].endswith("|-- Unit B")
+    assert a.status_code == 200 and a.json()["tree_structure"].endswith("|-- Unit A")
+    assert a.headers["ETag"] != b.headers["ETag"] and b_again.status_code == 304
+    loader.assert_not_called()
+    print("✅ Same-named trees of different workbooks stay apart.")
@@ -0,0 +1,79 @@
+import json
+import msgpack
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+from src.itv_asset_tree.api import responses
+from src.itv_asset_tree.api.responses import ARROW, JSON, MSGPACK, NegotiatedResponse, NegotiatedRoute, dumps_json, negotiate
+
+@pytest.mark.unit
+def test_negotiate_prefers_highest_quality_available_type():
+    """Unit test: Accept headers are ranked by q, aliases are understood and JSON is the fallback."""
+    assert negotiate(None) == JSON
+    assert negotiate("*/*") == JSON
+    assert negotiate("application/json;q=0.5, application/vnd.apache.arrow.stream") == ARROW
+    assert negotiate("application/vnd.apache.arrow.stream;q=0, application/json") == JSON
+    assert negotiate("text/html") == JSON
+    print("✅ Accept headers negotiated.")
+
+@pytest.mark.unit
+def test_negotiated_route_encodes_dataframes_directly():
+    """Unit test: routes return DataFrames as JSON records (NaN as null) or as an Arrow table."""
+    router = APIRouter(route_class=NegotiatedRoute, default_response_class=NegotiatedResponse)
+
+    @router.get("/duplicates")
+    def duplicates():
+        return {"message": "Duplicates found!",
+                "duplicates": pd.DataFrame({"Key": ["a", "a"], "Value": [1.5, np.nan]})}
+
+    app = FastAPI()
+    app.include_router(router)
+    client = TestClient(app)
+
+    response = client.get("/duplicates")
+    assert response.headers["content-type"] == JSON and response.headers["vary"] == "Accept"
+    assert response.json()["duplicates"] == [{"Key": "a", "Value": 1.5}, {"Key": "a", "Value": None}]
+
+    response = client.get("/duplicates", headers={"Accept": ARROW})
+    table = pa.ipc.open_stream(response.content).read_all()
+    assert response.headers["content-type"] == ARROW
+    assert table.column("Key").to_pylist() == ["a", "a"]
+    assert json.loads(table.schema.metadata[b"message"]) == "Duplicates found!"
+    print("✅ DataFrames encoded without jsonable_encoder.")
+
+MIXED_CONTENT = {"ratio": float("nan"), "count": np.int64(3), "values": [1.5, float("inf")], 7: "seven",
+                 "rows": pd.DataFrame({"Key": ["a"], "Value": [np.nan]})}
+MIXED_DECODED = {"ratio": None, "count": 3, "values": [1.5, None], "7": "seven", "rows": [{"Key": "a", "Value": None}]}
+
+@pytest.mark.unit
+def test_orjson_and_stdlib_fallback_write_nan_as_null():
+    """Unit test: orjson and the stdlib fallback encode the same content alike, NaN and infinity as null."""
+    assert responses._ORJSON_AVAILABLE
+    assert json.loads(dumps_json(MIXED_CONTENT)) == MIXED_DECODED
+    with patch.object(responses, "_ORJSON_AVAILABLE", False):
+        assert json.loads(dumps_json(MIXED_CONTENT)) == MIXED_DECODED
+    print("✅ JSON encoders agree on NaN.")
+
+@pytest.mark.unit
+def test_msgpack_negotiated_and_encoded():
+    """Unit test: msgpack is offered, negotiated by its aliases and decodes to the same records as JSON."""
+    router = APIRouter(route_class=NegotiatedRoute, default_response_class=NegotiatedResponse)
+
+    @router.get("/rows")
+    def rows():
+        return {"rows": pd.DataFrame({"Key": ["a", "b"], "Value": [1.5, np.nan]}), "count": np.int64(2)}
+
+    app = FastAPI()
+    app.include_router(router)
+    client = TestClient(app)
+
+    assert negotiate("application/x-msgpack, application/json;q=0.9") == MSGPACK
+    response = client.get("/rows", headers={"Accept": "application/vnd.msgpack"})
+    assert response.headers["content-type"] == MSGPACK
+    assert msgpack.unpackb(response.content) == \
+        {"rows": [{"Key": "a", "Value": 1.5}, {"Key": "b", "Value": None}], "count": 2}
+    print("✅ msgpack responses negotiated.")
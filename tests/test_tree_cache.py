@@ -0,0 +1,32 @@
+import pytest
+from unittest.mock import MagicMock, patch
+from src.itv_asset_tree.core.tree_cache import TreeCache
+
+def fake_tree(rows):
+    tree = MagicMock()
+    tree.__len__.return_value = rows
+    return tree
+
+@pytest.mark.unit
+def test_tree_cache_lru_size_and_ttl():
+    """Unit test: trees are evicted by count, total rows and age, and can be invalidated."""
+    cache = TreeCache(max_entries=3, max_rows=100, ttl_seconds=60)
+    loader = MagicMock(return_value=fake_tree(40))
+
+    first = cache.get_or_load("WB", "Tree A", loader)
+    assert cache.get_or_load("WB", "Tree A", loader) is first
+    assert loader.call_count == 1
+
+    cache.put("WB", "Tree B", fake_tree(40))
+    cache.get("WB", "Tree A")  # Tree A is now most recently used
+    cache.put("WB", "Tree C", fake_tree(40))  # 120 rows > 100: evict LRU (Tree B)
+    assert cache.get("WB", "Tree B") is None
+    assert cache.get("WB", "Tree A") is first
+
+    cache.invalidate("WB", "Tree A")
+    assert cache.get("WB", "Tree A") is None
+
+    with patch("src.itv_asset_tree.core.tree_cache.time.monotonic", return_value=10**9):
+        assert cache.get("WB", "Tree C") is None  # Expired
+    assert cache.stats()["entries"] == 0
+    print("✅ Tree cache evicts by size, recency and TTL.")
@@ -0,0 +1,78 @@
+import pandas as pd
+import pytest
+from unittest.mock import patch
+from seeq.spy.assets import Tree
+from src.itv_asset_tree.core.push_manager import PushManager
+from src.itv_asset_tree.core.tree_diff import diff_trees, snapshot_tree
+
+def pushed_tree():
+    """A small tree whose items all carry Seeq IDs, as if loaded from Seeq."""
+    tree = Tree(pd.DataFrame({
+        "Path": ["", "Plant", "Plant >> Area", "Plant >> Area", "Plant"],
+        "Name": ["Plant", "Area", "T1", "T2", "Utilities"],
+        "Type": ["Asset", "Asset", "Signal", "Signal", "Asset"],
+        "Formula": [None, None, "sinusoid()", "sinusoid()", None],
+    }), quiet=True)
+    tree._dataframe["ID"] = [f"ID-{i}" for i in range(len(tree._dataframe))]
+    snapshot_tree(tree)
+    return tree
+
+@pytest.mark.unit
+def test_diff_classifies_added_removed_moved_and_changed():
+    """Unit test: local edits are reported as a minimal changeset."""
+    tree = pushed_tree()
+    baseline = tree.df.copy()
+
+    tree.move("Plant >> Area >> T1", "Plant >> Utilities", quiet=True)
+    tree.remove("Plant >> Area >> T2", quiet=True)
+    tree.insert(children=[{"Name": "Setpoint", "Type": "Scalar", "Formula": "1"}], parent="Plant >> Area", quiet=True)
+    tree._dataframe.loc[tree._dataframe["Name"] == "Utilities", "Description"] = "Steam and air"
+
+    changes = diff_trees(baseline, tree.df)
+
+    assert changes.summary() == {"added": 1, "removed": 1, "moved": 1, "changed": 1}
+    assert changes.added["Name"].tolist() == ["Setpoint"]
+    assert changes.moved[["Path", "Previous Path"]].values.tolist() == [["Plant >> Utilities", "Plant >> Area"]]
+    assert sorted(changes.ids_to_archive) == ["ID-2", "ID-3"]
+    print("✅ Tree diff classified every change.")
+
+@pytest.mark.unit
+def test_push_changes_sends_only_the_changeset():
+    """Unit test: an incremental push sends changed rows and archives removed ones."""
+    tree = pushed_tree()
+    tree.remove("Plant >> Area >> T2", quiet=True)
+    tree.insert(children=[{"Name": "Setpoint", "Type": "Scalar", "Formula": "1"}], parent="Plant >> Area", quiet=True)
+
+    def fake_push(metadata, **kwargs):
+        return metadata.assign(**{"ID": "NEW-ID", "Push Result": "Success"})
+
+    with patch("src.itv_asset_tree.core.chunked_push.spy.push", side_effect=fake_push) as mock_push:
+        result = PushManager(tree).push_changes()
+
+    pushed, archived = (call.kwargs["metadata"] for call in mock_push.call_args_list)
+    assert pushed["Name"].tolist() == ["Setpoint"]
+    assert all(call.kwargs["archive"] is False for call in mock_push.call_args_list)
+    assert archived["ID"].tolist() == ["ID-3"] and archived["Archived"].all()  # Archived the way SPy does
+    assert result == {"changes": {"added": 1, "removed": 1, "moved": 0, "changed": 0}, "pushed": 1, "archived": 1}
+    assert PushManager(tree).diff().is_empty  # Baseline moved forward after the push
+    print("✅ Only the changeset was pushed.")
+
+@pytest.mark.unit
+def test_push_changes_sends_references_outside_the_changeset_as_ids():
+    """Unit test: an edited formula that reads an unchanged item references it by Seeq ID, not by path."""
+    tree = pushed_tree()
+    t2 = tree._dataframe.index[tree._dataframe["Name"] == "T2"][0]
+    tree._dataframe.at[t2, "Formula"] = "$t * 2"
+    tree._dataframe.at[t2, "Formula Parameters"] = {"$t": "T1"}  # T1 itself is unchanged
+
+    def fake_push(metadata, **kwargs):
+        return metadata.assign(**{"Push Result": "Success"})
+
+    with patch("src.itv_asset_tree.core.chunked_push.spy.push", side_effect=fake_push) as mock_push:
+        result = PushManager(tree).push_changes()
+
+    pushed = mock_push.call_args.kwargs["metadata"]
+    assert pushed["Name"].tolist() == ["T2"]
+    assert pushed["Formula Parameters"].tolist() == [{"$t": "ID-2"}]
+    assert result["changes"]["changed"] == 1
+    print("✅ References outside the changeset were sent as IDs.")
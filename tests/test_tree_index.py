@@ -0,0 +1,75 @@
+import pandas as pd
+import pytest
+from unittest.mock import patch
+from seeq.spy.assets import Tree
+from src.itv_asset_tree.core.tree_index import TreeIndex
+from src.itv_asset_tree.core.tree_modifier import TreeModifier
+from src.itv_asset_tree.core.tree_serializer import children_page, render_text
+
+TREE_DF = pd.DataFrame({
+    "Path": ["", "Plant", "Plant >> Area", "Plant >> Area", "Plant"],
+    "Name": ["Plant", "Area", "Temperature", "Pressure", "Utilities"],
+    "Type": ["Asset", "Asset", "Signal", "Signal", "Asset"],
+})
+
+@pytest.mark.unit
+def test_tree_index_queries_and_incremental_updates():
+    """Unit test: path lookups, interval queries and insert/move/remove stay consistent."""
+    index = TreeIndex.from_dataframe(TREE_DF)
+    root, area = index.root, index.find("plant >> AREA")  # Case-insensitive, like Seeq
+
+    assert len(index) == 5 and index.depth(area) == 2
+    assert index.is_ancestor(root, index.find("Plant >> Area >> Pressure"))
+    assert not index.is_ancestor(index.find("Plant >> Utilities"), area)
+    assert index.subtree_size(area) == 3
+
+    index.insert("Plant >> Utilities", "Steam", "Asset")
+    index.move("Plant >> Area >> Pressure", "Plant >> Utilities >> Steam")
+    moved = index.find("Plant >> Utilities >> Steam >> Pressure")
+    assert moved is not None and index.depth(moved) == 4
+    assert "Plant >> Area >> Pressure" not in index
+    assert index.is_ancestor(index.find("Plant >> Utilities"), moved)
+
+    with pytest.raises(ValueError):
+        index.move("Plant >> Utilities", "Plant >> Utilities >> Steam")  # Would create a cycle
+
+    assert index.remove("Plant >> Utilities") == 3
+    assert index.to_nested() == {"Plant": {"Area": {"Temperature": {}}}}
+    print("✅ Tree index answers structural queries and tracks edits.")
+
+@pytest.mark.unit
+def test_moves_do_not_recompute_intervals():
+    """Unit test: a run of moves checks cycles by walking parents; intervals are rebuilt once, on the next query."""
+    index = TreeIndex.from_dataframe(TREE_DF)
+    index.insert("Plant", "Line", "Asset")
+    with patch.object(TreeIndex, "_ensure_intervals", wraps=index._ensure_intervals) as ensure:
+        index.move("Plant >> Area >> Pressure", "Plant >> Line")
+        index.move("Plant >> Area", "Plant >> Utilities")
+        with pytest.raises(ValueError):
+            index.move("Plant >> Utilities", "Plant >> Utilities >> Area")  # Would create a cycle
+        assert ensure.call_count == 0
+
+        assert index.subtree_size(index.find("Plant >> Utilities")) == 3
+        assert index.is_ancestor(index.root, index.find("Plant >> Line >> Pressure"))
+    assert index._intervals_dirty is False
+    print("✅ Moves leave interval recomputation to the next query.")
+
+@pytest.mark.unit
+def test_index_serves_renderings_and_follows_outside_edits():
+    """Unit test: the serializers read IDs and children from the index; a modifier rebuilds it after edits elsewhere."""
+    index = TreeIndex.from_dataframe(TREE_DF.assign(ID=["ID-P", "ID-A", None, None, None]))
+    assert [(node, depth) for node, depth, _ in index.walk(max_depth=2)] == \
+        [(index.root, 1), (index.find("Plant >> Area"), 2), (index.find("Plant >> Utilities"), 2)]
+    page = children_page(index, path="Plant")
+    assert [(child["name"], child["id"], child["child_count"]) for child in page["children"]] == \
+        [("Area", "ID-A", 2), ("Utilities", None, 0)]
+
+    tree = Tree(TREE_DF.assign(Formula=[None, None, "sinusoid()", "sinusoid()", None]), quiet=True)
+    with patch.object(TreeModifier, "load_tree"):
+        first = TreeModifier(workbook="WB", tree_name="Plant", tree=tree)
+        second = TreeModifier(workbook="WB", tree_name="Plant", tree=tree)
+    assert first.visualize_tree() == render_text(tree.df)
+    tree.insert(children=[{"Name": "Steam", "Type": "Asset"}], parent="Plant >> Utilities", quiet=True)
+    assert first.visualize_tree() == render_text(tree.df) and first.item_exists("Plant >> Utilities >> Steam")
+    assert second.children_of("Plant >> Utilities") == ["Steam"]
+    print("✅ The tree index serves renderings and stays in step with the tree.")
@@ -0,0 +1,108 @@
+import asyncio
+import inspect
+import io
+import threading
+import pandas as pd
+import pytest
+from unittest.mock import MagicMock, patch
+from seeq.spy.assets import Tree
+from starlette.datastructures import UploadFile
+from src.itv_asset_tree.api import api
+from src.itv_asset_tree.api import csv_lookup_generator as lookups
+from src.itv_asset_tree.core.tree_locks import TreeLockManager, TreeLockTimeout
+
+@pytest.mark.unit
+def test_tree_locks_serialize_same_tree_only():
+    """Unit test: edits of one tree are serialized, other trees proceed, and waits/holds are measured."""
+    locks = TreeLockManager()
+    holding = threading.Event()
+    release = threading.Event()
+
+    def hold_tree_a():
+        with locks.lock("WB", "Tree A"):
+            with locks.lock("WB", "Tree A"):  # Re-entrant for the holder
+                holding.set()
+                release.wait(5)
+
+    holder = threading.Thread(target=hold_tree_a, name="pusher-a")
+    holder.start()
+    assert holding.wait(5)
+
+    with locks.lock("WB", "Tree B", timeout=0.1):  # Unrelated tree is not blocked
+        pass
+    with pytest.raises(TreeLockTimeout, match="pusher-a"):
+        with locks.lock("WB", "Tree A", timeout=0.05):
+            pass
+
+    threading.Timer(0.1, release.set).start()
+    with locks.lock("WB", "Tree A"):
+        pass
+    holder.join(5)
+
+    metrics = locks.metrics()["WB >> Tree A"]
+    assert metrics["acquisitions"] == 2 and metrics["contended"] == 1 and metrics["timeouts"] == 1
+    assert metrics["max_wait_seconds"] > 0 and metrics["max_hold_seconds"] > 0
+    assert metrics["holder"] is None and not locks.is_locked("WB", "Tree A")
+    assert locks.metrics()["WB >> Tree B"]["contended"] == 0
+    print("✅ Tree locks serialize per tree and report wait/hold times.")
+
+@pytest.mark.unit
+def test_push_lookup_inserts_under_lock_and_rolls_back_on_failure(tmp_path):
+    """Unit test: lookup rows are inserted while the tree is locked, and a failed insert leaves the cached tree as it was."""
+
+    tree = Tree(pd.DataFrame({"Path": [""], "Name": ["Plant"], "Type": ["Asset"]}), quiet=True)
+    before = tree.df.copy()
+    lookup_file = tmp_path / "lookup_output.csv"
+    pd.DataFrame({"Name": ["A_LookupString"], "Formula": ["[]"], "Formula Parameters": ["{}"],
+                  "Parent Path": ["Plant"]}).to_csv(lookup_file, index=False)
+    locked_during_insert = []
+
+    def failing_insert(target, items):
+        locked_during_insert.append(lookups.tree_locks.is_locked("WB", "Lookup Tree"))
+        target.insert(children=items, quiet=True)  # Half-applied...
+        raise RuntimeError("Seeq rejected the batch")  # ...then fails
+
+    with patch.object(lookups, "TreeModifier", return_value=MagicMock(tree=tree)), \
+         patch.object(lookups, "insert_items", side_effect=failing_insert), \
+         patch.object(lookups.tree_cache, "invalidate") as invalidate, \
+         patch.object(lookups, "push_state_path", return_value=str(tmp_path / "pushed.json")):
+        with pytest.raises(RuntimeError):
+            lookups._push_lookup_file(str(lookup_file), "Lookup Tree", "WB")
+
+    assert locked_during_insert == [True]
+    pd.testing.assert_frame_equal(tree.df, before)
+    invalidate.assert_called_once_with("WB", "Lookup Tree")
+    assert not lookups.tree_locks.is_locked("WB", "Lookup Tree")
+    print("✅ Lookup insert locked and rolled back.")
+
+@pytest.mark.unit
+def test_tree_edits_wait_for_the_lock_off_the_event_loop(tmp_path, monkeypatch):
+    """Unit test: modify_tree waits for a held tree lock on a job thread; the event loop keeps serving meanwhile."""
+
+    monkeypatch.chdir(tmp_path)
+    holding, release, released = threading.Event(), threading.Event(), threading.Event()
+
+    def hold_tree():
+        with api.tree_locks.lock("WB", "Held Tree"):
+            holding.set()
+            release.wait(2)
+        released.set()
+
+    async def scenario():
+        upload = UploadFile(io.BytesIO(b"Parent Path,Name\nPlant,Area\n"), filename="insert.csv")
+        edit = asyncio.create_task(api.modify_tree(upload, tree_name="Held Tree", workbook_name="WB"))
+        await asyncio.sleep(0.2)  # Only resumes if the edit is not blocking the loop
+        served_while_locked = not released.is_set() and not edit.done()
+        release.set()
+        return served_while_locked, await edit
+
+    threading.Thread(target=hold_tree, name="bulk-push").start()
+    assert holding.wait(5)
+    with patch.object(api, "Tree", return_value=MagicMock()), \
+         patch.object(api, "insert_items"), patch.object(api, "render_cache"):
+        served_while_locked, result = asyncio.run(scenario())
+
+    assert served_while_locked and "inserted successfully" in result["message"]
+    assert not any(inspect.iscoroutinefunction(handler) for handler in
+                   (api.insert_item, api.remove_item, api.search_tree, api.visualize_tree))
+    print("✅ Tree edits wait for the lock without blocking the server.")
@@ -0,0 +1,46 @@
+import pandas as pd
+import pytest
+from unittest.mock import MagicMock, patch
+from seeq.spy.assets import Tree
+from src.itv_asset_tree.core.tree_modifier import TreeModifier
+
+@pytest.mark.unit
+def test_batch_operations_push_once_and_roll_back_on_error():
+    """Unit test: queued operations are applied locally and committed with a single push."""
+    data = pd.DataFrame({
+        "Path": ["", "Plant", "Plant >> Area"],
+        "Name": ["Plant", "Area", "T1"],
+        "Type": ["Asset", "Asset", "Signal"],
+        "Formula": [None, None, "sinusoid()"],
+    })
+
+    def fake_load_tree(self):
+        self.tree = Tree(data)
+
+    with patch.object(TreeModifier, "load_tree", fake_load_tree):
+        modifier = TreeModifier(workbook="Test Workbook", tree_name="Plant")
+    modifier.tree.push = MagicMock()
+    assert modifier.item_exists("Plant >> Area >> T1")
+
+    with modifier.batch():
+        for i in range(3):
+            modifier.insert_item("Area", {"Name": f"S{i}", "Type": "Scalar", "Formula": "1"})
+        modifier.insert_item("Plant", {"Name": "Area 2", "Type": "Asset"})
+        modifier.move_item("Plant >> Area >> S1", "Plant >> Area 2")
+        modifier.remove_item("Plant >> Area >> S2")
+
+    assert modifier.tree.push.call_count == 1
+    names = set(modifier.tree.df["Name"])
+    assert {"S0", "S1", "Area 2"} <= names and "S2" not in names
+    assert modifier.children_of("Plant >> Area 2") == ["S1"]
+
+    size = len(modifier.tree.df)
+    modifier.begin_batch()
+    modifier.insert_item("Area", {"Name": "Extra", "Type": "Scalar", "Formula": "2"})
+    modifier.remove_item("Missing >> Item")
+    with pytest.raises(ValueError):
+        modifier.commit_batch()
+
+    assert len(modifier.tree.df) == size  # Failed batch leaves the tree untouched
+    assert modifier.tree.push.call_count == 1
+    print("✅ Batch committed with one push and rolled back on error.")
@@ -0,0 +1,68 @@
+import pandas as pd
+import pytest
+from seeq.spy.assets import Tree
+from src.itv_asset_tree.core.tree_serializer import children_page, render_text, serialize_tree
+
+def piped_tree():
+    return Tree(pd.DataFrame({
+        "Path": ["", "Plant", "Plant", "Plant >> Area | North", "Plant >> Area | North", "Plant >> Area | North >> T1"],
+        "Name": ["Plant", "Area | North", "Utilities", "T1", "T2", "Probe"],
+        "Type": ["Asset", "Asset", "Asset", "Asset", "Signal", "Signal"],
+        "Formula": [None, None, None, None, "sinusoid()", "sinusoid()"],
+    }), quiet=True)
+
+@pytest.mark.unit
+def test_render_text_matches_visualize():
+    """Unit test: the direct renderer reproduces Tree.visualize(), even with pipes in names."""
+    tree = piped_tree()
+    assert render_text(tree.df) == tree.visualize(print_tree=False)
+    assert render_text(tree.df, max_depth=2).splitlines() == ["Plant", "|-- Area | North", "|-- Utilities"]
+    print("✅ Text rendering matches visualize().")
+
+@pytest.mark.unit
+def test_nested_and_adjacency_with_depth_limit():
+    """Unit test: structured output carries paths, types and child counts, and honours max_depth."""
+    tree = piped_tree()
+
+    nested = serialize_tree(tree, format="nested", max_depth=2)
+    area = nested["children"][0]
+    assert (area["name"], area["path"], area["child_count"], area["children"]) == \
+        ("Area | North", "Plant >> Area | North", 2, [])
+
+    adjacency = serialize_tree(tree, format="adjacency")
+    by_name = {node["name"]: node for node in adjacency}
+    by_node = {node["node"]: node for node in adjacency}
+    assert by_name["Probe"]["depth"] == 4 and by_node[by_name["Probe"]["parent"]]["name"] == "T1"
+    assert [node["name"] for node in adjacency] == ["Plant", "Area | North", "T1", "Probe", "T2", "Utilities"]
+
+    with pytest.raises(ValueError):
+        serialize_tree(tree, format="xml")
+    print("✅ Nested and adjacency serializations are correct.")
+
+@pytest.mark.unit
+def test_children_page_paginates_with_cursor():
+    """Unit test: children come in pages with counts, and the cursor survives a sibling being removed."""
+    df = pd.DataFrame({
+        "Path": [""] + ["Plant"] * 5 + ["Plant >> Unit 1"],
+        "Name": ["Plant", "Unit 1", "Unit 2", "Unit 3", "Unit 4", "Unit 5", "Pump"],
+        "Type": ["Asset"] * 7,
+    })
+
+    root = children_page(df)
+    assert root["child_count"] == 1 and root["children"][0]["child_count"] == 5 and root["next_cursor"] is None
+
+    first = children_page(df, path="plant", limit=2)
+    assert [child["name"] for child in first["children"]] == ["Unit 1", "Unit 2"]
+    assert first["children"][0]["child_count"] == 1 and first["children"][0]["path"] == "Plant >> Unit 1"
+
+    # "Unit 1" disappears between requests; the next page still starts after "Unit 2"
+    second = children_page(df.drop(index=[1, 6]), path="Plant", cursor=first["next_cursor"], limit=2)
+    assert [child["name"] for child in second["children"]] == ["Unit 3", "Unit 4"]
+    last = children_page(df, path="Plant", cursor=second["next_cursor"], limit=2)
+    assert [child["name"] for child in last["children"]] == ["Unit 5"] and last["next_cursor"] is None
+
+    with pytest.raises(KeyError):
+        children_page(df, path="Plant >> Nowhere")
+    with pytest.raises(ValueError):
+        children_page(df.drop(index=2), path="Plant", cursor=first["next_cursor"])
+    print("✅ Children are paginated by cursor.")
@@ -0,0 +1,53 @@
+import asyncio
+import io
+import os
+import pytest
+from starlette.datastructures import UploadFile
+from src.itv_asset_tree.utils.upload_store import UploadStore
+
+CSV_BYTES = b"Level 1,Level 2,Name\nPlant,Reactor 1,Temperature\n"
+
+@pytest.mark.unit
+def test_identical_uploads_are_deduplicated(tmp_path):
+    """Unit test: the upload ID is the content hash and re-uploads reuse the stored file."""
+    store = UploadStore(root=str(tmp_path))
+
+    first = asyncio.run(store.save(UploadFile(file=io.BytesIO(CSV_BYTES), filename="a.csv")))
+    second = asyncio.run(store.save(UploadFile(file=io.BytesIO(CSV_BYTES), filename="b.csv")))
+
+    assert first["upload_id"] == second["upload_id"]
+    assert not first["deduplicated"] and second["deduplicated"]
+    assert sorted(os.listdir(tmp_path)) == [f"{first['upload_id']}.csv", "index.json"]
+
+    record = UploadStore(root=str(tmp_path)).get(first["upload_id"])  # Fresh process reads the index
+    assert record["columns"] == ["Level 1", "Level 2", "Name"]
+    print("✅ Upload deduplicated and found by ID.")
+
+@pytest.mark.unit
+def test_unknown_or_malformed_upload_id(tmp_path):
+    """Unit test: lookups reject malformed IDs and report missing uploads."""
+    store = UploadStore(root=str(tmp_path))
+
+    with pytest.raises(ValueError):
+        store.get("../../etc/passwd")
+    with pytest.raises(FileNotFoundError):
+        store.get("0" * 64)
+    print("✅ Bad upload IDs rejected.")
+
+@pytest.mark.unit
+def test_workers_sharing_the_store_keep_each_others_uploads(tmp_path):
+    """Unit test: two store instances (as in two workers) writing the index do not erase each other's records."""
+    worker_a, worker_b = UploadStore(root=str(tmp_path)), UploadStore(root=str(tmp_path))
+
+    first = asyncio.run(worker_a.save(UploadFile(file=io.BytesIO(CSV_BYTES), filename="a.csv")))
+    second = asyncio.run(worker_b.save(UploadFile(file=io.BytesIO(CSV_BYTES + b"Plant,Reactor 2,Flow\n"),
+                                                  filename="b.csv")))
+
+    fresh = UploadStore(root=str(tmp_path))
+    assert fresh.get(first["upload_id"])["filename"] == "a.csv"
+    assert fresh.get(second["upload_id"])["filename"] == "b.csv"
+
+    # A stored file whose record was lost anyway is re-indexed from the file
+    os.remove(tmp_path / "index.json")
+    assert UploadStore(root=str(tmp_path)).get(first["upload_id"])["columns"] == ["Level 1", "Level 2", "Name"]
+    print("✅ Concurrent workers keep every upload.")
@@ -0,0 +1,37 @@
+import asyncio
+import io
+import os
+import pytest
+from starlette.datastructures import UploadFile
+from src.itv_asset_tree.utils.upload_stream import (
+    UploadTooLargeError,
+    sniff_csv_header,
+    stream_upload_to_disk,
+)
+
+CSV_BYTES = "Level 1,Level 2,Name\nPlant,Reactor 1,Temperature\n".encode("utf-8-sig")
+
+@pytest.mark.unit
+def test_upload_is_streamed_and_hashed(tmp_path):
+    """Unit test: uploads are copied in chunks, hashed, and validated from the header."""
+    destination = str(tmp_path / "tree.csv")
+    upload = UploadFile(file=io.BytesIO(CSV_BYTES), filename="tree.csv")
+
+    result = asyncio.run(stream_upload_to_disk(upload, destination, chunk_size=8, max_bytes=1024))
+
+    assert result.size == len(CSV_BYTES)
+    assert len(result.sha256) == 64
+    assert sniff_csv_header(destination) == ["Level 1", "Level 2", "Name"]
+    print("✅ Upload streamed successfully.")
+
+@pytest.mark.unit
+def test_upload_over_limit_is_rejected(tmp_path):
+    """Unit test: an upload past the size limit leaves nothing behind."""
+    destination = str(tmp_path / "tree.csv")
+    upload = UploadFile(file=io.BytesIO(CSV_BYTES), filename="tree.csv")
+
+    with pytest.raises(UploadTooLargeError):
+        asyncio.run(stream_upload_to_disk(upload, destination, chunk_size=8, max_bytes=16))
+
+    assert os.listdir(tmp_path) == []
+    print("✅ Oversized upload rejected.")